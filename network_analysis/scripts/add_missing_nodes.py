@@ -9,11 +9,21 @@ import json
 
 def add_missing_nodes(input_file, output_file):
     """Add missing nodes that are referenced in links."""
-    print("Adding missing nodes...")
-    
     with open(input_file, 'r') as f:
         data = json.load(f)
     
+    fill_missing_nodes(data)
+    
+    # Save updated data
+    with open(output_file, 'w') as f:
+        json.dump(data, f, indent=2)
+    
+    return data
+
+def fill_missing_nodes(data):
+    """Add nodes referenced in links but missing from in-memory network data."""
+    print("Adding missing nodes...")
+    
     # Find all node IDs referenced in links
     all_link_nodes = set()
     for link in data['links']:
@@ -29,7 +39,7 @@ def add_missing_nodes(input_file, output_file):
     print(f"Found {len(missing_node_ids)} missing nodes: {missing_node_ids}")
     
     # Add missing nodes with basic information
-    for node_id in missing_node_ids:
+    for node_id in sorted(missing_node_ids):
         # Determine node type and other properties based on the node ID
         node_type = determine_node_type(node_id)
         node_name = format_node_name(node_id)
@@ -46,10 +56,6 @@ def add_missing_nodes(input_file, output_file):
         data['nodes'].append(new_node)
         print(f"Added node: {node_id} ({node_type})")
     
-    # Save updated data
-    with open(output_file, 'w') as f:
-        json.dump(data, f, indent=2)
-    
     print(f"\nNode addition complete!")
     print(f"Original nodes: {len(data['nodes']) - len(missing_node_ids)}")
     print(f"Updated nodes: {len(data['nodes'])}")
@@ -5,7 +5,28 @@ Atlanta Biotech Network Analysis Script
 A standalone script to analyze the Atlanta biotech ecosystem network using NetworkX.
 Calculates standard network metrics and generates presentation-quality visualizations.
 
-Usage: python analyze_network.py
+Usage: python analyze_network.py [--workers N] [--approximate [--epsilon E]] [--core-fit] [--seed S]
+                          [--critical-pairs] [--louvain-runs R] [--full-communities] [--adaptive-attacks]
+                          [--subgraph-centrality]
+    --workers N runs betweenness and the other BFS metrics on N processes
+    (0 for all cores).
+    --approximate estimates betweenness, closeness and harmonic centrality
+    by pivot sampling to within E (default 0.01) at 95% confidence.
+    --core-fit adds the Borgatti-Everett continuous coreness of each node.
+    --seed S seeds the random-failure simulations, the Louvain runs, the
+    rich-club null models and the --approximate source sample (default 0).
+    --critical-pairs also ranks pairs of nodes by the connectivity their
+    joint removal costs.
+    --louvain-runs R sets how many seeded Louvain runs the consensus
+    communities are built from (default 16).
+    --full-communities reruns community detection from scratch instead of
+    warm-starting from data/biotech_network_communities.json.
+    --adaptive-attacks also re-ranks by betweenness, PageRank and core
+    score after every removal (slow on large graphs; adaptive degree and
+    all static attacks always run).
+    --subgraph-centrality computes subgraph centrality even above 2000
+    nodes, where it takes one Lanczos quadrature per node (left empty
+    otherwise).
 
 Requirements:
 - Python 3.7+
@@ -14,6 +35,7 @@ Requirements:
 Author: Benjamin Siciliano
 """
 
+import sys
 import json
 import networkx as nx
 import pandas as pd
@@ -23,6 +45,18 @@ import numpy as np
 import community as community_louvain
 from pathlib import Path
 import warnings
+from graph_cache import GraphCache, DEFAULT_MAX_BYTES
+from graph_store import GraphStore
+from graph_core import CSRGraph
+from percolation import random_failures
+from attacks import targeted_attacks, CHEAP_ADAPTIVE
+from critical_nodes import removal_impact, articulation_points, critical_pairs
+from community_profiles import CommunityProfiles
+from rich_club import rich_club
+from communities import update_communities, load_partition, save_partition, community_quality, quality_summary
+from core_periphery import (core_features, core_scores, classify, participation_coefficients,
+                            borgatti_everett, average_neighbor_degree)
+from walk_centrality import EXACT_LIMIT as WALK_EXACT_LIMIT
 warnings.filterwarnings('ignore')
 
 # Set style for publication-quality plots
@@ -32,10 +66,38 @@ sns.set_palette("husl")
 class BiotechNetworkAnalyzer:
     """Analyzes the Atlanta biotech network using NetworkX."""
     
-    def __init__(self, data_file='data/biotech_network_data.json'):
+    def __init__(self, data_file='data/biotech_network_data.json', cache_dir='data/.cache',
+                 cache_max_bytes=DEFAULT_MAX_BYTES, use_cache=True, workers=1,
+                 mode='exact', epsilon=0.01, confidence=0.95, core_fit=False, seed=0,
+                 critical_pairs=False, louvain_runs=16,
+                 communities_file='data/biotech_network_communities.json', warm_start=True,
+                 adaptive_attacks=False, subgraph_centrality=False):
         """Initialize the analyzer with network data."""
+        if mode not in ('exact', 'approximate'):
+            raise ValueError(f"Unknown analysis mode: {mode}")
         self.data_file = data_file
-        self.G = nx.Graph()
+        self.workers = workers  # Processes for betweenness and the other BFS metrics (None for all cores)
+        self.mode = mode  # 'approximate' samples the distance-based centralities
+        self.epsilon = epsilon  # Additive error target (0-1 scale) in approximate mode
+        self.confidence = confidence
+        self.core_fit = core_fit  # Also fit the Borgatti-Everett continuous core model
+        self.seed = seed  # Seed for the failure simulations, Louvain runs, rich-club null models and source sampling
+        self.critical_pairs = critical_pairs  # Also rank pairs of nodes (2-vertex cuts) by joint impact
+        self.louvain_runs = louvain_runs  # Seeded Louvain runs behind the consensus communities
+        self.community_consensus = None  # Consensus or warm-started communities of the last detection
+        self.community_profiles = None  # Type composition, hub and label of every community
+        self.communities_file = communities_file  # Partition artifact the next run warm-starts from
+        self.warm_start = warm_start  # Re-optimize only around changed links when the artifact matches
+        self.core_threshold = None  # Core-score cut between core and periphery
+        self.adaptive_attacks = adaptive_attacks  # Also run the costly adaptive attack strategies
+        self.subgraph_centrality = subgraph_centrality  # Compute subgraph centrality above the dense limit too
+        self.core_periphery_fit = None  # Correlation of the continuous core fit
+        self.cache = GraphCache(cache_dir, cache_max_bytes) if use_cache else None
+        self.cache_key = None
+        self.graph_from_cache = False
+        self.store = None  # Memory-mapped binary graph, when data_file is .bgraph
+        self.graph = None  # Integer-indexed CSR graph all metrics run on
+        self._nx_graph = None  # NetworkX view of self.graph, built on first use
         self.node_metrics = {}
         self.network_stats = {}
         self.communities = {}
@@ -43,9 +105,20 @@ class BiotechNetworkAnalyzer:
         self.raw_links = 0
         self.node_names = {}  # Mapping from node ID to display name
         self.raw_data = {}  # Store raw data for type analysis
-        
+        self.org_type_counts = {}  # Organization type -> number of nodes
+        self.connection_type_counts = {}  # Connection type -> number of links
+        
+    @property
+    def G(self):
+        """NetworkX view of the graph core (for networkx-only algorithms and reference checks)."""
+        if self.graph is None:
+            return nx.Graph()
+        if self._nx_graph is None:
+            self._nx_graph = self.graph.to_networkx()
+        return self._nx_graph
+    
     def load_data(self):
-        """Load and parse the JSON data file."""
+        """Load and parse the JSON data file, or reuse a cached graph for it."""
         print("Loading network data...")
         
         # Check if JSON file exists, if not, try to convert from JS
@@ -53,6 +126,23 @@ class BiotechNetworkAnalyzer:
             print("JSON data file not found. Attempting to convert from JavaScript...")
             self._convert_js_to_json()
         
+        # Binary graph files are memory-mapped; only the header is read here
+        if Path(self.data_file).suffix == '.bgraph':
+            self.store = GraphStore(self.data_file)
+            self.raw_nodes = self.store.header['raw_nodes']
+            self.raw_links = self.store.header['raw_links']
+            print(f"Mapped {self.raw_nodes} nodes and {self.raw_links} links from {self.data_file}")
+            return self.store
+        
+        # Warm start: the graph for this exact file content was built before
+        if self.cache is not None:
+            self.cache_key = self.cache.key_for(self.data_file)
+            payload = self.cache.get(self.cache_key)
+            if payload is not None:
+                self._restore_from_cache(payload)
+                print(f"Loaded {self.raw_nodes} nodes and {self.raw_links} links from cache")
+                return self.raw_data
+        
         # Load JSON data
         with open(self.data_file, 'r', encoding='utf-8') as f:
             data = json.load(f)
@@ -69,10 +159,49 @@ class BiotechNetworkAnalyzer:
         
         # Store raw data for type analysis
         self.raw_data = data
+        self.org_type_counts = self._count_types(data.get('nodes', []))
+        self.connection_type_counts = self._count_types(data.get('links', []))
         
         print(f"Loaded {self.raw_nodes} nodes and {self.raw_links} links")
         return data
     
+    @staticmethod
+    def _count_types(records):
+        """Count records by their 'type' field."""
+        type_counts = {}
+        for record in records:
+            record_type = record.get('type', 'Unknown')
+            type_counts[record_type] = type_counts.get(record_type, 0) + 1
+        return type_counts
+    
+    def _restore_from_cache(self, payload):
+        """Restore the built graph and derived lookups from a cache payload."""
+        self.graph = payload['graph']
+        self._nx_graph = None
+        self.node_names = payload['node_names']
+        self.raw_nodes = payload['raw_nodes']
+        self.raw_links = payload['raw_links']
+        self.org_type_counts = payload['org_type_counts']
+        self.connection_type_counts = payload['connection_type_counts']
+        self.raw_data = {}
+        self.graph_from_cache = True
+    
+    def _store_in_cache(self):
+        """Save the built graph and derived lookups for the next warm start."""
+        if self.cache is None or self.cache_key is None:
+            return
+        try:
+            self.cache.put(self.cache_key, {
+                'graph': self.graph,
+                'node_names': self.node_names,
+                'raw_nodes': self.raw_nodes,
+                'raw_links': self.raw_links,
+                'org_type_counts': self.org_type_counts,
+                'connection_type_counts': self.connection_type_counts
+            })
+        except Exception as e:
+            print(f"Warning: Could not write graph cache: {e}")
+    
     def _convert_js_to_json(self):
         """Convert JavaScript data to JSON format."""
         print("Converting JavaScript data to JSON...")
@@ -121,294 +250,244 @@ class BiotechNetworkAnalyzer:
             json.dump(minimal_data, f, indent=2)
     
     def build_network(self, data):
-        """Build NetworkX graph from the data."""
+        """Build the CSR graph core from the data (skipped when loaded from cache)."""
+        if self.graph_from_cache:
+            print(f"Network loaded from cache: {self.graph.number_of_nodes()} nodes, {self.graph.number_of_edges()} edges")
+            return self.graph
+        
         print("Building network graph...")
         
-        # Add nodes
-        for node in data.get('nodes', []):
-            node_id = node.get('id', '')
-            if node_id:
-                self.G.add_node(node_id, **{k: v for k, v in node.items() if k != 'id'})
-        
-        # Add edges
-        for link in data.get('links', []):
-            source = link.get('source', '')
-            target = link.get('target', '')
-            if source and target and source != target:
-                self.G.add_edge(source, target, **{k: v for k, v in link.items() if k not in ['source', 'target']})
-        
-        print(f"Network built: {self.G.number_of_nodes()} nodes, {self.G.number_of_edges()} edges")
-        return self.G
+        if isinstance(data, GraphStore):
+            return self._build_from_store(data)
+        
+        # Node attributes go to the graph's side table, edges to CSR arrays
+        self.graph = CSRGraph.from_data(data)
+        self._nx_graph = None
+        
+        print(f"Network built: {self.graph.number_of_nodes()} nodes, {self.graph.number_of_edges()} edges")
+        self._store_in_cache()
+        return self.graph
+    
+    def _build_from_store(self, store):
+        """Use the mapped CSR arrays directly as the graph core."""
+        self.graph = CSRGraph.from_store(store)
+        self._nx_graph = None
+        
+        self.node_names = dict(zip(self.graph.node_ids, self.graph.attributes['name']))
+        self.org_type_counts = store.org_type_counts()
+        self.connection_type_counts = store.connection_type_counts()
+        
+        print(f"Network built: {self.graph.number_of_nodes()} nodes, {self.graph.number_of_edges()} edges")
+        return self.graph
     
     def calculate_metrics(self):
         """Calculate all network metrics."""
         print("Calculating network metrics...")
         
-        # Node-level metrics
-        degree_centrality = nx.degree_centrality(self.G)
-        betweenness_centrality = nx.betweenness_centrality(self.G)
-        closeness_centrality = nx.closeness_centrality(self.G)
-        harmonic_centrality = nx.harmonic_centrality(self.G)
-        eigenvector_centrality = nx.eigenvector_centrality(self.G, max_iter=1000)
-        pagerank = nx.pagerank(self.G, alpha=0.85, max_iter=1000)
-        clustering_coefficient = nx.clustering(self.G)
+        graph = self.graph
+        
+        # Metrics are memoized on the graph (and on disk with the graph cache),
+        # so the core-periphery pass and the dashboard reuse them
+        metrics = graph.metrics.persist(self.cache)
+        metrics.workers = self.workers
+        if self.mode == 'approximate':
+            metrics.approximate(self.epsilon, self.confidence, self.seed)
+        else:
+            metrics.approximate(None)
+        
+        # Node-level metrics (arrays indexed by interned node id)
+        degree_centrality = metrics.get('degree_centrality')
+        betweenness_centrality = metrics.get('betweenness_centrality')
+        closeness_centrality = metrics.get('closeness_centrality')
+        harmonic_centrality = metrics.get('harmonic_centrality')
+        current_flow_closeness = metrics.get('current_flow_closeness')
+        current_flow_betweenness = metrics.get('current_flow_betweenness')
+        information_centrality = metrics.get('information_centrality')
+        eigenvector_centrality = metrics.get('eigenvector_centrality')
+        pagerank = metrics.get('pagerank')
+        katz_centrality = metrics.get('katz_centrality')
+        if self.subgraph_centrality or self.graph.n <= WALK_EXACT_LIMIT:
+            subgraph_centrality = metrics.get('subgraph_centrality')
+        else:
+            # Beyond the dense limit it costs one quadrature per node (O(n (n + m)) per step); opt-in only
+            subgraph_centrality = np.full(self.graph.n, np.nan)
+        total_communicability = metrics.get('total_communicability')
+        clustering_coefficient = metrics.get('clustering')
+        
+        # Community detection: consensus of seeded Louvain runs (reproducible for a given seed),
+        # warm-started from the previous run's partition when one was exported
+        community_stability = np.ones(graph.n)
+        try:
+            previous = load_partition(self.communities_file) if self.warm_start else None
+            self.community_consensus = update_communities(graph, previous, self.louvain_runs, self.seed, self.workers)
+            self.communities = self.community_consensus.partition(graph.node_ids)
+            community_stability = self.community_consensus.stability
+            # Profile every community (type mix, hub) and label it
+            self.community_profiles = self._profile_communities()
+            self.community_labels = self.community_profiles.community_labels()
+        except Exception as e:
+            print(f"Warning: Could not perform community detection: {e}")
+            self.community_consensus = None
+            self.community_profiles = None
+            community_stability = np.ones(graph.n)
+            self.communities = {node: 0 for node in graph.node_ids}
+            self.community_labels = {0: "Single Community"}
         
         # Calculate structural holes metrics
         structural_holes = self._calculate_structural_holes()
         
-        # Calculate core-periphery analysis
+        # Calculate core-periphery analysis (after communities, for participation)
         core_periphery = self._calculate_core_periphery()
         
         # Calculate network resilience metrics
         resilience_metrics = self._calculate_network_resilience()
         
-        # Community detection using Louvain algorithm
-        try:
-            communities = community_louvain.best_partition(self.G)
-            self.communities = communities
-            # Generate meaningful community labels
-            self.community_labels = self._generate_community_labels()
-        except Exception as e:
-            print(f"Warning: Could not perform community detection: {e}")
-            self.communities = {node: 0 for node in self.G.nodes()}
-            self.community_labels = {0: "Single Community"}
-        
         # Store node metrics
         self.node_metrics = {}
-        for node in self.G.nodes():
+        for i, node in enumerate(graph.node_ids):
             community_id = self.communities.get(node, 0)
             community_label = self.community_labels.get(community_id, f"Community {community_id}")
             self.node_metrics[node] = {
                 'node_id': node,
-                'degree': self.G.degree(node),
-                'degree_centrality': degree_centrality.get(node, 0),
-                'betweenness_centrality': betweenness_centrality.get(node, 0),
-                'closeness_centrality': closeness_centrality.get(node, 0),
-                'harmonic_centrality': harmonic_centrality.get(node, 0),
-                'eigenvector_centrality': eigenvector_centrality.get(node, 0),
-                'pagerank': pagerank.get(node, 0),
-                'clustering_coefficient': clustering_coefficient.get(node, 0),
+                'degree': int(graph.degree[i]),
+                'degree_centrality': float(degree_centrality[i]),
+                'betweenness_centrality': float(betweenness_centrality[i]),
+                'closeness_centrality': float(closeness_centrality[i]),
+                'harmonic_centrality': float(harmonic_centrality[i]),
+                'current_flow_closeness': float(current_flow_closeness[i]),
+                'current_flow_betweenness': float(current_flow_betweenness[i]),
+                'information_centrality': float(information_centrality[i]),
+                'eigenvector_centrality': float(eigenvector_centrality[i]),
+                'pagerank': float(pagerank[i]),
+                'katz_centrality': float(katz_centrality[i]),
+                'subgraph_centrality': float(subgraph_centrality[i]),
+                'total_communicability': float(total_communicability[i]),
+                'clustering_coefficient': float(clustering_coefficient[i]),
                 'structural_holes': structural_holes.get(node, {}),
                 'core_periphery': core_periphery.get(node, {}),
                 'community_id': community_id,
-                'community_label': community_label
+                'community_label': community_label,
+                'community_stability': float(community_stability[i])
             }
         
-        # Calculate rich club coefficient for different degree thresholds
-        rich_club_coeffs = {}
-        max_degree = max(dict(self.G.degree()).values()) if self.G.number_of_nodes() > 0 else 0
-        for k in range(1, min(max_degree + 1, 20)):  # Calculate for degrees 1-19 or max degree
-            try:
-                coeff = nx.rich_club_coefficient(self.G, k)
-                # Handle both scalar and dict returns
-                if isinstance(coeff, dict):
-                    rich_club_coeffs[k] = coeff.get(k, 0.0)
-                else:
-                    rich_club_coeffs[k] = float(coeff) if coeff is not None else 0.0
-            except:
-                rich_club_coeffs[k] = 0.0
+        # Rich-club curve in one pass, normalized against seeded degree-preserving rewirings
+        rich_club_curve = rich_club(graph, seed=self.seed, workers=self.workers)
+        max_degree = int(graph.degree.max()) if graph.n > 0 else 0
+        rich_club_coeffs = {k: rich_club_curve.normalized_at(k) for k in range(1, min(max_degree + 1, 20))}
         
         # Calculate community quality metrics
         community_quality = self._calculate_community_quality()
         
         # Network-level metrics
+        is_connected = graph.is_connected()
         self.network_stats = {
-            'density': nx.density(self.G),
-            'diameter': nx.diameter(self.G) if nx.is_connected(self.G) else 'Not connected',
-            'average_path_length': nx.average_shortest_path_length(self.G) if nx.is_connected(self.G) else 'Not connected',
-            'assortativity': nx.degree_assortativity_coefficient(self.G),
-            'transitivity': nx.transitivity(self.G),
-            'average_clustering': nx.average_clustering(self.G),
+            'density': metrics.get('density'),
+            'diameter': metrics.get('diameter') if is_connected else 'Not connected',
+            'average_path_length': metrics.get('average_path_length') if is_connected else 'Not connected',
+            'path_length_distribution': metrics.get('path_length_distribution'),
+            'approximation': metrics.get('distance_sweep').summary(),
+            'core_threshold': self.core_threshold,
+            'core_periphery_fit': self.core_periphery_fit,
+            'assortativity': metrics.get('assortativity'),
+            'transitivity': metrics.get('transitivity'),
+            'average_clustering': metrics.get('average_clustering'),
+            'edge_embeddedness': self._summarize_embeddedness(),
             'rich_club_coefficients': rich_club_coeffs,
+            'rich_club': rich_club_curve.summary(),
             'community_quality': community_quality,
             'resilience_metrics': resilience_metrics,
             'num_communities': len(set(self.communities.values())),
+            'community_consensus': self.community_consensus.summary() if self.community_consensus is not None else None,
             'modularity': community_louvain.modularity(self.communities, self.G) if self.communities else 0,
-            'num_nodes': self.G.number_of_nodes(),
-            'num_edges': self.G.number_of_edges(),
+            'num_nodes': graph.number_of_nodes(),
+            'num_edges': graph.number_of_edges(),
             'raw_nodes': self.raw_nodes,
             'raw_links': self.raw_links
         }
         
         print("Metrics calculated successfully!")
     
+    def _summarize_embeddedness(self):
+        """Summarize how embedded the links are in triangles (shared partners)."""
+        common_neighbors, overlap = self.graph.metrics.get('edge_embeddedness')
+        if len(common_neighbors) == 0:
+            return {'mean_common_neighbors': 0.0, 'mean_overlap': 0.0, 'local_bridges': 0}
+        return {
+            'mean_common_neighbors': float(common_neighbors.mean()),
+            'mean_overlap': float(overlap.mean()),
+            'local_bridges': int((common_neighbors == 0).sum())  # Links whose endpoints share no partner
+        }
+    
     def _calculate_structural_holes(self):
         """Calculate structural holes metrics for each node."""
-        structural_holes = {}
+        # Effective size, efficiency, constraint and hierarchy for all nodes
+        # from a few sparse products (see graph_core.structural_holes)
+        effective_size, efficiency, constraint, hierarchy = self.graph.metrics.get('structural_holes')
         
-        for node in self.G.nodes():
-            neighbors = list(self.G.neighbors(node))
-            if len(neighbors) < 2:
-                # Single neighbor or isolated node
-                structural_holes[node] = {
-                    'effective_size': 0.0,
-                    'efficiency': 0.0,
-                    'constraint': 1.0,
-                    'hierarchy': 0.0
-                }
-                continue
-            
-            # Calculate effective size (Burt's measure)
-            # Effective size = n - (2t/n) where n = degree, t = ties among neighbors
-            neighbor_edges = 0
-            for i, neighbor1 in enumerate(neighbors):
-                for neighbor2 in neighbors[i+1:]:
-                    if self.G.has_edge(neighbor1, neighbor2):
-                        neighbor_edges += 1
-            
-            n = len(neighbors)
-            t = neighbor_edges
-            effective_size = n - (2 * t / n) if n > 0 else 0
-            
-            # Calculate efficiency (effective size / degree)
-            efficiency = effective_size / n if n > 0 else 0
-            
-            # Calculate constraint (Burt's constraint measure)
-            # Constraint = sum((p_ij + sum(p_ik * p_kj))^2) for all j != i
-            constraint = 0.0
-            for j in neighbors:
-                p_ij = 1.0 / n  # Direct connection strength
-                
-                # Calculate indirect connections through other neighbors
-                indirect_sum = 0.0
-                for k in neighbors:
-                    if k != j and self.G.has_edge(k, j):
-                        p_ik = 1.0 / n
-                        p_kj = 1.0 / self.G.degree(k) if self.G.degree(k) > 0 else 0
-                        indirect_sum += p_ik * p_kj
-                
-                total_connection = p_ij + indirect_sum
-                constraint += total_connection ** 2
-            
-            # Calculate hierarchy (constraint concentration)
-            # Hierarchy = 1 - (sum of squared constraint components) / (constraint^2)
-            if constraint > 0:
-                constraint_components = []
-                for j in neighbors:
-                    p_ij = 1.0 / n
-                    indirect_sum = 0.0
-                    for k in neighbors:
-                        if k != j and self.G.has_edge(k, j):
-                            p_ik = 1.0 / n
-                            p_kj = 1.0 / self.G.degree(k) if self.G.degree(k) > 0 else 0
-                            indirect_sum += p_ik * p_kj
-                    total_connection = p_ij + indirect_sum
-                    constraint_components.append(total_connection ** 2)
-                
-                hierarchy = 1 - (sum(constraint_components) / (constraint ** 2)) if constraint > 0 else 0
-            else:
-                hierarchy = 0.0
-            
+        structural_holes = {}
+        for i, node in enumerate(self.graph.node_ids):
             structural_holes[node] = {
-                'effective_size': effective_size,
-                'efficiency': efficiency,
-                'constraint': constraint,
-                'hierarchy': hierarchy
+                'effective_size': float(effective_size[i]),
+                'efficiency': float(efficiency[i]),
+                'constraint': float(constraint[i]),
+                'hierarchy': float(hierarchy[i])
             }
         
         return structural_holes
     
     def _calculate_core_periphery(self):
         """Calculate core-periphery analysis for each node."""
-        core_periphery = {}
-        
-        # Calculate degree centrality for all nodes
-        degree_centrality = nx.degree_centrality(self.G)
-        
-        # Calculate k-core decomposition
-        k_core = nx.core_number(self.G)
-        max_k_core = max(k_core.values()) if k_core else 0
-        
-        # Calculate betweenness centrality for core identification
-        betweenness_centrality = nx.betweenness_centrality(self.G)
+        graph = self.graph
         
-        # Calculate clustering coefficient
-        clustering_coeff = nx.clustering(self.G)
+        # Weighted score over normalized features, one global percentile cut
+        features = core_features(graph, graph.metrics)
+        scores = core_scores(features)
+        is_core, self.core_threshold = classify(scores)
         
-        # Calculate average neighbor degree
-        avg_neighbor_degree = {}
-        for node in self.G.nodes():
-            neighbors = list(self.G.neighbors(node))
-            if neighbors:
-                neighbor_degrees = [self.G.degree(neighbor) for neighbor in neighbors]
-                avg_neighbor_degree[node] = np.mean(neighbor_degrees)
-            else:
-                avg_neighbor_degree[node] = 0
-        
-        # Calculate core-periphery score for each node
-        for node in self.G.nodes():
-            # Normalize metrics to 0-1 scale
-            norm_degree = degree_centrality.get(node, 0)
-            norm_betweenness = betweenness_centrality.get(node, 0)
-            norm_k_core = k_core.get(node, 0) / max_k_core if max_k_core > 0 else 0
-            norm_clustering = clustering_coeff.get(node, 0)
-            norm_avg_neighbor_degree = avg_neighbor_degree.get(node, 0) / max(avg_neighbor_degree.values()) if avg_neighbor_degree else 0
-            
-            # Core-periphery score (higher = more core-like)
-            # Core nodes: high degree, high betweenness, high k-core, low clustering, high neighbor degree
-            core_score = (
-                0.3 * norm_degree +
-                0.3 * norm_betweenness +
-                0.2 * norm_k_core +
-                0.1 * (1 - norm_clustering) +  # Low clustering is more core-like
-                0.1 * norm_avg_neighbor_degree
-            )
-            
-            # Determine core vs periphery classification
-            # Use percentile-based classification
-            all_scores = [core_score for core_score in [core_score]]
-            threshold = np.percentile([core_score for node in self.G.nodes()], 70)  # Top 30% are core
-            
-            is_core = core_score >= threshold
-            
-            # Calculate additional metrics
-            degree = self.G.degree(node)
-            k_core_value = k_core.get(node, 0)
-            
-            # Calculate local clustering (how clustered the node's neighborhood is)
-            local_clustering = clustering_coeff.get(node, 0)
-            
-            # Calculate participation coefficient (how well connected to different communities)
-            participation_coeff = 0.0
-            if self.communities:
-                community_connections = {}
-                for neighbor in self.G.neighbors(node):
-                    neighbor_community = self.communities.get(neighbor, 0)
-                    community_connections[neighbor_community] = community_connections.get(neighbor_community, 0) + 1
-                
-                if community_connections:
-                    total_connections = sum(community_connections.values())
-                    participation_coeff = 1 - sum((count/total_connections)**2 for count in community_connections.values())
-            
-            core_periphery[node] = {
-                'core_score': core_score,
-                'is_core': is_core,
-                'k_core': k_core_value,
-                'participation_coefficient': participation_coeff,
-                'local_clustering': local_clustering,
-                'avg_neighbor_degree': avg_neighbor_degree.get(node, 0)
+        # Participation coefficient (how well connected to different communities)
+        if self.communities:
+            labels = np.array([self.communities.get(node, 0) for node in graph.node_ids])
+            participation = participation_coefficients(graph, labels)
+        else:
+            participation = np.zeros(graph.n)
+        
+        # Optional Borgatti-Everett continuous coreness
+        coreness = None
+        if self.core_fit:
+            coreness, self.core_periphery_fit = borgatti_everett(graph)
+        
+        k_core = graph.metrics.get('core_number')
+        clustering_coeff = graph.metrics.get('clustering')
+        avg_neighbor_degree = average_neighbor_degree(graph)
+        
+        result = {}
+        for i, node in enumerate(graph.node_ids):
+            result[node] = {
+                'core_score': float(scores[i]),
+                'is_core': bool(is_core[i]),
+                'k_core': int(k_core[i]),
+                'participation_coefficient': float(participation[i]),
+                'local_clustering': float(clustering_coeff[i]),
+                'avg_neighbor_degree': float(avg_neighbor_degree[i])
             }
+            if coreness is not None:
+                result[node]['coreness'] = float(coreness[i])
         
-        return core_periphery
+        return result
     
     def _calculate_network_resilience(self):
         """Calculate network resilience metrics."""
         resilience_metrics = {}
         
         # Basic connectivity metrics
-        num_nodes = self.G.number_of_nodes()
-        num_edges = self.G.number_of_edges()
+        num_nodes = self.graph.number_of_nodes()
+        num_edges = self.graph.number_of_edges()
         
         # Calculate largest connected component
-        if nx.is_connected(self.G):
-            largest_cc_size = num_nodes
-            largest_cc_ratio = 1.0
-        else:
-            connected_components = list(nx.connected_components(self.G))
-            largest_cc = max(connected_components, key=len)
-            largest_cc_size = len(largest_cc)
-            largest_cc_ratio = largest_cc_size / num_nodes if num_nodes > 0 else 0
+        largest_cc_size = self.graph.largest_component_size()
+        largest_cc_ratio = largest_cc_size / num_nodes if num_nodes > 0 else 0
         
+        # Flow-based connectivity still uses networkx
         # Calculate node connectivity (minimum nodes to remove to disconnect)
         try:
             node_connectivity = nx.node_connectivity(self.G)
@@ -421,24 +500,28 @@ class BiotechNetworkAnalyzer:
         except:
             edge_connectivity = 0
         
-        # Calculate algebraic connectivity (Fiedler value)
-        try:
-            algebraic_connectivity = nx.algebraic_connectivity(self.G)
-        except:
-            algebraic_connectivity = 0
+        # Calculate algebraic connectivity (Fiedler value) and the spectral radius and gap
+        # from the shared spectral engine (its adjacency eigenpairs also give eigenvector centrality)
+        algebraic_connectivity = self.graph.metrics.get('algebraic_connectivity')
+        largest_cc_algebraic_connectivity = self.graph.spectral.largest_component_connectivity()
+        spectral_radius = self.graph.metrics.get('spectral_radius')
+        spectral_gap = self.graph.metrics.get('spectral_gap')
         
-        # Calculate robustness to random failures (simulation)
-        robustness_random = self._simulate_random_failures()
+        # Calculate robustness to random failures (percolation curve over all removal fractions)
+        failures = self._simulate_random_failures()
+        robustness_random = failures.mean_fraction(max(1, int(0.1 * num_nodes))) if num_nodes >= 2 else 0.0
         
-        # Calculate robustness to targeted attacks (simulation)
-        robustness_targeted = self._simulate_targeted_attacks()
+        # Calculate robustness to targeted attacks (fragmentation curve per strategy and mode)
+        attacks = self._simulate_targeted_attacks()
+        robustness_targeted = attacks.giant_fraction('degree', 'static', max(1, int(0.1 * num_nodes))) if num_nodes >= 2 else 0.0
         
         # Calculate critical nodes (nodes whose removal most affects connectivity)
         critical_nodes = self._identify_critical_nodes()
+        articulation_count = int(articulation_points(self.graph).sum())
         
         # Calculate network efficiency
         try:
-            efficiency = nx.global_efficiency(self.G)
+            efficiency = self.graph.metrics.get('global_efficiency')
         except:
             efficiency = 0
         
@@ -451,109 +534,56 @@ class BiotechNetworkAnalyzer:
             'node_connectivity': node_connectivity,
             'edge_connectivity': edge_connectivity,
             'algebraic_connectivity': algebraic_connectivity,
+            'largest_cc_algebraic_connectivity': largest_cc_algebraic_connectivity,
+            'spectral_radius': spectral_radius,
+            'spectral_gap': spectral_gap,
             'robustness_random': robustness_random,
+            'random_failure_curve': failures.curve(),
             'robustness_targeted': robustness_targeted,
+            'attack_curves': attacks.summary(),
             'efficiency': efficiency,
             'vulnerability': vulnerability,
-            'critical_nodes_count': len(critical_nodes)
+            'critical_nodes_count': len(critical_nodes),
+            'critical_nodes': critical_nodes,
+            'articulation_points_count': articulation_count
         }
+        if self.critical_pairs:
+            resilience_metrics['critical_pairs'] = self._identify_critical_pairs()
         
         return resilience_metrics
     
     def _simulate_random_failures(self, num_simulations=100):
-        """Simulate random node failures to test robustness."""
-        if self.G.number_of_nodes() < 2:
-            return 0.0
-        
-        total_robustness = 0.0
-        for _ in range(num_simulations):
-            # Randomly remove 10% of nodes
-            nodes_to_remove = int(0.1 * self.G.number_of_nodes())
-            if nodes_to_remove == 0:
-                nodes_to_remove = 1
-            
-            # Create a copy of the graph
-            G_copy = self.G.copy()
-            nodes = list(G_copy.nodes())
-            np.random.shuffle(nodes)
-            
-            # Remove random nodes
-            for node in nodes[:nodes_to_remove]:
-                if G_copy.has_node(node):
-                    G_copy.remove_node(node)
-            
-            # Calculate remaining connectivity
-            if G_copy.number_of_nodes() > 0:
-                remaining_cc = max(len(cc) for cc in nx.connected_components(G_copy))
-                robustness = remaining_cc / self.G.number_of_nodes()
-            else:
-                robustness = 0.0
-            
-            total_robustness += robustness
-        
-        return total_robustness / num_simulations
+        """Simulate random node failures: giant-component curves from seeded percolation trials."""
+        return random_failures(self.graph, num_simulations, self.seed, self.workers)
     
-    def _simulate_targeted_attacks(self, num_simulations=10):
-        """Simulate targeted attacks on high-degree nodes."""
-        if self.G.number_of_nodes() < 2:
-            return 0.0
-        
-        total_robustness = 0.0
-        for _ in range(num_simulations):
-            # Remove top 10% of nodes by degree
-            nodes_to_remove = int(0.1 * self.G.number_of_nodes())
-            if nodes_to_remove == 0:
-                nodes_to_remove = 1
-            
-            # Get nodes sorted by degree
-            node_degrees = [(node, self.G.degree(node)) for node in self.G.nodes()]
-            node_degrees.sort(key=lambda x: x[1], reverse=True)
-            
-            # Create a copy of the graph
-            G_copy = self.G.copy()
-            
-            # Remove high-degree nodes
-            for node, _ in node_degrees[:nodes_to_remove]:
-                if G_copy.has_node(node):
-                    G_copy.remove_node(node)
-            
-            # Calculate remaining connectivity
-            if G_copy.number_of_nodes() > 0:
-                remaining_cc = max(len(cc) for cc in nx.connected_components(G_copy))
-                robustness = remaining_cc / self.G.number_of_nodes()
-            else:
-                robustness = 0.0
-            
-            total_robustness += robustness
-        
-        return total_robustness / num_simulations
+    def _simulate_targeted_attacks(self):
+        """Simulate degree, betweenness, PageRank and core-score attacks (adaptive degree only unless opted in)."""
+        adaptive = None if self.adaptive_attacks else CHEAP_ADAPTIVE
+        return targeted_attacks(self.graph, workers=self.workers, adaptive=adaptive)
     
     def _identify_critical_nodes(self):
         """Identify nodes whose removal most affects network connectivity."""
-        if self.G.number_of_nodes() < 2:
+        num_nodes = self.graph.number_of_nodes()
+        if num_nodes < 2:
             return []
         
-        critical_nodes = []
-        original_cc = max(len(cc) for cc in nx.connected_components(self.G))
+        # Share of the largest component lost by removing each node, from one DFS pass
+        impact = removal_impact(self.graph)
+        ranked = np.argsort(-impact, kind='stable')
         
-        for node in self.G.nodes():
-            # Create a copy without this node
-            G_copy = self.G.copy()
-            G_copy.remove_node(node)
-            
-            if G_copy.number_of_nodes() > 0:
-                remaining_cc = max(len(cc) for cc in nx.connected_components(G_copy))
-                impact = (original_cc - remaining_cc) / original_cc
-                
-                if impact > 0.1:  # Node removal causes >10% connectivity loss
-                    critical_nodes.append((node, impact))
-        
-        # Sort by impact and return top nodes
-        critical_nodes.sort(key=lambda x: x[1], reverse=True)
-        return [node for node, impact in critical_nodes[:10]]  # Top 10 critical nodes
+        # Node removal causes >10% connectivity loss; top 10 by impact
+        return [self.graph.node_ids[i] for i in ranked[:10].tolist() if impact[i] > 0.1]
+    
+    def _identify_critical_pairs(self, top=10):
+        """Node pairs whose joint removal most affects connectivity, starting from the 10 most critical nodes."""
+        if self.graph.number_of_nodes() < 2:
+            return []
+        candidates = np.argsort(-removal_impact(self.graph), kind='stable')[:10].tolist()
+        ids = self.graph.node_ids
+        return [{'nodes': [ids[u], ids[v]], 'impact': impact} for u, v, impact in critical_pairs(self.graph, candidates, top)]
     
     def _calculate_community_quality(self):
-        """Calculate community quality metrics."""
+        """Calculate community quality metrics (all communities in one pass over the edges)."""
         if not self.communities:
             return {
                 'average_conductance': 0.0,
@@ -561,150 +591,18 @@ class BiotechNetworkAnalyzer:
                 'average_expansion': 0.0,
                 'average_internal_density': 0.0,
                 'average_edges_inside': 0.0,
-                'average_edges_outside': 0.0
+                'average_edges_outside': 0.0,
+                'per_community': {}
             }
         
-        # Group nodes by community
-        community_nodes = {}
-        for node, community_id in self.communities.items():
-            if community_id not in community_nodes:
-                community_nodes[community_id] = []
-            community_nodes[community_id].append(node)
-        
-        # Calculate quality metrics for each community
-        conductances = []
-        cut_ratios = []
-        expansions = []
-        internal_densities = []
-        edges_inside = []
-        edges_outside = []
-        
-        for community_id, nodes in community_nodes.items():
-            if len(nodes) < 2:  # Skip single-node communities
-                continue
-                
-            # Create subgraph for this community
-            community_subgraph = self.G.subgraph(nodes)
-            
-            # Calculate edges inside community
-            edges_inside_count = community_subgraph.number_of_edges()
-            edges_inside.append(edges_inside_count)
-            
-            # Calculate edges outside community
-            edges_outside_count = 0
-            for node in nodes:
-                for neighbor in self.G.neighbors(node):
-                    if neighbor not in nodes:
-                        edges_outside_count += 1
-            edges_outside.append(edges_outside_count)
-            
-            # Calculate conductance (lower is better)
-            total_edges = edges_inside_count + edges_outside_count
-            if total_edges > 0:
-                conductance = edges_outside_count / total_edges
-                conductances.append(conductance)
-            
-            # Calculate cut ratio (lower is better)
-            if len(nodes) > 0:
-                cut_ratio = edges_outside_count / (len(nodes) * (self.G.number_of_nodes() - len(nodes)))
-                cut_ratios.append(cut_ratio)
-            
-            # Calculate expansion (lower is better)
-            if len(nodes) > 0:
-                expansion = edges_outside_count / len(nodes)
-                expansions.append(expansion)
-            
-            # Calculate internal density (higher is better)
-            if len(nodes) > 1:
-                max_possible_edges = len(nodes) * (len(nodes) - 1) / 2
-                internal_density = edges_inside_count / max_possible_edges if max_possible_edges > 0 else 0
-                internal_densities.append(internal_density)
-        
-        return {
-            'average_conductance': np.mean(conductances) if conductances else 0.0,
-            'average_cut_ratio': np.mean(cut_ratios) if cut_ratios else 0.0,
-            'average_expansion': np.mean(expansions) if expansions else 0.0,
-            'average_internal_density': np.mean(internal_densities) if internal_densities else 0.0,
-            'average_edges_inside': np.mean(edges_inside) if edges_inside else 0.0,
-            'average_edges_outside': np.mean(edges_outside) if edges_outside else 0.0
-        }
+        graph = self.graph
+        labels = np.array([self.communities.get(node, 0) for node in graph.node_ids])
+        return quality_summary(community_quality(graph, labels))
     
-    def _generate_community_labels(self):
-        """Generate meaningful labels for communities based on their characteristics."""
-        community_labels = {}
-        
-        # Group nodes by community
-        community_nodes = {}
-        for node, community_id in self.communities.items():
-            if community_id not in community_nodes:
-                community_nodes[community_id] = []
-            community_nodes[community_id].append(node)
-        
-        # Load node data for analysis
-        try:
-            with open('data/biotech_network_data.json', 'r') as f:
-                data = json.load(f)
-            node_data = {node['id']: node for node in data['nodes']}
-        except:
-            node_data = {}
-        
-        # Analyze each community
-        for community_id, nodes in community_nodes.items():
-            if len(nodes) == 1:
-                # Single node community
-                node = nodes[0]
-                node_info = node_data.get(node, {})
-                node_type = node_info.get('type', 'unknown')
-                community_labels[community_id] = f"Single {node_type.title()}: {node.replace('_', ' ').title()}"
-            else:
-                # Multi-node community - analyze characteristics
-                node_types = []
-                node_names = []
-                
-                for node in nodes:
-                    node_info = node_data.get(node, {})
-                    node_type = node_info.get('type', 'unknown')
-                    node_name = node_info.get('name', node.replace('_', ' ').title())
-                    node_types.append(node_type)
-                    node_names.append(node_name)
-                
-                # Count node types
-                type_counts = {}
-                for node_type in node_types:
-                    type_counts[node_type] = type_counts.get(node_type, 0) + 1
-                
-                # Find dominant type
-                dominant_type = max(type_counts, key=type_counts.get)
-                dominant_count = type_counts[dominant_type]
-                
-                # Find most central node (highest degree)
-                central_node = max(nodes, key=lambda n: self.G.degree(n))
-                central_node_info = node_data.get(central_node, {})
-                central_node_name = central_node_info.get('name', central_node.replace('_', ' ').title())
-                
-                # Generate label based on characteristics
-                if dominant_count == len(nodes):
-                    # All nodes are same type
-                    if dominant_type == 'university':
-                        community_labels[community_id] = f"Academic Cluster ({len(nodes)} nodes)"
-                    elif dominant_type == 'startup':
-                        community_labels[community_id] = f"Startup Cluster ({len(nodes)} nodes)"
-                    elif dominant_type == 'vc':
-                        community_labels[community_id] = f"Investment Cluster ({len(nodes)} nodes)"
-                    elif dominant_type == 'government':
-                        community_labels[community_id] = f"Government Cluster ({len(nodes)} nodes)"
-                    else:
-                        community_labels[community_id] = f"{dominant_type.title()} Cluster ({len(nodes)} nodes)"
-                else:
-                    # Mixed community - use central node and dominant type
-                    if dominant_type == 'university':
-                        community_labels[community_id] = f"Academic Hub: {central_node_name} ({len(nodes)} nodes)"
-                    elif dominant_type == 'startup':
-                        community_labels[community_id] = f"Startup Hub: {central_node_name} ({len(nodes)} nodes)"
-                    else:
-                        community_labels[community_id] = f"Mixed: {central_node_name} ({len(nodes)} nodes)"
-        
-        return community_labels
+    def _profile_communities(self):
+        """Org-type and link-type mix, hub and label of every community, from the in-memory graph."""
+        labels = np.array([self.communities.get(node, 0) for node in self.graph.node_ids])
+        return CommunityProfiles(self.graph, labels)
     
     def export_csv(self, filename='data/biotech_network_metrics.csv'):
         """Export node-level metrics to CSV."""
@@ -716,6 +614,23 @@ class BiotechNetworkAnalyzer:
         print(f"CSV exported: {filename}")
         return df
     
+    def export_communities(self, filename=None):
+        """Save the community partition for the next run to warm-start from."""
+        filename = filename or self.communities_file
+        if self.community_consensus is None:
+            return
+        save_partition(filename, self.graph, self.community_consensus.labels, self.community_consensus.stability,
+                       self.louvain_runs, self.seed, self.community_consensus.full_modularity)
+        print(f"Communities exported: {filename}")
+    
+    def export_community_profiles(self, filename='data/biotech_network_community_profiles.csv'):
+        """Export the community profile table as CSV and JSON (same name, .json)."""
+        if self.community_profiles is None:
+            return
+        json_file = str(Path(filename).with_suffix('.json'))
+        self.community_profiles.export(filename, json_file)
+        print(f"Community profiles exported: {filename}, {json_file}")
+    
     def create_visualizations(self):
         """Create all visualization plots."""
         print("Creating visualizations...")
@@ -1136,14 +1051,8 @@ class BiotechNetworkAnalyzer:
     
     def _plot_organization_types(self):
         """Plot breakdown of organization types."""
-        # Count organization types
-        org_types = {}
-        for node in self.raw_data.get('nodes', []):
-            org_type = node.get('type', 'Unknown')
-            org_types[org_type] = org_types.get(org_type, 0) + 1
-        
-        # Sort by count and take top 10
-        sorted_types = sorted(org_types.items(), key=lambda x: x[1], reverse=True)[:10]
+        # Sort organization types by count and take top 10
+        sorted_types = sorted(self.org_type_counts.items(), key=lambda x: x[1], reverse=True)[:10]
         
         fig, ax = plt.subplots(figsize=(12, 8))
         
@@ -1180,14 +1089,8 @@ class BiotechNetworkAnalyzer:
     
     def _plot_connection_types(self):
         """Plot breakdown of connection types."""
-        # Count connection types
-        conn_types = {}
-        for link in self.raw_data.get('links', []):
-            conn_type = link.get('type', 'Unknown')
-            conn_types[conn_type] = conn_types.get(conn_type, 0) + 1
-        
-        # Sort by count and take top 10
-        sorted_types = sorted(conn_types.items(), key=lambda x: x[1], reverse=True)[:10]
+        # Sort connection types by count and take top 10
+        sorted_types = sorted(self.connection_type_counts.items(), key=lambda x: x[1], reverse=True)[:10]
         
         fig, ax = plt.subplots(figsize=(12, 8))
         
@@ -1235,8 +1138,18 @@ class BiotechNetworkAnalyzer:
         print(f"  • Density: {self.network_stats['density']:.3f}")
         print(f"  • Communities: {self.network_stats['num_communities']}")
         print(f"  • Modularity: {self.network_stats['modularity']:.3f}")
+        consensus = self.network_stats['community_consensus']
+        if consensus and consensus['mode'] == 'warm':
+            print(f"  • Communities warm-started from the previous run: {consensus['reoptimized_nodes']} nodes re-optimized "
+                  f"around {consensus['touched_nodes']} changed")
+        elif consensus:
+            print(f"  • Community Stability: {consensus['mean_stability']:.3f} over {consensus['runs']} seeded Louvain runs "
+                  f"({consensus['unstable_nodes']} nodes moved between runs)")
         print(f"  • Transitivity: {self.network_stats['transitivity']:.3f}")
         print(f"  • Average Clustering: {self.network_stats['average_clustering']:.3f}")
+        embeddedness = self.network_stats['edge_embeddedness']
+        print(f"  • Link Embeddedness: {embeddedness['mean_common_neighbors']:.2f} shared partners per link "
+              f"(overlap {embeddedness['mean_overlap']:.3f}); {embeddedness['local_bridges']} links are local bridges")
         
         # Display rich club coefficients for key degree thresholds
         rich_club = self.network_stats['rich_club_coefficients']
@@ -1256,6 +1169,16 @@ class BiotechNetworkAnalyzer:
         
         print(f"  • Assortativity: {self.network_stats['assortativity']:.3f}")
         
+        approximation = self.network_stats['approximation']
+        if approximation['mode'] == 'approximate':
+            bounds = approximation['error_bounds']
+            print(f"\nApproximate Centralities ({approximation['samples']:,} sampled sources, {approximation['confidence']:.0%} confidence):")
+            print(f"  • Betweenness: ±{bounds['betweenness_centrality']:.4f} "
+                  f"(settled after {approximation['settled_at']['betweenness_centrality'] or approximation['samples']:,} sources)")
+            print(f"  • Closeness: ±{bounds['closeness_centrality']:.4f}")
+            print(f"  • Harmonic: ±{bounds['harmonic_centrality']:.2f}")
+            print(f"  • Top-10 rankings certain: {', '.join(name for name, certain in approximation['top_10_separated'].items() if certain) or 'none yet'}")
+        
         # Community Quality Metrics
         cq = self.network_stats['community_quality']
         print(f"\nCommunity Quality:")
@@ -1273,11 +1196,25 @@ class BiotechNetworkAnalyzer:
         print(f"  • Node Connectivity: {rm['node_connectivity']} (min nodes to disconnect)")
         print(f"  • Edge Connectivity: {rm['edge_connectivity']} (min edges to disconnect)")
         print(f"  • Algebraic Connectivity: {rm['algebraic_connectivity']:.3f} (higher = more robust)")
+        if rm['largest_cc_algebraic_connectivity'] != rm['algebraic_connectivity']:
+            print(f"    (largest component: {rm['largest_cc_algebraic_connectivity']:.3f})")
+        print(f"  • Spectral Radius: {rm['spectral_radius']:.3f} (gap to the next eigenvalue: {rm['spectral_gap']:.3f})")
         print(f"  • Robustness to Random Failures: {rm['robustness_random']:.3f}")
+        curve = rm['random_failure_curve']
+        half = len(curve['mean']) // 2
+        print(f"    (giant component with {curve['fraction_removed'][half]:.0%} removed at random: "
+              f"{curve['mean'][half]:.3f} [{curve['lower'][half]:.3f}, {curve['upper'][half]:.3f}], {curve['trials']} trials)")
         print(f"  • Robustness to Targeted Attacks: {rm['robustness_targeted']:.3f}")
+        if rm['attack_curves']:
+            worst = min(rm['attack_curves'].values(), key=lambda curve: curve['robustness_index'])
+            print(f"    (most damaging attack: {worst['mode']} {worst['strategy']}, R = {worst['robustness_index']:.3f})")
         print(f"  • Network Efficiency: {rm['efficiency']:.3f}")
         print(f"  • Vulnerability: {rm['vulnerability']:.3f} (lower is better)")
         print(f"  • Critical Nodes: {rm['critical_nodes_count']} nodes")
+        print(f"  • Articulation Points: {rm['articulation_points_count']} nodes (each splits its component)")
+        for pair in rm.get('critical_pairs', [])[:3]:
+            names = ' + '.join(self.node_names.get(node, node) for node in pair['nodes'])
+            print(f"    - {names}: {pair['impact']:.1%} of the largest component lost together")
         
         # Top nodes
         df = pd.DataFrame.from_dict(self.node_metrics, orient='index')
@@ -1318,6 +1255,27 @@ class BiotechNetworkAnalyzer:
             display_name = self.node_names.get(row['node_id'], row['node_id'])
             print(f"  {i}. {display_name}: {row['harmonic_centrality']:.3f}")
         
+        print(f"\nTop 5 Current-Flow Betweenness (all paths, not just shortest):")
+        top_current_flow = df.nlargest(5, 'current_flow_betweenness')
+        for i, (idx, row) in enumerate(top_current_flow.iterrows(), 1):
+            display_name = self.node_names.get(row['node_id'], row['node_id'])
+            print(f"  {i}. {display_name}: {row['current_flow_betweenness']:.3f} "
+                  f"(information centrality {row['information_centrality']:.3f})")
+        
+        print(f"\nTop 5 Katz Centrality:")
+        top_katz = df.nlargest(5, 'katz_centrality')
+        for i, (idx, row) in enumerate(top_katz.iterrows(), 1):
+            display_name = self.node_names.get(row['node_id'], row['node_id'])
+            print(f"  {i}. {display_name}: {row['katz_centrality']:.3f}")
+        
+        if df['subgraph_centrality'].notna().any():
+            print(f"\nTop 5 Subgraph Centrality (closed walks):")
+            top_subgraph = df.nlargest(5, 'subgraph_centrality')
+            for i, (idx, row) in enumerate(top_subgraph.iterrows(), 1):
+                display_name = self.node_names.get(row['node_id'], row['node_id'])
+                print(f"  {i}. {display_name}: {row['subgraph_centrality']:.1f} "
+                      f"(total communicability {row['total_communicability']:.1f})")
+        
         print(f"\nTop 5 PageRank:")
         top_pagerank = df.nlargest(5, 'pagerank')
         for i, (idx, row) in enumerate(top_pagerank.iterrows(), 1):
@@ -1364,6 +1322,9 @@ class BiotechNetworkAnalyzer:
         print(f"\nCore-Periphery Distribution:")
         print(f"  • Core Organizations: {core_count} ({core_count/len(is_core)*100:.1f}%)")
         print(f"  • Periphery Organizations: {periphery_count} ({periphery_count/len(is_core)*100:.1f}%)")
+        print(f"  • Core Score Threshold: {self.network_stats['core_threshold']:.3f} (70th percentile)")
+        if self.network_stats['core_periphery_fit'] is not None:
+            print(f"  • Continuous Core Model Fit: {self.network_stats['core_periphery_fit']:.3f} (correlation)")
         
         print(f"\nFiles Generated:")
         print(f"  • data/biotech_network_metrics.csv")
@@ -1397,26 +1358,22 @@ class BiotechNetworkAnalyzer:
         top_closeness = df.nlargest(10, 'closeness_centrality')
         top_clustering = df.nlargest(10, 'clustering_coefficient')
         
-        # Community breakdown
-        community_sizes = df['community_label'].value_counts()
-        top_communities = community_sizes.head(10)
+        # Community breakdown (largest first, from the community profiles)
+        if self.community_profiles is not None:
+            top_communities = self.community_profiles.table().head(10)
+        else:
+            top_communities = pd.DataFrame(columns=['community_label', 'size', 'hub_name', 'dominant_type'])
         
         # Organization type breakdown
-        org_types = {}
-        for node in self.raw_data.get('nodes', []):
-            org_type = node.get('type', 'Unknown')
-            org_types[org_type] = org_types.get(org_type, 0) + 1
+        org_types = self.org_type_counts
         sorted_org_types = sorted(org_types.items(), key=lambda x: x[1], reverse=True)
         
         # Connection type breakdown
-        conn_types = {}
-        for link in self.raw_data.get('links', []):
-            conn_type = link.get('type', 'Unknown')
-            conn_types[conn_type] = conn_types.get(conn_type, 0) + 1
+        conn_types = self.connection_type_counts
         sorted_conn_types = sorted(conn_types.items(), key=lambda x: x[1], reverse=True)
         
         # Network health metrics
-        degrees = [self.G.degree(node) for node in self.G.nodes()]
+        degrees = self.graph.degree
         degree_stats = {
             'mean': np.mean(degrees),
             'median': np.median(degrees),
@@ -1425,6 +1382,16 @@ class BiotechNetworkAnalyzer:
             'max': np.max(degrees)
         }
         
+        # How the distance-based centralities were computed
+        approximation = self.network_stats['approximation']
+        if approximation['mode'] == 'approximate':
+            bounds = approximation['error_bounds']
+            centrality_note = (f"Betweenness, closeness and harmonic centrality estimated from {approximation['samples']:,} sampled sources "
+                               f"(±{bounds['betweenness_centrality']:.4f}, ±{bounds['closeness_centrality']:.4f} and ±{bounds['harmonic_centrality']:.2f} "
+                               f"at {approximation['confidence']:.0%} confidence)")
+        else:
+            centrality_note = "Betweenness, closeness and harmonic centrality computed exactly"
+        
         # Generate report content
         report_content = f"""# Atlanta Biotech Network Analysis Results
 
@@ -1447,7 +1414,7 @@ This report presents the results of a comprehensive network analysis of the Atla
 - **Median Degree**: {degree_stats['median']:.1f} connections per organization
 - **Degree Standard Deviation**: {degree_stats['std']:.1f} (indicates network heterogeneity)
 - **Degree Range**: {degree_stats['min']} - {degree_stats['max']} connections
-- **Network Connectivity**: {'Connected' if nx.is_connected(self.G) else 'Disconnected'} (main component)
+- **Network Connectivity**: {'Connected' if self.graph.is_connected() else 'Disconnected'} (main component)
 
 ### Network Characteristics
 - **Sparse Network**: Low density suggests specialized, targeted connections rather than random interactions
@@ -1517,8 +1484,8 @@ The network contains {self.network_stats['num_communities']} distinct communitie
 ### Top 10 Communities by Size
 """
         
-        for i, (community, size) in enumerate(top_communities.items(), 1):
-            report_content += f"{i}. **{community}** - {size} organizations\n"
+        for i, row in enumerate(top_communities.itertuples(index=False), 1):
+            report_content += f"{i}. **{row.community_label}** - {row.size} organizations (hub: {row.hub_name}; mostly {row.dominant_type})\n"
         
         report_content += f"""
 ## Network Metrics Analysis
@@ -1535,7 +1502,7 @@ The network contains {self.network_stats['num_communities']} distinct communitie
 - **Assortativity**: {self.network_stats['assortativity']:.3f} - Tendency for similar nodes to connect (-1 to +1 scale)
 
 ### Network Health Assessment
-- **Connectivity**: {'Strong' if nx.is_connected(self.G) else 'Fragmented'} - {'All nodes are reachable' if nx.is_connected(self.G) else 'Some nodes are isolated'}
+- **Connectivity**: {'Strong' if self.graph.is_connected() else 'Fragmented'} - {'All nodes are reachable' if self.graph.is_connected() else 'Some nodes are isolated'}
 - **Hub Concentration**: {'High' if degree_stats['std'] > degree_stats['mean'] else 'Moderate'} - Degree variation indicates {'concentrated' if degree_stats['std'] > degree_stats['mean'] else 'distributed'} power
 - **Community Integration**: {'Strong' if self.network_stats['modularity'] > 0.3 else 'Weak'} - Modularity score indicates {'well-defined' if self.network_stats['modularity'] > 0.3 else 'loose'} community structure
 
@@ -1584,6 +1551,7 @@ The network contains {self.network_stats['num_communities']} distinct communitie
 - Analysis based on {self.network_stats['raw_nodes']:,} organizations and {self.network_stats['raw_links']:,} connections
 - Data cleaned to remove duplicates and ensure accuracy
 - Network metrics calculated using NetworkX library
+- {centrality_note}
 - Community detection performed using Louvain algorithm
 - All visualizations generated as publication-quality SVG files
 
@@ -1610,7 +1578,28 @@ def main():
     print("=" * 40)
     
     # Initialize analyzer
-    analyzer = BiotechNetworkAnalyzer()
+    workers = 1
+    if '--workers' in sys.argv[1:]:
+        value = sys.argv[sys.argv.index('--workers') + 1]
+        workers = int(value) or None
+    mode = 'approximate' if '--approximate' in sys.argv[1:] else 'exact'
+    epsilon = 0.01
+    if '--epsilon' in sys.argv[1:]:
+        epsilon = float(sys.argv[sys.argv.index('--epsilon') + 1])
+    core_fit = '--core-fit' in sys.argv[1:]
+    seed = 0
+    if '--seed' in sys.argv[1:]:
+        seed = int(sys.argv[sys.argv.index('--seed') + 1])
+    critical_pairs = '--critical-pairs' in sys.argv[1:]
+    louvain_runs = 16
+    if '--louvain-runs' in sys.argv[1:]:
+        louvain_runs = int(sys.argv[sys.argv.index('--louvain-runs') + 1])
+    warm_start = '--full-communities' not in sys.argv[1:]
+    adaptive_attacks = '--adaptive-attacks' in sys.argv[1:]
+    subgraph_centrality = '--subgraph-centrality' in sys.argv[1:]
+    analyzer = BiotechNetworkAnalyzer(workers=workers, mode=mode, epsilon=epsilon, core_fit=core_fit, seed=seed,
+                                      critical_pairs=critical_pairs, louvain_runs=louvain_runs, warm_start=warm_start,
+                                      adaptive_attacks=adaptive_attacks, subgraph_centrality=subgraph_centrality)
     
     try:
         # Load data
@@ -1624,6 +1613,8 @@ def main():
         
         # Export CSV
         analyzer.export_csv()
+        analyzer.export_communities()
+        analyzer.export_community_profiles()
         
         # Create visualizations
         analyzer.create_visualizations()
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Approximate Distance-Based Centralities by Pivot Sampling
+
+Exact betweenness, closeness and harmonic centrality need a BFS from every
+node. `ApproximateSweep` runs the same BFS engine from a uniform sample of
+pivot sources instead, and scales the per-node sums up to estimates:
+
+- betweenness: n/k times the sampled Brandes dependencies
+- harmonic: n/k times the sampled reciprocal distances to each node
+- closeness: per connected component. Component sizes are known exactly,
+  so only the mean distance to the component is estimated, from the
+  sources sampled inside it (a component whose nodes have all been
+  sampled is exact)
+
+Sampling is progressive: the sample doubles until every metric has
+settled, or until every node has been a source, in which case the
+results are exact. A metric settles when every node's error bound is
+within `epsilon` (additive, on the 0-1 normalized scale; harmonic is
+bounded as harmonic / (n - 1)) at the chosen confidence, or when its
+top-10 ranking is separated by the bounds, which usually happens much
+earlier. Once betweenness has settled, later rounds skip the Brandes
+accumulation and its estimate stays at the sample it settled on. Bounds
+are the smaller of an empirical-Bernstein and a Hoeffding bound, with a
+union bound over nodes, metrics and rounds. Empirical Bernstein uses the
+sample variance, so low-variance graphs stop early.
+
+Usage: python centrality_sampling.py [data/biotech_network_data.json] [epsilon]
+    Compares the estimates with the exact sweep on the given data file.
+"""
+
+import math
+import numpy as np
+
+import graph_core
+
+# Metrics estimated from the sample, in the order they are bounded
+SAMPLED_METRICS = ('betweenness_centrality', 'closeness_centrality', 'harmonic_centrality')
+
+INITIAL_SAMPLE = 64
+
+def _bound(sum_x, sum_x2, k, value_range, log_term, population):
+    """
+    Per-node additive bound on the mean of k samples in [0, value_range],
+    drawn without replacement from `population` values (k, value_range and
+    population may be per-node arrays; every k must be >= 1). The Hoeffding
+    side carries the Serfling correction, so it reaches 0 once the whole
+    population has been sampled.
+    """
+    k = np.broadcast_to(np.asarray(k, dtype=np.float64), np.shape(sum_x))
+    population = np.asarray(population, dtype=np.float64)
+    # Bardenet-Maillard finite-population factor
+    shrink = np.where(k <= population / 2, 1 - (k - 1) / population, (1 - k / population) * (1 + 1 / k))
+    hoeffding = value_range * np.sqrt(np.maximum(shrink, 0.0) * log_term / (2 * k))
+    several = np.maximum(k - 1, 1)
+    variance = np.maximum(sum_x2 - sum_x * sum_x / k, 0.0) / several
+    bernstein = np.sqrt(2 * variance * log_term / k) + 7 * value_range * log_term / (3 * several)
+    return np.where(k >= 2, np.minimum(bernstein, hoeffding), hoeffding)
+
+class ApproximateSweep:
+    """
+    Sampled counterpart of graph_core.DistanceSweep with the same accessors
+    (betweenness, closeness, harmonic, diameter, average_path_length,
+    global_efficiency, path_length_counts) plus per-metric error bounds.
+    """
+
+    def __init__(self, graph, epsilon=0.01, confidence=0.95, seed=0, workers=1):
+        n = graph.n
+        self.n = n
+        self.epsilon = epsilon
+        self.confidence = confidence
+        self.samples = 0
+        self.rounds = 0
+        self.settled = {name: None for name in SAMPLED_METRICS}  # Metric -> samples at which it settled
+        self._betweenness_samples = 0
+
+        # Per-target sums over the sampled sources
+        self._dependency = np.zeros(n)
+        self._dependency_sq = np.zeros(n)
+        self._distance = np.zeros(n)
+        self._distance_sq = np.zeros(n)
+        self._reciprocal = np.zeros(n)
+        self._reciprocal_sq = np.zeros(n)
+
+        # Closeness is estimated per connected component
+        count, self._labels = graph.component_labels()
+        self._component_size = np.bincount(self._labels, minlength=count)
+        self._component_samples = np.zeros(count, dtype=np.int64)
+        # Smallest eccentricity of a sampled source per component (no distance in it exceeds twice that)
+        self._component_eccentricity = np.full(count, np.iinfo(np.int64).max)
+
+        # Per-source sums over the sampled sources
+        self._source_distance = 0
+        self._source_reciprocal = 0.0
+        self._max_eccentricity = 0
+        self._histogram = np.zeros(1, dtype=np.int64)
+
+        self.node_bounds = {name: np.zeros(n) for name in SAMPLED_METRICS}
+        if n == 0:
+            return
+
+        order = np.random.default_rng(seed).permutation(n)
+        max_rounds = max(1, math.ceil(math.log2(max(n / INITIAL_SAMPLE, 1)))) + 1
+        delta = 1 - confidence
+        self._log_term = math.log(2 * 3 * n * max_rounds / delta)  # 3 bounded quantities per node
+
+        workers = min(graph_core.resolve_workers(workers), n)
+        pool = graph_core.graph_pool(graph, workers) if workers > 1 else None
+        try:
+            target = min(n, INITIAL_SAMPLE)
+            while True:
+                batch = order[self.samples:target].tolist()
+                chunks = graph_core.interleaved_chunks(batch, workers) if pool is not None else [batch]
+                dependencies = self.settled['betweenness_centrality'] is None
+                for chunk, part in zip(chunks, graph_core.sweep_chunks(graph, chunks, pool, True, dependencies)):
+                    self._add(chunk, part)
+                self.samples = target
+                if dependencies:
+                    self._betweenness_samples = target
+                self.rounds += 1
+                self._update_bounds()
+                for name in SAMPLED_METRICS:
+                    if self.settled[name] is None and (self.node_bounds[name].max() <= epsilon or self.top_k_separated(name)):
+                        self.settled[name] = self.samples
+                if self.samples == n or all(value is not None for value in self.settled.values()):
+                    break
+                target = min(n, 2 * self.samples)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+    def _add(self, chunk, part):
+        """Fold one chunk's sweep results into the running sums."""
+        dependency, distance_sums, reciprocal_sums, _, eccentricity, histogram, target_sums = part
+        distance, distance_sq, reciprocal, reciprocal_sq, _, dependency_sq = target_sums
+        self._dependency += dependency
+        self._dependency_sq += dependency_sq
+        self._distance += distance
+        self._distance_sq += distance_sq
+        self._reciprocal += reciprocal
+        self._reciprocal_sq += reciprocal_sq
+        components = self._labels[np.asarray(chunk, dtype=np.int64)]
+        np.add.at(self._component_samples, components, 1)
+        np.minimum.at(self._component_eccentricity, components, np.asarray(eccentricity, dtype=np.int64))
+        self._source_distance += sum(distance_sums)
+        self._source_reciprocal += sum(reciprocal_sums)
+        self._max_eccentricity = max([self._max_eccentricity] + eccentricity)
+        if len(histogram) > len(self._histogram):
+            self._histogram = np.pad(self._histogram, (0, len(histogram) - len(self._histogram)))
+        self._histogram[:len(histogram)] += histogram
+
+    @property
+    def exact(self):
+        """True when every node has been a source for every metric (estimates are exact)."""
+        return self.samples == self.n and self._betweenness_samples == self.n
+
+    def _update_bounds(self):
+        """Recompute every node's error bound for each sampled metric."""
+        n, k = self.n, self.samples
+        if self.exact or n <= 2:
+            self.node_bounds = {name: np.zeros(n) for name in SAMPLED_METRICS}
+            return
+
+        # Per-source samples scaled so their mean is the normalized metric
+        unit = n / (n - 1)
+        betweenness_scale = n / ((n - 1) * (n - 2))
+        log_term = self._log_term
+        betweenness = _bound(betweenness_scale * self._dependency, betweenness_scale ** 2 * self._dependency_sq,
+                             max(self._betweenness_samples, 1), unit, log_term, n)
+        harmonic = _bound(unit * self._reciprocal, unit ** 2 * self._reciprocal_sq, k, unit, log_term, n)
+
+        # Closeness = rho (c - 1) / (c M), with rho = (c - 1) / (n - 1) exact and
+        # M the mean distance to the component's c nodes, bounded by interval
+        # arithmetic from the k_C sources sampled in the component
+        size = self._component_size[self._labels]
+        sampled = self._component_samples[self._labels]
+        rho = (size - 1) / (n - 1)
+        floor = (size - 1) / size  # Every other node is at least one hop away
+        seen = sampled > 0
+        distance = np.zeros(n)
+        distance_range = 2.0 * self._component_eccentricity[self._labels][seen]
+        distance[seen] = _bound(self._distance[seen], self._distance_sq[seen], sampled[seen], distance_range,
+                                log_term, size[seen])
+        mean = self._component_mean_distance()
+        estimate = self.closeness()
+        high = np.divide(rho * floor, np.maximum(mean - distance, floor), out=np.zeros(n), where=size > 1)
+        low = np.divide(rho * floor, mean + distance, out=np.zeros(n), where=seen & (size > 1))
+        closeness = np.maximum(high - estimate, estimate - low)
+        # Components sampled in full are exact
+        closeness[sampled == size] = 0.0
+
+        self.node_bounds = {
+            'betweenness_centrality': betweenness,
+            'closeness_centrality': closeness,
+            'harmonic_centrality': harmonic,
+        }
+
+    def _component_mean_distance(self):
+        """Estimated mean distance from each node to the nodes of its component (0 where none sampled)."""
+        sampled = self._component_samples[self._labels]
+        return np.divide(self._distance, sampled, out=np.zeros(self.n), where=sampled > 0)
+
+    def max_bound(self):
+        """Largest normalized error bound over all nodes and metrics."""
+        if self.n == 0:
+            return 0.0
+        return max(float(bounds.max()) for bounds in self.node_bounds.values())
+
+    def betweenness(self, normalized=True):
+        """Estimated betweenness with the same scaling as networkx."""
+        if self.samples == 0:
+            return np.zeros(self.n)
+        raw = self._dependency * (self.n / self._betweenness_samples)  # Estimated sum over all sources
+        if normalized:
+            scale = 1 / ((self.n - 1) * (self.n - 2)) if self.n > 2 else 1.0
+        else:
+            scale = 0.5
+        return raw * scale
+
+    def closeness(self):
+        """
+        Estimated closeness (Wasserman-Faust correction, as networkx). A node
+        whose component has no sampled source gets the upper limit rho.
+        """
+        closeness = np.zeros(self.n)
+        if self.n > 1 and self.samples > 0:
+            size = self._component_size[self._labels]
+            rho = (size - 1) / (self.n - 1)
+            floor = (size - 1) / size
+            np.divide(rho * floor, np.maximum(self._component_mean_distance(), floor), out=closeness, where=size > 1)
+        return closeness
+
+    def harmonic(self):
+        """Estimated sum of reciprocal distances to every other reachable node."""
+        if self.samples == 0:
+            return np.zeros(self.n)
+        return self._reciprocal * (self.n / self.samples)
+
+    def diameter(self):
+        """Largest sampled eccentricity (a lower bound on the diameter; exact when all nodes were sampled)."""
+        return int(self._max_eccentricity)
+
+    def average_path_length(self):
+        """Estimated mean shortest-path length over ordered node pairs."""
+        if self.n <= 1 or self.samples == 0:
+            return 0.0
+        return self._source_distance / (self.samples * (self.n - 1))
+
+    def global_efficiency(self):
+        """Estimated mean reciprocal distance over ordered node pairs."""
+        if self.n <= 1 or self.samples == 0:
+            return 0.0
+        return self._source_reciprocal / (self.samples * (self.n - 1))
+
+    def path_length_counts(self):
+        """{hop distance: estimated number of unordered node pairs at that distance}."""
+        if self.samples == 0:
+            return {}
+        scale = self.n / self.samples / 2
+        return {d: int(round(count * scale)) for d, count in enumerate(self._histogram.tolist()) if d > 0}
+
+    def error_bounds(self):
+        """{metric: largest additive error bound over nodes, in the metric's own units}."""
+        bounds = {name: float(values.max()) if self.n else 0.0 for name, values in self.node_bounds.items()}
+        bounds['harmonic_centrality'] *= max(self.n - 1, 0)
+        return bounds
+
+    def top_k_separated(self, name, k=10):
+        """
+        True when the top-k nodes by the estimate are certain: the k-th
+        lower bound is above every other node's upper bound.
+        """
+        estimate = {
+            'betweenness_centrality': self.betweenness,
+            'closeness_centrality': self.closeness,
+            'harmonic_centrality': lambda: self.harmonic() / max(self.n - 1, 1),
+        }[name]()
+        if self.exact or self.n <= k:
+            return True
+        bounds = self.node_bounds[name]
+        ranked = np.argsort(-estimate)
+        lowest_top = (estimate[ranked[:k]] - bounds[ranked[:k]]).min()
+        highest_rest = (estimate[ranked[k:]] + bounds[ranked[k:]]).max()
+        return bool(lowest_top > highest_rest)
+
+    def summary(self):
+        """Sampling report for network_stats."""
+        return {
+            'mode': 'approximate',
+            'epsilon': self.epsilon,
+            'confidence': self.confidence,
+            'samples': self.samples,
+            'rounds': self.rounds,
+            'exact': self.exact,
+            'settled_at': dict(self.settled),
+            'error_bounds': self.error_bounds(),
+            'top_10_separated': {name: self.top_k_separated(name) for name in SAMPLED_METRICS},
+        }
+
+def approximate_sweep(graph, epsilon=0.01, confidence=0.95, seed=0, workers=1):
+    """Estimate the distance-based metrics from a progressively grown pivot sample."""
+    return ApproximateSweep(graph, epsilon, confidence, seed, workers)
+
+def main():
+    """Compare the sampled estimates with the exact sweep on a data file."""
+    import sys
+    import json
+    data_file = sys.argv[1] if len(sys.argv) > 1 else 'data/biotech_network_data.json'
+    epsilon = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+
+    with open(data_file, 'r', encoding='utf-8') as f:
+        graph = graph_core.CSRGraph.from_data(json.load(f))
+    approximate = approximate_sweep(graph, epsilon=epsilon)
+    exact = graph_core.distance_sweep(graph)
+    print(f"Sampled {approximate.samples} of {graph.n} sources in {approximate.rounds} rounds")
+    print(f"  settled after: {approximate.settled}")
+
+    bounds = approximate.error_bounds()
+    for name, method in [('betweenness_centrality', 'betweenness'), ('closeness_centrality', 'closeness'), ('harmonic_centrality', 'harmonic')]:
+        error = float(np.abs(getattr(approximate, method)() - getattr(exact, method)()).max())
+        top_exact = set(np.argsort(-getattr(exact, method)())[:10].tolist())
+        top_estimate = set(np.argsort(-getattr(approximate, method)())[:10].tolist())
+        print(f"  {name}: max error {error:.4g} (bound {bounds[name]:.4g}), top-10 overlap {len(top_exact & top_estimate)}/10")
+
+if __name__ == "__main__":
+    main()
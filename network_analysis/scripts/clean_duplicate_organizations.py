@@ -3,13 +3,21 @@
 Clean Duplicate Organizations in Atlanta Biotech Network Data
 
 This script identifies and removes duplicate organizations from the network data.
-It keeps the most complete entry when duplicates are found.
+It keeps the most complete entry when duplicates are found. Near-duplicates
+under different names are found with the blocking index in org_matcher.py and
+reported; pass --merge-fuzzy to also merge the high-confidence ones.
+
+Usage: python scripts/clean_duplicate_organizations.py [--merge-fuzzy]
 """
 
+import sys
 import json
 from pathlib import Path
 
-def clean_duplicate_organizations():
+from org_matcher import find_fuzzy_duplicates, merge_fuzzy_duplicates
+from clean_duplicates import dedupe_links
+
+def clean_duplicate_organizations(merge_fuzzy=False):
     """Clean duplicate organizations from the network data."""
     print("Cleaning Duplicate Organizations")
     print("=" * 40)
@@ -19,6 +27,39 @@ def clean_duplicate_organizations():
     with open(data_file, 'r') as f:
         data = json.load(f)
     
+    duplicates_removed = dedupe_organizations(data)
+    fuzzy_merged = dedupe_fuzzy_organizations(data, merge=merge_fuzzy)['merged']
+    
+    if duplicates_removed or fuzzy_merged:
+        # Save cleaned data to final file
+        final_file = Path("data/biotech_network_data.json")
+        with open(final_file, 'w') as f:
+            json.dump(data, f, indent=2)
+        
+        print(f"Cleaned data saved to: {final_file}")
+    
+    report_duplicate_names(data)
+
+def choose_more_complete(first_node, dup_node):
+    """
+    Decide which of two entries for the same organization to keep.
+    
+    Returns (keep_duplicate, reason): the entry with the longer description
+    wins, and ties are broken by the larger size.
+    """
+    first_desc = len(first_node.get('description', ''))
+    dup_desc = len(dup_node.get('description', ''))
+    
+    if dup_desc > first_desc:
+        return True, "longer description"
+    if dup_desc == first_desc:
+        if dup_node.get('size', 0) > first_node.get('size', 0):
+            return True, "larger size"
+        return False, "larger size"
+    return False, "longer description"
+
+def dedupe_organizations(data):
+    """Remove duplicate organization ids from in-memory network data."""
     print(f"Original nodes: {len(data['nodes'])}")
     
     # Find duplicates by ID
@@ -32,55 +73,74 @@ def clean_duplicate_organizations():
         else:
             seen_ids[node_id] = i
     
-    if duplicate_ids:
-        print(f"Found {len(duplicate_ids)} duplicate organizations:")
-        
-        # Remove duplicates, keeping the most complete entry
-        indices_to_remove = []
-        
-        for first_idx, dup_idx, node_id in duplicate_ids:
-            first_node = data['nodes'][first_idx]
-            dup_node = data['nodes'][dup_idx]
-            
-            print(f"  - {node_id}: {first_node['name']}")
-            print(f"    Entry 1 (index {first_idx}): size={first_node.get('size', 'N/A')}, desc_length={len(first_node.get('description', ''))}")
-            print(f"    Entry 2 (index {dup_idx}): size={dup_node.get('size', 'N/A')}, desc_length={len(dup_node.get('description', ''))}")
-            
-            # Keep the entry with longer description or larger size
-            if len(dup_node.get('description', '')) > len(first_node.get('description', '')):
-                print(f"    -> Keeping entry 2 (longer description)")
-                indices_to_remove.append(first_idx)
-            elif len(dup_node.get('description', '')) == len(first_node.get('description', '')):
-                if dup_node.get('size', 0) > first_node.get('size', 0):
-                    print(f"    -> Keeping entry 2 (larger size)")
-                    indices_to_remove.append(first_idx)
-                else:
-                    print(f"    -> Keeping entry 1 (larger size)")
-                    indices_to_remove.append(dup_idx)
-            else:
-                print(f"    -> Keeping entry 1 (longer description)")
-                indices_to_remove.append(dup_idx)
-            print()
-        
-        # Remove duplicates (in reverse order to maintain indices)
-        for idx in sorted(indices_to_remove, reverse=True):
-            removed_node = data['nodes'].pop(idx)
-            print(f"Removed duplicate: {removed_node['id']} - {removed_node['name']}")
-        
-        print(f"Cleaned nodes: {len(data['nodes'])}")
-        print(f"Duplicates removed: {len(indices_to_remove)}")
-        
-        # Save cleaned data to final file
-        final_file = Path("data/biotech_network_data.json")
-        with open(final_file, 'w') as f:
-            json.dump(data, f, indent=2)
+    if not duplicate_ids:
+        print("No duplicate organizations found!")
+        return 0
+    
+    print(f"Found {len(duplicate_ids)} duplicate organizations:")
+    
+    # Remove duplicates, keeping the most complete entry
+    indices_to_remove = []
+    
+    for first_idx, dup_idx, node_id in duplicate_ids:
+        first_node = data['nodes'][first_idx]
+        dup_node = data['nodes'][dup_idx]
         
-        print(f"Cleaned data saved to: {final_file}")
+        print(f"  - {node_id}: {first_node['name']}")
+        print(f"    Entry 1 (index {first_idx}): size={first_node.get('size', 'N/A')}, desc_length={len(first_node.get('description', ''))}")
+        print(f"    Entry 2 (index {dup_idx}): size={dup_node.get('size', 'N/A')}, desc_length={len(dup_node.get('description', ''))}")
         
-    else:
-        print("No duplicate organizations found!")
+        keep_duplicate, reason = choose_more_complete(first_node, dup_node)
+        if keep_duplicate:
+            print(f"    -> Keeping entry 2 ({reason})")
+            indices_to_remove.append(first_idx)
+        else:
+            print(f"    -> Keeping entry 1 ({reason})")
+            indices_to_remove.append(dup_idx)
+        print()
     
-    # Also check for duplicate names (case-insensitive)
+    # Remove duplicates (in reverse order to maintain indices)
+    for idx in sorted(set(indices_to_remove), reverse=True):
+        removed_node = data['nodes'].pop(idx)
+        print(f"Removed duplicate: {removed_node['id']} - {removed_node['name']}")
+    
+    print(f"Cleaned nodes: {len(data['nodes'])}")
+    print(f"Duplicates removed: {len(set(indices_to_remove))}")
+    
+    return len(set(indices_to_remove))
+
+def dedupe_fuzzy_organizations(data, merge=False):
+    """
+    Report (and optionally merge) organizations that look like the same entity.
+    
+    Candidate pairs come from the blocking index in org_matcher.py, so only
+    organizations sharing a normalized name, acronym, website or similar
+    name/description are compared. With merge=True the 'merge' candidates
+    are collapsed into the more complete entry and links are rewired.
+    """
+    print("\nChecking for near-duplicate organizations...")
+    candidates = find_fuzzy_duplicates(data)
+    
+    if not candidates:
+        print("No near-duplicate organizations found!")
+        return {'candidates': [], 'merged': {}}
+    
+    print(f"Found {len(candidates)} candidate pairs:")
+    for candidate in candidates:
+        print(f"  [{candidate['policy']}] {candidate['first']} ~ {candidate['second']} (score {candidate['score']}, {candidate['evidence']})")
+    
+    merged = {}
+    if merge:
+        merged = merge_fuzzy_duplicates(data, candidates, choose_more_complete)
+        if merged:
+            # Rewired links can duplicate existing connections
+            dedupe_links(data, verbose=False)
+        print(f"Near-duplicates merged: {len(merged)}")
+    
+    return {'candidates': candidates, 'merged': merged}
+
+def report_duplicate_names(data):
+    """Print organizations that share a name (case-insensitive)."""
     print("\nChecking for duplicate names (case-insensitive)...")
     name_counts = {}
     for node in data['nodes']:
@@ -99,6 +159,8 @@ def clean_duplicate_organizations():
                 print(f"    ID: {node['id']}, Name: {node['name']}")
     else:
         print("No duplicate names found!")
+    
+    return duplicate_names
 
 if __name__ == "__main__":
-    clean_duplicate_organizations()
+    clean_duplicate_organizations(merge_fuzzy='--merge-fuzzy' in sys.argv[1:])
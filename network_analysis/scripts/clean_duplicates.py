@@ -4,52 +4,178 @@ Clean Duplicate Connections
 
 This script removes duplicate connections and keeps the most appropriate
 relationship type for each connection.
+
+Usage: python scripts/clean_duplicates.py [--chunked]
 """
 
+import sys
 import json
-from collections import defaultdict
+import numpy as np
+
+from js_literal_parser import LiteralParser, tokenize
+
+# Priority order for relationship types (lower wins)
+TYPE_PRIORITY = {
+    'member': 1,           # Highest priority - active membership
+    'affiliation': 2,      # Strong institutional connection
+    'investment': 3,       # Financial relationship
+    'partnership': 4,      # Business partnership
+    'collaboration': 5,    # Research/operational collaboration
+    'incubated_at': 7,     # Past incubation relationship
+    'funding': 8,          # Grant/funding relationship
+    'pilot': 9,            # Pilot program
+    'service': 10,         # Service provider relationship
+    'spinout': 11,         # Company spinout
+    'origin': 12,          # Origin relationship
+    'funded_by': 13,       # Funded by relationship
+    'support': 14,         # Support relationship
+    'research': 15,        # Research relationship
+    'research_collaboration': 16,  # Research collaboration
+    'graduate': 17,        # Past relationship
+    'client': 18,          # Client relationship
+    'tenant': 19,          # Tenant relationship
+}
+
+UNKNOWN_PRIORITY = 999  # Unknown types get low priority
+
+# Special cases based on your guidance, keyed by the sorted node pair
+SPECIAL_CASES = {
+    ('armor_medical', 'portal'): 'member',  # You said member is more accurate
+    ('eddf', 'emory'): 'affiliation',       # Affiliation is more fundamental
+    ('ethos_medical', 'portal'): 'member',  # Member is more accurate
+    ('earlitec', 'gra_fund'): 'investment', # Investment is the core relationship
+    ('department_of_veterans_affairs', 'oxos'): 'partnership',  # Partnership is more accurate
+}
+
+SPECIAL_PRIORITY = 0  # A special-case type beats every regular priority
+
+# Links per block in chunked mode
+LINK_CHUNK_SIZE = 100000
 
 def clean_duplicates(input_file, output_file):
     """Clean duplicate connections and keep the best relationship type."""
-    print("Cleaning duplicate connections...")
-    
     with open(input_file, 'r') as f:
         data = json.load(f)
     
-    # Group links by source-target pair (undirected)
-    link_groups = defaultdict(list)
+    dedupe_links(data)
+    
+    # Save cleaned data
+    with open(output_file, 'w') as f:
+        json.dump(data, f, indent=2)
+    
+    return data
+
+class LinkDeduplicator:
+    """
+    Columnar best-link-per-pair reduction.
     
-    for link in data['links']:
-        source = link['source']
-        target = link['target']
+    Node ids and relationship types are interned to integer codes, every
+    link becomes one row of (pair key, priority, position) arrays, and the
+    best link of each undirected pair is picked with a single lexsort and
+    group reduce. Rows can be added in blocks; between blocks only the
+    current best row per pair is kept, so memory grows with the number of
+    distinct pairs rather than the number of input links.
+    """
+    
+    def __init__(self):
+        self.node_codes = {}
+        self.type_codes = {}
+        self.type_ranks = np.zeros(0, dtype=np.int64)
+        self.special_keys = {}
         
-        # Create a consistent key for undirected edges
-        edge_key = tuple(sorted([source, target]))
-        link_groups[edge_key].append(link)
-    
-    # Process each group to keep the best relationship type
-    cleaned_links = []
-    duplicates_removed = 0
-    
-    for edge_key, links in link_groups.items():
-        if len(links) == 1:
-            # No duplicates, keep as is
-            cleaned_links.append(links[0])
-        else:
-            # Multiple links between same nodes - choose the best one
-            best_link = choose_best_relationship(links)
-            cleaned_links.append(best_link)
-            duplicates_removed += len(links) - 1
-            print(f"Removed {len(links) - 1} duplicate(s) for {edge_key[0]} <-> {edge_key[1]}")
-            print(f"  Kept: {best_link['type']} - {best_link.get('description', 'N/A')[:60]}...")
+        # One row per distinct pair seen so far
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.ranks = np.zeros(0, dtype=np.int64)
+        self.positions = np.zeros(0, dtype=np.int64)
+        self.first_positions = np.zeros(0, dtype=np.int64)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.links = []
+        self.total_links = 0
+    
+    def _intern(self, values, table):
+        """Map values to integer codes, extending the table."""
+        return np.fromiter((table.setdefault(value, len(table)) for value in values), dtype=np.int64, count=len(values))
+    
+    def _pair_key(self, source, target):
+        """Order-independent int64 key for an interned node pair."""
+        lo = np.minimum(source, target)
+        hi = np.maximum(source, target)
+        return (lo << 32) | hi
+    
+    def _refresh_lookups(self):
+        """Extend the type priority lookup and special-case keys to new codes."""
+        if len(self.type_ranks) < len(self.type_codes):
+            new_types = list(self.type_codes)[len(self.type_ranks):]
+            self.type_ranks = np.concatenate([
+                self.type_ranks,
+                np.array([TYPE_PRIORITY.get(t, UNKNOWN_PRIORITY) for t in new_types], dtype=np.int64)
+            ])
+        
+        for pair, preferred_type in SPECIAL_CASES.items():
+            if pair in self.special_keys:
+                continue
+            if all(node_id in self.node_codes for node_id in pair) and preferred_type in self.type_codes:
+                key = self._pair_key(np.int64(self.node_codes[pair[0]]), np.int64(self.node_codes[pair[1]]))
+                self.special_keys[pair] = (int(key), self.type_codes[preferred_type])
+    
+    def add(self, links):
+        """Fold a block of links into the per-pair best rows."""
+        if not links:
+            return
+        
+        source = self._intern([link['source'] for link in links], self.node_codes)
+        target = self._intern([link['target'] for link in links], self.node_codes)
+        types = self._intern([link.get('type', '') for link in links], self.type_codes)
+        self._refresh_lookups()
+        
+        keys = self._pair_key(source, target)
+        ranks = self.type_ranks[types]
+        for key, type_code in self.special_keys.values():
+            ranks[(keys == key) & (types == type_code)] = SPECIAL_PRIORITY
+        positions = np.arange(self.total_links, self.total_links + len(links), dtype=np.int64)
+        self.total_links += len(links)
+        
+        keys = np.concatenate([self.keys, keys])
+        ranks = np.concatenate([self.ranks, ranks])
+        first_positions = np.concatenate([self.first_positions, positions])
+        counts = np.concatenate([self.counts, np.ones(len(links), dtype=np.int64)])
+        positions = np.concatenate([self.positions, positions])
+        candidates = self.links + list(links)
+        
+        # Best row per pair: lowest rank, then earliest position
+        order = np.lexsort((positions, ranks, keys))
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.concatenate([[True], sorted_keys[1:] != sorted_keys[:-1]]))
+        best = order[starts]
+        
+        self.keys = keys[best]
+        self.ranks = ranks[best]
+        self.positions = positions[best]
+        self.first_positions = np.minimum.reduceat(first_positions[order], starts)
+        self.counts = np.add.reduceat(counts[order], starts)
+        self.links = [candidates[i] for i in best.tolist()]
+    
+    def result(self):
+        """Return (links, duplicate counts) in order of each pair's first appearance."""
+        order = np.argsort(self.first_positions, kind='stable')
+        return [self.links[i] for i in order.tolist()], self.counts[order] - 1
+
+def dedupe_links(data, verbose=True):
+    """Remove duplicate connections from in-memory network data."""
+    print("Cleaning duplicate connections...")
+    
+    deduplicator = LinkDeduplicator()
+    deduplicator.add(data['links'])
+    cleaned_links, duplicates = deduplicator.result()
+    
+    if verbose:
+        _report_duplicates(cleaned_links, duplicates)
+    
+    duplicates_removed = int(duplicates.sum())
     
     # Update the data
     data['links'] = cleaned_links
     
-    # Save cleaned data
-    with open(output_file, 'w') as f:
-        json.dump(data, f, indent=2)
-    
     print(f"\nCleaning complete!")
     print(f"Original links: {len(data['links']) + duplicates_removed}")
     print(f"Cleaned links: {len(data['links'])}")
@@ -57,66 +183,59 @@ def clean_duplicates(input_file, output_file):
     
     return data
 
-def choose_best_relationship(links):
-    """Choose the best relationship type from multiple links."""
-    
-    # Define priority order for relationship types
-    type_priority = {
-        'member': 1,           # Highest priority - active membership
-        'affiliation': 2,      # Strong institutional connection
-        'investment': 3,       # Financial relationship
-        'partnership': 4,      # Business partnership
-        'collaboration': 5,    # Research/operational collaboration
-        'tenant': 6,           # Physical location relationship
-        'incubated_at': 7,     # Past incubation relationship
-        'funding': 8,          # Grant/funding relationship
-        'pilot': 9,            # Pilot program
-        'service': 10,         # Service provider relationship
-        'spinout': 11,         # Company spinout
-        'origin': 12,          # Origin relationship
-        'funded_by': 13,       # Funded by relationship
-        'support': 14,         # Support relationship
-        'research': 15,        # Research relationship
-        'research_collaboration': 16,  # Research collaboration
-        'graduate': 17,        # Past relationship
-        'client': 18,          # Client relationship
-        'tenant': 19,          # Tenant relationship
-    }
-    
-    # Special cases based on your guidance
-    special_cases = {
-        ('armor_medical', 'portal'): 'member',  # You said member is more accurate
-        ('eddf', 'emory'): 'affiliation',       # Affiliation is more fundamental
-        ('ethos_medical', 'portal'): 'member',  # Member is more accurate
-        ('earlitec', 'gra_fund'): 'investment', # Investment is the core relationship
-        ('department_of_veterans_affairs', 'oxos'): 'partnership',  # Partnership is more accurate
-    }
-    
-    # Check for special cases first
-    for link in links:
-        source = link['source']
-        target = link['target']
-        edge_key = tuple(sorted([source, target]))
-        
-        if edge_key in special_cases:
-            preferred_type = special_cases[edge_key]
-            for link in links:
-                if link['type'] == preferred_type:
-                    return link
-    
-    # If no special case, choose by priority
-    best_link = None
-    best_priority = float('inf')
-    
-    for link in links:
-        link_type = link.get('type', '')
-        priority = type_priority.get(link_type, 999)  # Unknown types get low priority
-        
-        if priority < best_priority:
-            best_priority = priority
-            best_link = link
+def _report_duplicates(cleaned_links, duplicates):
+    """Print the kept link for every pair that had duplicates."""
+    for index in np.flatnonzero(duplicates).tolist():
+        best_link = cleaned_links[index]
+        edge_key = tuple(sorted([best_link['source'], best_link['target']]))
+        print(f"Removed {duplicates[index]} duplicate(s) for {edge_key[0]} <-> {edge_key[1]}")
+        print(f"  Kept: {best_link.get('type', '')} - {best_link.get('description', 'N/A')[:60]}...")
+
+def clean_duplicates_chunked(input_file, output_file, chunk_size=LINK_CHUNK_SIZE, verbose=False):
+    """
+    Deduplicate a link file too large to load at once.
+    
+    The input JSON is streamed with the incremental literal tokenizer and the
+    `links` array is folded into a LinkDeduplicator `chunk_size` links at a
+    time; only the other top-level keys and the best link per pair are held
+    in memory.
+    """
+    print("Cleaning duplicate connections (chunked)...")
     
-    return best_link
+    deduplicator = LinkDeduplicator()
+    data = {}
+    
+    with open(input_file, 'r', encoding='utf-8') as f:
+        parser = LiteralParser(tokenize(f))
+        for key in parser.iter_object_keys():
+            if key != 'links' or not parser.at('['):
+                data[key] = parser.parse_value()
+                continue
+            
+            data['links'] = None  # Keep the key order of the input
+            block = []
+            for link in parser.iter_array():
+                block.append(link)
+                if len(block) >= chunk_size:
+                    deduplicator.add(block)
+                    block = []
+            deduplicator.add(block)
+            print(f"  Processed {deduplicator.total_links} links, {len(deduplicator.keys)} distinct pairs")
+    
+    cleaned_links, duplicates = deduplicator.result()
+    if verbose:
+        _report_duplicates(cleaned_links, duplicates)
+    data['links'] = cleaned_links
+    
+    with open(output_file, 'w') as f:
+        json.dump(data, f, indent=2)
+    
+    print(f"\nCleaning complete!")
+    print(f"Original links: {deduplicator.total_links}")
+    print(f"Cleaned links: {len(cleaned_links)}")
+    print(f"Duplicates removed: {int(duplicates.sum())}")
+    
+    return data
 
 def main():
     """Clean the network data."""
@@ -127,7 +246,11 @@ def main():
     print("=" * 40)
     
     try:
-        cleaned_data = clean_duplicates(input_file, output_file)
+        if '--chunked' in sys.argv[1:]:
+            # Stream the links instead of loading the whole file
+            cleaned_data = clean_duplicates_chunked(input_file, output_file)
+        else:
+            cleaned_data = clean_duplicates(input_file, output_file)
         
         # Also create a backup of the original
         import shutil
@@ -137,7 +260,7 @@ def main():
         # Replace the original with cleaned data
         shutil.copy(output_file, input_file)
         print(f"Cleaned data saved to: {input_file}")
-        
+    
     except Exception as e:
         print(f"Error cleaning data: {e}")
         import traceback
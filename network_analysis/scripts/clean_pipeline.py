@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Fused Data Cleaning Pipeline for Atlanta Biotech Network
+
+This script runs the whole data update procedure in one process:
+
+1. Extract nodes, links and colors from the website JavaScript file
+2. Remove duplicate connections (clean_duplicates.py)
+3. Add nodes referenced in links but missing from the nodes array (add_missing_nodes.py)
+4. Remove duplicate organizations (clean_duplicate_organizations.py)
+5. Report near-duplicate organizations, merging confident matches with
+   --merge-fuzzy (org_matcher.py)
+
+Every stage works in memory on the same data dictionary, so only the final
+artifact is written instead of a JSON copy per stage.
+
+Usage: python scripts/clean_pipeline.py [--binary] [--merge-fuzzy]
+"""
+
+import sys
+import json
+import time
+from pathlib import Path
+
+from simple_node_extractor import extract_network_data
+from clean_duplicates import dedupe_links
+from add_missing_nodes import fill_missing_nodes
+from clean_duplicate_organizations import dedupe_organizations, dedupe_fuzzy_organizations, report_duplicate_names
+from graph_store import write_graph_store
+
+# (stage name, function taking and mutating the shared data dictionary)
+CLEANING_STAGES = [
+    ('Link deduplication', dedupe_links),
+    ('Missing node fill', fill_missing_nodes),
+    ('Organization deduplication', dedupe_organizations),
+]
+
+def run_pipeline(js_file, output_file='data/biotech_network_data.json', binary_file=None, merge_fuzzy=False):
+    """Extract and clean the network data in memory, writing only the final artifact."""
+    timings = []
+    
+    start = time.perf_counter()
+    data = extract_network_data(js_file)
+    timings.append(('Extraction', time.perf_counter() - start))
+    
+    for stage_name, stage in CLEANING_STAGES:
+        print(f"\n--- {stage_name} ---")
+        start = time.perf_counter()
+        stage(data)
+        timings.append((stage_name, time.perf_counter() - start))
+    
+    print("\n--- Fuzzy organization matching ---")
+    start = time.perf_counter()
+    dedupe_fuzzy_organizations(data, merge=merge_fuzzy)
+    timings.append(('Fuzzy organization matching', time.perf_counter() - start))
+    
+    report_duplicate_names(data)
+    
+    # Write the final artifact once
+    output_path = Path(output_file)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    print(f"\nCleaned data saved to: {output_path}")
+    
+    if binary_file:
+        header = write_graph_store(data, binary_file)
+        print(f"Binary graph saved to: {binary_file} ({header['num_nodes']} nodes, {header['num_slots'] // 2} edges)")
+    
+    print("\nStage timings:")
+    for stage_name, seconds in timings:
+        print(f"  • {stage_name}: {seconds:.3f}s")
+    
+    return data
+
+def main():
+    """Run the full extraction and cleaning pipeline."""
+    js_file = '../src/atlanta_biotech_data.js'
+    output_file = 'data/biotech_network_data.json'
+    binary_file = 'data/biotech_network_data.bgraph' if '--binary' in sys.argv[1:] else None
+    merge_fuzzy = '--merge-fuzzy' in sys.argv[1:]
+    
+    print("Atlanta Biotech Network Data Pipeline")
+    print("=" * 40)
+    
+    try:
+        data = run_pipeline(js_file, output_file, binary_file, merge_fuzzy)
+        print(f"\nPipeline complete!")
+        print(f"Nodes: {len(data['nodes'])}")
+        print(f"Links: {len(data['links'])}")
+        print(f"Node colors: {len(data['nodeColors'])}")
+    except Exception as e:
+        print(f"Error during pipeline: {e}")
+        import traceback
+        traceback.print_exc()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+Consensus Community Detection
+
+A single Louvain run depends on its random node order, so community ids
+and labels changed from run to run. `consensus_communities` runs Louvain
+with `runs` seeds (on a process pool when `workers` > 1) and combines
+them by consensus clustering (Lancichinetti & Fortunato, 2012):
+
+1. For every edge, the co-assignment is the fraction of runs that put
+   both ends in the same community. It is only needed over edges, so it
+   is one vectorized comparison per run, never an n x n matrix.
+2. If the runs disagree on some edge, Louvain is rerun on the consensus
+   graph (edges weighted by co-assignment, those below `threshold`
+   dropped) until every run agrees or `max_rounds` is reached.
+3. The consensus partition is the final run that agrees best with the
+   others, with communities numbered in order of their first node.
+
+Stability of a node is the share of (run, incident edge) pairs, over the
+runs on the original graph, whose co-assignment matches the consensus;
+1.0 means every run placed the node exactly as the consensus does.
+
+After a data update, `update_communities` warm-starts from the previous
+run's partition (the artifact written by `save_partition`). Only nodes on
+a changed edge, new nodes and their neighbors are re-optimized, by Louvain
+local moves against the otherwise fixed partition; every other node keeps
+its previous community id. If the warm partition's modularity falls more
+than `tolerance` below that of the last full consensus (stored in the
+artifact and carried unchanged through warm runs, so quality cannot drift
+down one tolerance at a time), the full consensus runs instead and its
+communities take over the previous ids they overlap most.
+
+Usage: python communities.py [data/biotech_network_data.json] [runs]
+"""
+
+import json
+import multiprocessing
+import numpy as np
+import networkx as nx
+import community as community_louvain
+
+import graph_core
+
+def _louvain_graph(n, sources, targets, weights):
+    """Integer-labelled nx.Graph with weighted edges for python-louvain."""
+    G = nx.Graph()
+    G.add_nodes_from(range(n))
+    G.add_weighted_edges_from(zip(sources.tolist(), targets.tolist(), weights.tolist()))
+    return G
+
+def _louvain_task(task):
+    """Run Louvain once per seed (on a pool worker); returns one label array per seed."""
+    n, sources, targets, weights, seeds = task
+    G = _louvain_graph(n, sources, targets, weights)
+    runs = []
+    for seed in seeds:
+        partition = community_louvain.best_partition(G, random_state=seed)
+        runs.append(np.array([partition[i] for i in range(n)], dtype=np.int64))
+    return runs
+
+def _run_louvain(n, sources, targets, weights, seeds, pool=None, workers=1):
+    """Label matrix (one row per seed) from Louvain runs, on `pool` when given."""
+    if pool is None:
+        runs = _louvain_task((n, sources, targets, weights, seeds))
+    else:
+        parts = pool.map(_louvain_task, [(n, sources, targets, weights, seeds[offset::workers]) for offset in range(workers)])
+        # Undo the interleaving so row r always comes from seeds[r]
+        runs = [None] * len(seeds)
+        for offset, part in enumerate(parts):
+            runs[offset::workers] = part
+    return np.array(runs, dtype=np.int64).reshape(len(seeds), n)
+
+def co_assignment(labels, sources, targets):
+    """(runs x edges) booleans: does each run put both ends of each edge together."""
+    return labels[:, sources] == labels[:, targets]
+
+def modularity(graph, labels):
+    """Newman modularity of integer community labels, from per-community sums."""
+    if graph.m == 0:
+        return 0.0
+    _, codes = np.unique(labels, return_inverse=True)
+    sources, targets = graph.edge_arrays()
+    inside = codes[sources] == codes[targets]
+    internal = np.bincount(codes[sources[inside]], minlength=codes.max() + 1)
+    degree_sums = np.bincount(codes, graph.degree.astype(np.float64))
+    two_m = 2.0 * graph.m
+    return float(internal.sum() / graph.m - ((degree_sums / two_m) ** 2).sum())
+
+def community_quality(graph, labels):
+    """
+    Size, edges inside and leaving, conductance (leaving / all edges
+    touching), cut ratio, expansion and internal density of every
+    community, from one pass over the edge list. Returns a dict of arrays
+    aligned with its 'community' entry (the distinct labels, sorted).
+    """
+    communities, codes = np.unique(np.asarray(labels), return_inverse=True)
+    k = len(communities)
+    size = np.bincount(codes, minlength=k)
+    sources, targets = graph.edge_arrays()
+    source_codes, target_codes = codes[sources], codes[targets]
+    inside = source_codes == target_codes
+    edges_inside = np.bincount(source_codes[inside], minlength=k)
+    edges_outside = np.bincount(source_codes[~inside], minlength=k) + np.bincount(target_codes[~inside], minlength=k)
+
+    touching = edges_inside + edges_outside
+    outside_nodes = graph.n - size
+    pairs = size * (size - 1) / 2
+    return {
+        'community': communities,
+        'size': size,
+        'edges_inside': edges_inside,
+        'edges_outside': edges_outside,
+        'conductance': np.divide(edges_outside, touching, out=np.full(k, np.nan), where=touching > 0),
+        'cut_ratio': np.divide(edges_outside, size * outside_nodes, out=np.full(k, np.nan), where=outside_nodes > 0),
+        'expansion': edges_outside / size,
+        'internal_density': np.divide(edges_inside, pairs, out=np.full(k, np.nan), where=pairs > 0),
+    }
+
+def quality_summary(quality):
+    """
+    Averages over communities of two or more nodes (undefined values
+    skipped), plus every community's values under 'per_community'.
+    """
+    multi = quality['size'] >= 2
+
+    def average(name):
+        values = quality[name][multi].astype(np.float64)
+        values = values[~np.isnan(values)]
+        return float(values.mean()) if len(values) else 0.0
+
+    names = ('size', 'edges_inside', 'edges_outside', 'conductance', 'cut_ratio', 'expansion', 'internal_density')
+    per_community = {}
+    for row, community in enumerate(quality['community'].tolist()):
+        values = {name: quality[name][row].item() for name in names}
+        per_community[community] = {name: (None if isinstance(value, float) and np.isnan(value) else value)
+                                    for name, value in values.items()}
+    return {
+        'average_conductance': average('conductance'),
+        'average_cut_ratio': average('cut_ratio'),
+        'average_expansion': average('expansion'),
+        'average_internal_density': average('internal_density'),
+        'average_edges_inside': average('edges_inside'),
+        'average_edges_outside': average('edges_outside'),
+        'per_community': per_community,
+    }
+
+def canonical_labels(labels):
+    """Renumber communities 0, 1, ... in order of their first node."""
+    _, first, codes = np.unique(labels, return_index=True, return_inverse=True)
+    rank = np.empty(len(first), dtype=np.int64)
+    rank[np.argsort(first, kind='stable')] = np.arange(len(first))
+    return rank[codes]
+
+class ConsensusCommunities:
+    """
+    Consensus of seeded Louvain runs.
+
+    `labels` is the consensus community of every node (interned id order),
+    `stability` each node's agreement with it, `runs` the label matrix of
+    the runs on the original graph.
+    """
+
+    def __init__(self, graph, runs=16, seed=0, workers=1, threshold=0.5, max_rounds=10):
+        n = graph.n
+        self.n = n
+        self.seed = seed
+        self.threshold = threshold
+        self.rounds = 0
+        self.converged = True
+        sources, targets = graph.edge_arrays()
+        sources = sources.astype(np.int64)
+        targets = targets.astype(np.int64)
+        if n == 0 or runs == 0:
+            self.runs = np.zeros((0, n), dtype=np.int64)
+            self.labels = np.arange(n, dtype=np.int64)
+            self.stability = np.ones(n)
+            self.modularity = 0.0
+            self.full_modularity = 0.0
+            return
+
+        # One reproducible Louvain seed per run and round
+        streams = np.random.SeedSequence(seed).spawn(max_rounds + 1)
+        workers = min(graph_core.resolve_workers(workers), runs)
+        pool = multiprocessing.Pool(workers) if workers > 1 else None
+        try:
+            seeds = streams[0].generate_state(runs).tolist()
+            labels = _run_louvain(n, sources, targets, np.ones(len(sources)), seeds, pool, workers)
+            self.runs = labels
+            edge_sources, edge_targets = sources, targets
+            agreement = co_assignment(labels, edge_sources, edge_targets).mean(axis=0)
+            while ((agreement > 0) & (agreement < 1)).any():
+                if self.rounds == max_rounds:
+                    self.converged = False
+                    break
+                self.rounds += 1
+                # Louvain on the consensus graph; it only needs the edges above the threshold
+                kept = agreement >= threshold
+                edge_sources, edge_targets = edge_sources[kept], edge_targets[kept]
+                seeds = streams[self.rounds].generate_state(runs).tolist()
+                labels = _run_louvain(n, edge_sources, edge_targets, agreement[kept], seeds, pool, workers)
+                agreement = co_assignment(labels, edge_sources, edge_targets).mean(axis=0)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        # The run agreeing best with the rest (any run once they all agree)
+        together = co_assignment(labels, edge_sources, edge_targets)
+        medoid = int(np.argmax((together == (agreement >= 0.5)).sum(axis=1))) if len(edge_sources) else 0
+        self.labels = canonical_labels(labels[medoid])
+
+        # Node stability over the runs on the original graph, from incident edges only
+        consensus_together = self.labels[sources] == self.labels[targets]
+        matches = (co_assignment(self.runs, sources, targets) == consensus_together).sum(axis=0).astype(np.float64)
+        agree = np.bincount(sources, matches, minlength=n) + np.bincount(targets, matches, minlength=n)
+        total = graph.degree.astype(np.float64) * len(self.runs)
+        self.stability = np.divide(agree, total, out=np.ones(n), where=total > 0)
+        self.modularity = modularity(graph, self.labels)
+        self.full_modularity = self.modularity  # Baseline later warm starts are held to
+
+    def partition(self, node_ids):
+        """Consensus communities as {node_id: community id}."""
+        return dict(zip(node_ids, self.labels.tolist()))
+
+    def summary(self):
+        """Consensus report for network_stats."""
+        return {
+            'mode': 'full',
+            'runs': len(self.runs),
+            'modularity': self.modularity,
+            'seed': self.seed,
+            'threshold': self.threshold,
+            'rounds': self.rounds,
+            'converged': self.converged,
+            'mean_stability': float(self.stability.mean()) if self.n else 1.0,
+            'unstable_nodes': int((self.stability < 1).sum()),
+        }
+
+def consensus_communities(graph, runs=16, seed=0, workers=1, threshold=0.5, max_rounds=10):
+    """Consensus partition and per-node stability from `runs` seeded Louvain runs."""
+    return ConsensusCommunities(graph, runs, seed, workers, threshold, max_rounds)
+
+def save_partition(path, graph, labels, stability, runs, seed, full_modularity=None):
+    """
+    Write the community artifact the next run warm-starts from.
+    `full_modularity` is the modularity of the last full consensus (None
+    when `labels` is that consensus).
+    """
+    sources, targets = graph.edge_arrays()
+    ids = graph.node_ids
+    current = modularity(graph, labels)
+    payload = {
+        'runs': runs,
+        'seed': seed,
+        'modularity': current,
+        'full_modularity': current if full_modularity is None else full_modularity,
+        'nodes': list(ids),
+        'labels': np.asarray(labels).tolist(),
+        'stability': [None if np.isnan(value) else value for value in np.asarray(stability, dtype=np.float64).tolist()],
+        'edges': [[ids[u], ids[v]] for u, v in zip(sources.tolist(), targets.tolist())],
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f)
+
+def load_partition(path):
+    """The artifact written by save_partition, or None if there is none."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def changed_nodes(graph, previous):
+    """Boolean mask of nodes that are new or on an added or removed edge since `previous`."""
+    index = graph.index
+    touched = np.zeros(graph.n, dtype=bool)
+    known = set(previous['nodes'])
+    for i, node_id in enumerate(graph.node_ids):
+        if node_id not in known:
+            touched[i] = True
+
+    sources, targets = graph.edge_arrays()
+    ids = graph.node_ids
+    current = {frozenset((ids[u], ids[v])) for u, v in zip(sources.tolist(), targets.tolist())}
+    before = {frozenset(edge) for edge in previous['edges']}
+    for edge in current ^ before:
+        for node_id in edge:
+            if node_id in index:
+                touched[index[node_id]] = True
+    return touched
+
+def _local_moves(graph, labels, movable, next_label, max_passes=100):
+    """
+    Louvain local moving restricted to the `movable` nodes: each moves to
+    the neighboring community (or a new singleton) with the best modularity
+    gain while every other node stays put. Updates `labels` in place.
+    """
+    neighbors = graph.neighbor_lists()
+    degree = graph.degree.tolist()
+    two_m = 2.0 * graph.m
+    totals = {}
+    for label, d in zip(labels.tolist(), degree):
+        totals[label] = totals.get(label, 0) + d
+    members = {}
+    for label in labels.tolist():
+        members[label] = members.get(label, 0) + 1
+
+    for _ in range(max_passes):
+        moved = False
+        for i in movable:
+            current = int(labels[i])
+            links = {}
+            for j in neighbors[i]:
+                label = int(labels[j])
+                links[label] = links.get(label, 0) + 1
+            totals[current] -= degree[i]
+            members[current] -= 1
+
+            # Gain of joining community c is links(c) - totals(c) * d_i / 2m (up to a constant)
+            best = current
+            best_gain = links.get(current, 0) - totals[current] * degree[i] / two_m
+            if members[current] > 0 and best_gain < 0:
+                best, best_gain = next_label, 0.0
+            for label, count in links.items():
+                gain = count - totals.get(label, 0) * degree[i] / two_m
+                if gain > best_gain + 1e-12:
+                    best, best_gain = label, gain
+            if best == next_label:
+                next_label += 1
+            totals[best] = totals.get(best, 0) + degree[i]
+            members[best] = members.get(best, 0) + 1
+            if best != current:
+                labels[i] = best
+                moved = True
+        if not moved:
+            break
+    return labels
+
+def align_labels(labels, node_ids, previous):
+    """Renumber communities to the previous ids they overlap most (greedy by overlap; the rest get new ids)."""
+    old = dict(zip(previous['nodes'], previous['labels']))
+    pairs = {}
+    for node_id, label in zip(node_ids, labels.tolist()):
+        if node_id in old:
+            key = (label, old[node_id])
+            pairs[key] = pairs.get(key, 0) + 1
+    mapping, taken = {}, set()
+    for (label, old_label), _ in sorted(pairs.items(), key=lambda item: (-item[1], item[0])):
+        if label not in mapping and old_label not in taken:
+            mapping[label] = old_label
+            taken.add(old_label)
+    next_label = max(list(old.values()) + [-1]) + 1
+    for label in np.unique(labels).tolist():
+        if label not in mapping:
+            mapping[label] = next_label
+            next_label += 1
+    return np.array([mapping[label] for label in labels.tolist()], dtype=np.int64)
+
+class WarmStartCommunities:
+    """
+    Previous partition carried over to an updated graph, with only the
+    nodes around the change re-optimized. Same accessors as
+    ConsensusCommunities; re-optimized nodes have NaN stability (they were
+    not resampled). `full_modularity` is passed through from the last full
+    consensus unchanged.
+    """
+
+    def __init__(self, graph, previous):
+        n = graph.n
+        self.n = n
+        self.seed = previous.get('seed')
+        self.previous_modularity = previous.get('modularity', 0.0)
+        self.full_modularity = previous.get('full_modularity', self.previous_modularity)
+        old = dict(zip(previous['nodes'], previous['labels']))
+        old_stability = dict(zip(previous['nodes'], previous.get('stability') or [None] * len(previous['nodes'])))
+
+        touched = changed_nodes(graph, previous)
+        frontier = touched.copy()
+        for i in np.flatnonzero(touched).tolist():
+            frontier[graph.neighbors(i)] = True
+        self.touched = int(touched.sum())
+        self.reoptimized = int(frontier.sum())
+
+        # New nodes start as singletons after the previous ids
+        next_label = max(list(old.values()) + [-1]) + 1
+        labels = np.empty(n, dtype=np.int64)
+        for i, node_id in enumerate(graph.node_ids):
+            if node_id in old:
+                labels[i] = old[node_id]
+            else:
+                labels[i] = next_label
+                next_label += 1
+        if graph.m > 0:
+            _local_moves(graph, labels, np.flatnonzero(frontier).tolist(), next_label)
+        self.labels = labels
+        self.modularity = modularity(graph, labels)
+
+        stability = [old_stability.get(node_id) for node_id in graph.node_ids]
+        self.stability = np.array([np.nan if value is None else value for value in stability], dtype=np.float64)
+        self.stability[frontier] = np.nan
+        self.runs = np.zeros((0, n), dtype=np.int64)
+
+    def partition(self, node_ids):
+        """Communities as {node_id: community id}."""
+        return dict(zip(node_ids, self.labels.tolist()))
+
+    def summary(self):
+        """Warm-start report for network_stats."""
+        sampled = self.stability[~np.isnan(self.stability)]
+        return {
+            'mode': 'warm',
+            'seed': self.seed,
+            'touched_nodes': self.touched,
+            'reoptimized_nodes': self.reoptimized,
+            'modularity': self.modularity,
+            'previous_modularity': self.previous_modularity,
+            'full_modularity': self.full_modularity,
+            'mean_stability': float(sampled.mean()) if len(sampled) else 1.0,
+            'unstable_nodes': int((sampled < 1).sum()),
+        }
+
+def update_communities(graph, previous=None, runs=16, seed=0, workers=1, tolerance=0.01):
+    """
+    Warm-started communities when `previous` (a save_partition artifact
+    from the same runs and seed) is given and modularity stays within
+    `tolerance` of the last full consensus; otherwise the full consensus,
+    aligned to previous ids.
+    """
+    if previous is not None and previous.get('runs') == runs and previous.get('seed') == seed:
+        warm = WarmStartCommunities(graph, previous)
+        if warm.modularity >= warm.full_modularity - tolerance:
+            return warm
+        print(f"Warm-started modularity {warm.modularity:.4f} fell below the last full run's {warm.full_modularity:.4f}; rerunning Louvain")
+    result = consensus_communities(graph, runs, seed, workers)
+    if previous is not None:
+        result.labels = align_labels(result.labels, graph.node_ids, previous)
+    return result
+
+def main():
+    """Print the consensus communities and their stability for a data file."""
+    import sys
+    import json
+    data_file = sys.argv[1] if len(sys.argv) > 1 else 'data/biotech_network_data.json'
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+
+    with open(data_file, 'r', encoding='utf-8') as f:
+        graph = graph_core.CSRGraph.from_data(json.load(f))
+    consensus = consensus_communities(graph, runs)
+    summary = consensus.summary()
+    print(f"{len(set(consensus.labels.tolist()))} consensus communities from {summary['runs']} Louvain runs "
+          f"({summary['rounds']} consensus rounds, converged: {summary['converged']})")
+    print(f"Mean node stability {summary['mean_stability']:.3f}; {summary['unstable_nodes']} nodes moved between runs")
+    partition = consensus.partition(graph.node_ids)
+    print(f"Modularity {community_louvain.modularity(partition, graph.to_networkx()):.4f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Community Profiles
+
+Describes every community at once from the in-memory graph: a community x
+org-type contingency matrix (from node types in the graph's side table)
+and a community x link-type matrix (each link counted for the community
+of each end, once if both ends share it), both built with one bincount
+over flattened (community, type) codes. Each community's hub (highest
+degree), dominant org type and display label come from the same arrays.
+
+`export` writes the profile table as CSV (for the report) and JSON (for
+the website).
+"""
+
+import json
+import numpy as np
+import pandas as pd
+
+# Dominant org type -> label prefix
+TYPE_LABELS = {
+    'university': 'Academic',
+    'startup': 'Startup',
+    'vc': 'Investment',
+    'government': 'Government',
+}
+
+def _display_name(node_id):
+    return node_id.replace('_', ' ').title()
+
+def _codes(values):
+    """(distinct names, integer code per value); missing values become 'unknown'."""
+    names, codes = np.unique(np.array(['unknown' if value is None else str(value) for value in values], dtype=object),
+                             return_inverse=True)
+    return names.tolist(), codes
+
+def _contingency(rows, columns, num_rows, num_columns):
+    """num_rows x num_columns counts of (row, column) code pairs."""
+    flat = np.bincount(rows * num_columns + columns, minlength=num_rows * num_columns)
+    return flat.reshape(num_rows, num_columns)
+
+class CommunityProfiles:
+    """
+    Per-community composition, hub and label for integer community labels
+    (one per node, in interned id order).
+    """
+
+    def __init__(self, graph, labels):
+        n = graph.n
+        self.communities, codes = np.unique(np.asarray(labels, dtype=np.int64), return_inverse=True)
+        k = len(self.communities)
+        self.size = np.bincount(codes, minlength=k)
+
+        # Community x org type
+        self.org_types, type_codes = _codes(graph.attributes.get('type') or [None] * n)
+        self.org_type_counts = _contingency(codes, type_codes, k, len(self.org_types))
+
+        # Dominant type: most members, ties to the type seen first in the community
+        first_seen = np.full(k * len(self.org_types), n, dtype=np.int64)
+        np.minimum.at(first_seen, codes * len(self.org_types) + type_codes, np.arange(n))
+        first_seen = first_seen.reshape(k, len(self.org_types))
+        top = self.org_type_counts.max(axis=1, initial=0)
+        tied = np.where(self.org_type_counts == top[:, None], first_seen, n)
+        self.dominant_type = tied.argmin(axis=1) if k else np.zeros(0, dtype=np.int64)
+        self.dominant_count = top
+
+        # Community x link type, from the upper CSR slots (one per link)
+        rows = graph.slot_rows()
+        upper = rows < graph.indices
+        if graph.edge_types is not None and graph.edge_type_names:
+            self.link_types, link_codes = _codes([graph.edge_type_names[code] for code in graph.edge_types[upper].tolist()])
+        else:
+            self.link_types, link_codes = _codes([None] * int(upper.sum()))
+        source_codes, target_codes = codes[rows[upper]], codes[graph.indices[upper]]
+        crossing = source_codes != target_codes
+        num_links = len(self.link_types)
+        self.link_type_counts = (_contingency(source_codes, link_codes, k, num_links)
+                                 + _contingency(target_codes[crossing], link_codes[crossing], k, num_links))
+
+        # Hub: highest degree, ties to the lowest node index
+        order = np.lexsort((np.arange(n), -graph.degree, codes))
+        starts = np.flatnonzero(np.r_[True, codes[order][1:] != codes[order][:-1]]) if n else np.zeros(0, dtype=np.int64)
+        self.hub = order[starts]
+
+        ids = graph.node_ids
+        names = graph.attributes.get('name') or [None] * n
+        self.hub_id = [ids[i] for i in self.hub.tolist()]
+        self.hub_name = [names[i] or _display_name(ids[i]) for i in self.hub.tolist()]
+        self.labels = [self._label(row) for row in range(k)]
+
+    def _label(self, row):
+        """Display label of one community from its size, dominant type and hub."""
+        size = int(self.size[row])
+        dominant = self.org_types[self.dominant_type[row]]
+        if size == 1:
+            return f"Single {dominant.title()}: {_display_name(self.hub_id[row])}"
+        if self.dominant_count[row] == size:
+            return f"{TYPE_LABELS.get(dominant, dominant.title())} Cluster ({size} nodes)"
+        if dominant in ('university', 'startup'):
+            return f"{TYPE_LABELS[dominant]} Hub: {self.hub_name[row]} ({size} nodes)"
+        return f"Mixed: {self.hub_name[row]} ({size} nodes)"
+
+    def community_labels(self):
+        """{community id: display label}."""
+        return dict(zip(self.communities.tolist(), self.labels))
+
+    def table(self):
+        """One row per community: label, size, hub, dominant type and the org/link type counts."""
+        frame = pd.DataFrame({
+            'community_id': self.communities,
+            'community_label': self.labels,
+            'size': self.size,
+            'hub_id': self.hub_id,
+            'hub_name': self.hub_name,
+            'dominant_type': [self.org_types[code] for code in self.dominant_type.tolist()],
+        })
+        org = pd.DataFrame(self.org_type_counts, columns=[f"org_{name}" for name in self.org_types])
+        links = pd.DataFrame(self.link_type_counts, columns=[f"link_{name}" for name in self.link_types])
+        return pd.concat([frame, org, links], axis=1).sort_values(['size', 'community_id'], ascending=[False, True])
+
+    def export(self, csv_file, json_file=None):
+        """Write the profile table as CSV and, when given, JSON records."""
+        table = self.table()
+        table.to_csv(csv_file, index=False)
+        if json_file:
+            records = []
+            for record in table.to_dict('records'):
+                records.append({
+                    'community_id': int(record['community_id']),
+                    'label': record['community_label'],
+                    'size': int(record['size']),
+                    'hub': {'id': record['hub_id'], 'name': record['hub_name']},
+                    'dominant_type': record['dominant_type'],
+                    'org_types': {name: int(record[f"org_{name}"]) for name in self.org_types if record[f"org_{name}"]},
+                    'link_types': {name: int(record[f"link_{name}"]) for name in self.link_types if record[f"link_{name}"]},
+                })
+            with open(json_file, 'w', encoding='utf-8') as f:
+                json.dump({'communities': records}, f, indent=2)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Core-Periphery Engine
+
+Scores every node at once from a normalized feature matrix (one column per
+feature, each on a 0-1 scale) and a weight vector, then classifies nodes
+with a single global percentile cut over all scores. Participation
+coefficients come from one sparse product of the adjacency with the
+community indicator matrix.
+
+`borgatti_everett` optionally fits the continuous core-periphery model:
+coreness values c that make c_i * c_j best approximate the adjacency
+(least squares over i != j), found by iterative sparse updates.
+"""
+
+import numpy as np
+from scipy import sparse
+
+# Feature -> weight in the core score (higher score = more core-like)
+CORE_WEIGHTS = {
+    'degree_centrality': 0.3,
+    'betweenness_centrality': 0.3,
+    'k_core': 0.2,
+    'inverse_clustering': 0.1,  # Low clustering is more core-like
+    'avg_neighbor_degree': 0.1,
+}
+
+# Nodes at or above this percentile of the core score are core (top 30%)
+CORE_PERCENTILE = 70
+
+def _scaled(values):
+    """Divide by the maximum (all zeros stay zero)."""
+    peak = values.max() if len(values) else 0
+    return values / peak if peak > 0 else np.zeros(len(values))
+
+def average_neighbor_degree(graph):
+    """Mean degree of each node's neighbors (0 for isolated nodes)."""
+    degree = graph.degree.astype(np.float64)
+    sums = graph.adjacency() @ degree
+    return np.divide(sums, degree, out=np.zeros(graph.n), where=degree > 0)
+
+def core_features(graph, metrics):
+    """n x len(CORE_WEIGHTS) matrix of 0-1 features, columns in CORE_WEIGHTS order."""
+    columns = {
+        'degree_centrality': metrics.get('degree_centrality'),
+        'betweenness_centrality': metrics.get('betweenness_centrality'),
+        'k_core': _scaled(metrics.get('core_number').astype(np.float64)),
+        'inverse_clustering': 1 - metrics.get('clustering'),
+        'avg_neighbor_degree': _scaled(average_neighbor_degree(graph)),
+    }
+    return np.column_stack([columns[name] for name in CORE_WEIGHTS]) if graph.n else np.zeros((0, len(CORE_WEIGHTS)))
+
+def core_scores(features):
+    """Weighted core score per node."""
+    return features @ np.array(list(CORE_WEIGHTS.values()))
+
+def classify(scores, percentile=CORE_PERCENTILE):
+    """(is_core mask, threshold) from one percentile cut over all scores."""
+    if len(scores) == 0:
+        return np.zeros(0, dtype=bool), 0.0
+    threshold = float(np.percentile(scores, percentile))
+    return scores >= threshold, threshold
+
+def participation_coefficients(graph, labels):
+    """
+    1 - sum over communities of (links into the community / degree)^2,
+    for integer community labels per node (0 for isolated nodes).
+    """
+    n = graph.n
+    if n == 0:
+        return np.zeros(0)
+    _, codes = np.unique(labels, return_inverse=True)
+    membership = sparse.csr_matrix((np.ones(n), (np.arange(n), codes)), shape=(n, codes.max() + 1))
+    counts = graph.adjacency() @ membership
+    degree = graph.degree.astype(np.float64)
+    share_sq = np.asarray(counts.multiply(counts).sum(axis=1)).ravel()
+    return np.divide(degree ** 2 - share_sq, degree ** 2, out=np.zeros(n), where=degree > 0)
+
+def borgatti_everett(graph, max_iter=500, tol=1e-8):
+    """
+    Continuous core-periphery fit (Borgatti & Everett, 1999).
+
+    Minimizes the sum over i != j of (a_ij - c_i c_j)^2 with the fixed-point
+    update c_i = (A c)_i / (|c|^2 - c_i^2), which is one sparse product per
+    iteration. Returns (coreness scaled to max 1, fit), where fit is the
+    Pearson correlation between A and c c^T over node pairs.
+    """
+    n = graph.n
+    if n < 2 or graph.m == 0:
+        return np.zeros(n), 0.0
+    A = graph.adjacency()
+    c = graph.degree / np.sqrt(2.0 * graph.m)  # Degree-based start
+    for _ in range(max_iter):
+        norm_sq = float(c @ c)
+        denominator = norm_sq - c * c
+        updated = np.divide(A @ c, denominator, out=np.zeros(n), where=denominator > 0)
+        # The update settles into a 2-cycle that only flips the scale of c,
+        # so test convergence on the direction (the output is rescaled anyway)
+        updated_norm = np.sqrt(float(updated @ updated))
+        if updated_norm == 0:
+            c = updated
+            break
+        converged = np.abs(updated / updated_norm - c / np.sqrt(norm_sq)).max() < tol
+        c = updated
+        if converged:
+            break
+
+    # Correlation over ordered pairs i != j, from sums that need only A's nonzeros
+    pairs = n * (n - 1)
+    sum_c, sum_c2, sum_c4 = c.sum(), float(c @ c), float((c ** 4).sum())
+    sum_pattern = sum_c ** 2 - sum_c2
+    sum_pattern_sq = sum_c2 ** 2 - sum_c4
+    sum_a = 2.0 * graph.m
+    sum_ac = float(c @ (A @ c))
+    covariance = sum_ac / pairs - (sum_a / pairs) * (sum_pattern / pairs)
+    var_a = sum_a / pairs - (sum_a / pairs) ** 2
+    var_pattern = sum_pattern_sq / pairs - (sum_pattern / pairs) ** 2
+    fit = covariance / np.sqrt(var_a * var_pattern) if var_a > 0 and var_pattern > 0 else 0.0
+    return _scaled(c), float(fit)
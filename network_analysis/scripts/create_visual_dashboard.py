@@ -12,6 +12,11 @@ import numpy as np
 import community as community_louvain
 from pathlib import Path
 import warnings
+from graph_cache import GraphCache
+from graph_core import CSRGraph
+from rich_club import rich_club
+from communities import update_communities, load_partition, community_quality, quality_summary
+from core_periphery import core_features, core_scores, classify, participation_coefficients, average_neighbor_degree
 warnings.filterwarnings('ignore')
 
 # Set style for publication-quality plots
@@ -21,10 +26,14 @@ sns.set_palette("husl")
 class VisualDashboardCreator:
     """Creates a visual dashboard for the Atlanta biotech network analysis."""
     
-    def __init__(self, data_file='data/biotech_network_data.json'):
+    def __init__(self, data_file='data/biotech_network_data.json', cache_dir='data/.cache', use_cache=True,
+                 communities_file='data/biotech_network_communities.json'):
         """Initialize the dashboard creator with network data."""
         self.data_file = data_file
+        self.communities_file = communities_file  # Partition the analyzer exported (read only here)
+        self.cache = GraphCache(cache_dir) if use_cache else None  # Shares memoized metrics with the analyzer
         self.G = nx.Graph()
+        self.graph = None  # CSR graph core the memoized metrics are keyed on
         self.node_metrics = {}
         self.network_stats = {}
         self.communities = {}
@@ -73,6 +82,9 @@ class VisualDashboardCreator:
             if source and target and source != target:
                 self.G.add_edge(source, target, **{k: v for k, v in link.items() if k not in ['source', 'target']})
         
+        self.graph = CSRGraph.from_data(data)
+        self.graph.metrics.persist(self.cache)
+        
         print(f"Network built: {self.G.number_of_nodes()} nodes, {self.G.number_of_edges()} edges")
         return self.G
     
@@ -80,29 +92,32 @@ class VisualDashboardCreator:
         """Calculate all network metrics."""
         print("Calculating network metrics...")
         
-        # Node-level metrics
-        degree_centrality = nx.degree_centrality(self.G)
-        betweenness_centrality = nx.betweenness_centrality(self.G)
-        closeness_centrality = nx.closeness_centrality(self.G)
-        harmonic_centrality = nx.harmonic_centrality(self.G)
-        eigenvector_centrality = nx.eigenvector_centrality(self.G, max_iter=1000)
-        pagerank = nx.pagerank(self.G, alpha=0.85, max_iter=1000)
-        clustering_coefficient = nx.clustering(self.G)
+        # Node-level metrics, reused from the analyzer's run when already on disk
+        metrics = self.graph.metrics
+        degree_centrality = metrics.by_node('degree_centrality')
+        betweenness_centrality = metrics.by_node('betweenness_centrality')
+        closeness_centrality = metrics.by_node('closeness_centrality')
+        harmonic_centrality = metrics.by_node('harmonic_centrality')
+        eigenvector_centrality = metrics.by_node('eigenvector_centrality')
+        pagerank = metrics.by_node('pagerank')
+        clustering_coefficient = metrics.by_node('clustering')
         
         # Calculate structural holes metrics
         structural_holes = self._calculate_structural_holes()
         
-        # Calculate core-periphery analysis
-        core_periphery = self._calculate_core_periphery()
-        
-        # Community detection using Louvain algorithm
+        # Communities: the analyzer's exported partition, warm-started over any data change
+        # with its runs and seed, so ids match the analyzer's CSV and the saved artifact
         try:
-            communities = community_louvain.best_partition(self.G)
-            self.communities = communities
+            previous = load_partition(self.communities_file)
+            runs, seed = (previous.get('runs', 16), previous.get('seed', 0)) if previous else (16, 0)
+            self.communities = update_communities(self.graph, previous, runs, seed).partition(self.graph.node_ids)
         except Exception as e:
             print(f"Warning: Could not perform community detection: {e}")
             self.communities = {node: 0 for node in self.G.nodes()}
         
+        # Calculate core-periphery analysis (participation needs the communities)
+        core_periphery = self._calculate_core_periphery()
+        
         # Store node metrics
         self.node_metrics = {}
         for node in self.G.nodes():
@@ -121,31 +136,22 @@ class VisualDashboardCreator:
                 'community_id': self.communities.get(node, 0)
             }
         
-        # Calculate rich club coefficient for different degree thresholds
-        rich_club_coeffs = {}
-        max_degree = max(dict(self.G.degree()).values()) if self.G.number_of_nodes() > 0 else 0
-        for k in range(1, min(max_degree + 1, 20)):  # Calculate for degrees 1-19 or max degree
-            try:
-                coeff = nx.rich_club_coefficient(self.G, k)
-                # Handle both scalar and dict returns
-                if isinstance(coeff, dict):
-                    rich_club_coeffs[k] = coeff.get(k, 0.0)
-                else:
-                    rich_club_coeffs[k] = float(coeff) if coeff is not None else 0.0
-            except:
-                rich_club_coeffs[k] = 0.0
+        # Rich-club curve in one pass, normalized against seeded degree-preserving rewirings
+        max_degree = int(self.graph.degree.max()) if self.graph.n > 0 else 0
+        rich_club_curve = rich_club(self.graph)
+        rich_club_coeffs = {k: rich_club_curve.normalized_at(k) for k in range(1, min(max_degree + 1, 20))}
         
         # Calculate community quality metrics
         community_quality = self._calculate_community_quality()
         
         # Network-level metrics
         self.network_stats = {
-            'density': nx.density(self.G),
-            'diameter': nx.diameter(self.G) if nx.is_connected(self.G) else 'Not connected',
-            'average_path_length': nx.average_shortest_path_length(self.G) if nx.is_connected(self.G) else 'Not connected',
-            'assortativity': nx.degree_assortativity_coefficient(self.G),
-            'transitivity': nx.transitivity(self.G),
-            'average_clustering': nx.average_clustering(self.G),
+            'density': metrics.get('density'),
+            'diameter': metrics.get('diameter') if self.graph.is_connected() else 'Not connected',
+            'average_path_length': metrics.get('average_path_length') if self.graph.is_connected() else 'Not connected',
+            'assortativity': metrics.get('assortativity'),
+            'transitivity': metrics.get('transitivity'),
+            'average_clustering': metrics.get('average_clustering'),
             'rich_club_coefficients': rich_club_coeffs,
             'community_quality': community_quality,
             'num_communities': len(set(self.communities.values())),
@@ -235,89 +241,40 @@ class VisualDashboardCreator:
         return structural_holes
     
     def _calculate_core_periphery(self):
-        """Calculate core-periphery analysis for each node."""
-        core_periphery = {}
+        """Calculate core-periphery analysis for each node (same engine as the analyzer)."""
+        graph = self.graph
         
-        # Calculate degree centrality for all nodes
-        degree_centrality = nx.degree_centrality(self.G)
+        # Weighted score over normalized features, one global percentile cut
+        features = core_features(graph, graph.metrics)
+        scores = core_scores(features)
+        is_core, _ = classify(scores)
         
-        # Calculate k-core decomposition
-        k_core = nx.core_number(self.G)
-        max_k_core = max(k_core.values()) if k_core else 0
+        # Participation coefficient (how well connected to different communities)
+        if self.communities:
+            labels = np.array([self.communities.get(node, 0) for node in graph.node_ids])
+            participation = participation_coefficients(graph, labels)
+        else:
+            participation = np.zeros(graph.n)
         
-        # Calculate betweenness centrality for core identification
-        betweenness_centrality = nx.betweenness_centrality(self.G)
+        k_core = graph.metrics.get('core_number')
+        clustering_coeff = graph.metrics.get('clustering')
+        avg_neighbor_degree = average_neighbor_degree(graph)
         
-        # Calculate clustering coefficient
-        clustering_coeff = nx.clustering(self.G)
-        
-        # Calculate average neighbor degree
-        avg_neighbor_degree = {}
-        for node in self.G.nodes():
-            neighbors = list(self.G.neighbors(node))
-            if neighbors:
-                neighbor_degrees = [self.G.degree(neighbor) for neighbor in neighbors]
-                avg_neighbor_degree[node] = np.mean(neighbor_degrees)
-            else:
-                avg_neighbor_degree[node] = 0
-        
-        # Calculate core-periphery score for each node
-        for node in self.G.nodes():
-            # Normalize metrics to 0-1 scale
-            norm_degree = degree_centrality.get(node, 0)
-            norm_betweenness = betweenness_centrality.get(node, 0)
-            norm_k_core = k_core.get(node, 0) / max_k_core if max_k_core > 0 else 0
-            norm_clustering = clustering_coeff.get(node, 0)
-            norm_avg_neighbor_degree = avg_neighbor_degree.get(node, 0) / max(avg_neighbor_degree.values()) if avg_neighbor_degree else 0
-            
-            # Core-periphery score (higher = more core-like)
-            # Core nodes: high degree, high betweenness, high k-core, low clustering, high neighbor degree
-            core_score = (
-                0.3 * norm_degree +
-                0.3 * norm_betweenness +
-                0.2 * norm_k_core +
-                0.1 * (1 - norm_clustering) +  # Low clustering is more core-like
-                0.1 * norm_avg_neighbor_degree
-            )
-            
-            # Determine core vs periphery classification
-            # Use percentile-based classification
-            threshold = np.percentile([core_score for node in self.G.nodes()], 70)  # Top 30% are core
-            
-            is_core = core_score >= threshold
-            
-            # Calculate additional metrics
-            degree = self.G.degree(node)
-            k_core_value = k_core.get(node, 0)
-            
-            # Calculate local clustering (how clustered the node's neighborhood is)
-            local_clustering = clustering_coeff.get(node, 0)
-            
-            # Calculate participation coefficient (how well connected to different communities)
-            participation_coeff = 0.0
-            if self.communities:
-                community_connections = {}
-                for neighbor in self.G.neighbors(node):
-                    neighbor_community = self.communities.get(neighbor, 0)
-                    community_connections[neighbor_community] = community_connections.get(neighbor_community, 0) + 1
-                
-                if community_connections:
-                    total_connections = sum(community_connections.values())
-                    participation_coeff = 1 - sum((count/total_connections)**2 for count in community_connections.values())
-            
+        core_periphery = {}
+        for i, node in enumerate(graph.node_ids):
             core_periphery[node] = {
-                'core_score': core_score,
-                'is_core': is_core,
-                'k_core': k_core_value,
-                'participation_coefficient': participation_coeff,
-                'local_clustering': local_clustering,
-                'avg_neighbor_degree': avg_neighbor_degree.get(node, 0)
+                'core_score': float(scores[i]),
+                'is_core': bool(is_core[i]),
+                'k_core': int(k_core[i]),
+                'participation_coefficient': float(participation[i]),
+                'local_clustering': float(clustering_coeff[i]),
+                'avg_neighbor_degree': float(avg_neighbor_degree[i])
             }
         
         return core_periphery
     
     def _calculate_community_quality(self):
-        """Calculate community quality metrics."""
+        """Calculate community quality metrics (all communities in one pass over the edges)."""
         if not self.communities:
             return {
                 'average_conductance': 0.0,
@@ -325,73 +282,13 @@ class VisualDashboardCreator:
                 'average_expansion': 0.0,
                 'average_internal_density': 0.0,
                 'average_edges_inside': 0.0,
-                'average_edges_outside': 0.0
+                'average_edges_outside': 0.0,
+                'per_community': {}
             }
         
-        # Group nodes by community
-        community_nodes = {}
-        for node, community_id in self.communities.items():
-            if community_id not in community_nodes:
-                community_nodes[community_id] = []
-            community_nodes[community_id].append(node)
-        
-        # Calculate quality metrics for each community
-        conductances = []
-        cut_ratios = []
-        expansions = []
-        internal_densities = []
-        edges_inside = []
-        edges_outside = []
-        
-        for community_id, nodes in community_nodes.items():
-            if len(nodes) < 2:  # Skip single-node communities
-                continue
-                
-            # Create subgraph for this community
-            community_subgraph = self.G.subgraph(nodes)
-            
-            # Calculate edges inside community
-            edges_inside_count = community_subgraph.number_of_edges()
-            edges_inside.append(edges_inside_count)
-            
-            # Calculate edges outside community
-            edges_outside_count = 0
-            for node in nodes:
-                for neighbor in self.G.neighbors(node):
-                    if neighbor not in nodes:
-                        edges_outside_count += 1
-            edges_outside.append(edges_outside_count)
-            
-            # Calculate conductance (lower is better)
-            total_edges = edges_inside_count + edges_outside_count
-            if total_edges > 0:
-                conductance = edges_outside_count / total_edges
-                conductances.append(conductance)
-            
-            # Calculate cut ratio (lower is better)
-            if len(nodes) > 0:
-                cut_ratio = edges_outside_count / (len(nodes) * (self.G.number_of_nodes() - len(nodes)))
-                cut_ratios.append(cut_ratio)
-            
-            # Calculate expansion (lower is better)
-            if len(nodes) > 0:
-                expansion = edges_outside_count / len(nodes)
-                expansions.append(expansion)
-            
-            # Calculate internal density (higher is better)
-            if len(nodes) > 1:
-                max_possible_edges = len(nodes) * (len(nodes) - 1) / 2
-                internal_density = edges_inside_count / max_possible_edges if max_possible_edges > 0 else 0
-                internal_densities.append(internal_density)
-        
-        return {
-            'average_conductance': np.mean(conductances) if conductances else 0.0,
-            'average_cut_ratio': np.mean(cut_ratios) if cut_ratios else 0.0,
-            'average_expansion': np.mean(expansions) if expansions else 0.0,
-            'average_internal_density': np.mean(internal_densities) if internal_densities else 0.0,
-            'average_edges_inside': np.mean(edges_inside) if edges_inside else 0.0,
-            'average_edges_outside': np.mean(edges_outside) if edges_outside else 0.0
-        }
+        graph = self.graph
+        labels = np.array([self.communities.get(node, 0) for node in graph.node_ids])
+        return quality_summary(community_quality(graph, labels))
     
     def create_dashboard(self):
         """Create the visual dashboard with all plots."""
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+On-Disk Cache for Built Network Graphs
+
+Stores the graph built from a data file together with the derived lookups
+(node names, type counts) under a key derived from the SHA-256 of the source
+file contents. A changed data file produces a new key, so stale entries are
+never returned; old entries are evicted least-recently-used first once the
+cache directory grows past its size budget.
+"""
+
+import os
+import pickle
+import hashlib
+import tempfile
+from pathlib import Path
+
+# Bump when the payload layout changes so old entries stop matching
+CACHE_VERSION = 4
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+def _remove(path):
+    """Delete a file if it still exists."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def file_digest(path, chunk_size=1 << 20):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class GraphCache:
+    """Content-hash keyed cache of parsed and built network graphs."""
+    
+    def __init__(self, cache_dir='data/.cache', max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+    
+    def key_for(self, source_file):
+        """Build the cache key for a source data file."""
+        return f"graph-v{CACHE_VERSION}-{file_digest(source_file)}"
+    
+    def _path(self, key):
+        return self.cache_dir / f"{key}.pkl"
+    
+    def get(self, key):
+        """Return the cached payload for a key, or None on a miss."""
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'rb') as f:
+                payload = pickle.load(f)
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable cache entry {path.name}: {e}")
+            _remove(path)
+            return None
+        
+        # Refresh the timestamp so eviction is least-recently-used
+        os.utime(path)
+        return payload
+    
+    def put(self, key, payload):
+        """Store a payload atomically and evict old entries if over budget."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, self._path(key))
+        except Exception:
+            _remove(tmp_name)
+            raise
+        self.evict(keep=key)
+    
+    def evict(self, keep=None):
+        """Delete least-recently-used entries until the cache fits its budget."""
+        entries = []
+        for path in self.cache_dir.glob('*.pkl'):
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if keep is not None and path == self._path(keep):
+                continue
+            _remove(path)
+            total -= size
+    
+    def clear(self):
+        """Remove every cache entry."""
+        for path in self.cache_dir.glob('*.pkl'):
+            _remove(path)
@@ -0,0 +1,849 @@
+#!/usr/bin/env python3
+"""
+Integer-Indexed Graph Core
+
+The analysis runs its metrics on `CSRGraph`, an undirected graph stored as
+NumPy CSR arrays over interned integer node ids (0..n-1, in data-file
+order). Node attributes (names, types, descriptions, ...) live in a
+columnar side table instead of per-node dicts, so traversals only touch
+integer arrays. `to_networkx()` rebuilds the equivalent `nx.Graph` for
+algorithms that still need networkx and for reference checks against it.
+
+Usage: python graph_core.py [data/biotech_network_data.json]
+    Compares the core metrics with networkx on the given data file.
+"""
+
+import os
+import hashlib
+import multiprocessing
+import numpy as np
+import networkx as nx
+from scipy import sparse
+from scipy.sparse import csgraph
+
+def build_csr(num_nodes, sources, targets, codes=None):
+    """
+    Symmetric CSR arrays (indptr, indices, slot codes) from an edge list.
+
+    Every edge is stored in both directions, neighbors are sorted within
+    each row, and repeated pairs collapse to one edge keeping the last
+    occurrence's code (matching nx.Graph.add_edge attribute updates).
+    """
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    if codes is None:
+        codes = np.zeros(len(sources), dtype=np.uint16)
+    codes = np.asarray(codes)
+
+    src = np.concatenate([sources, targets])
+    dst = np.concatenate([targets, sources])
+    slot_codes = np.concatenate([codes, codes])
+    order = np.lexsort((-np.tile(np.arange(len(sources)), 2), dst, src))
+    src, dst, slot_codes = src[order], dst[order], slot_codes[order]
+    if len(src):
+        keep = np.ones(len(src), dtype=bool)
+        keep[1:] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+        src, dst, slot_codes = src[keep], dst[keep], slot_codes[keep]
+
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=num_nodes), out=indptr[1:])
+    return indptr, dst.astype(np.int32), slot_codes
+
+class CSRGraph:
+    """Undirected graph as CSR arrays over interned integer node ids."""
+
+    def __init__(self, node_ids, indptr, indices, edge_types=None, edge_type_names=None, attributes=None):
+        self.node_ids = list(node_ids)
+        self.index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        self.indptr = indptr
+        self.indices = indices
+        self.edge_types = edge_types  # Type code per CSR slot
+        self.edge_type_names = list(edge_type_names or [])
+        self.attributes = attributes or {}  # Attribute name -> value per node (None if missing)
+
+        self.n = len(self.node_ids)
+        self.m = len(indices) // 2
+        self.degree = np.diff(indptr)
+        self._adjacency = None
+        self._neighbor_lists = None
+        self._version = None
+        self._metrics = None
+        self._spectral = None
+        self._current_flow = None
+
+    @classmethod
+    def from_data(cls, data):
+        """
+        Build from a nodes/links dict with the same rules as the networkx
+        build: nodes need an id, later duplicates update attributes, links
+        skip empty endpoints and self-loops, and link-only endpoints become
+        attribute-less nodes.
+        """
+        index = {}
+        attributes = {}
+
+        def intern(node_id):
+            if node_id not in index:
+                index[node_id] = len(index)
+                for column in attributes.values():
+                    column.append(None)
+            return index[node_id]
+
+        for node in data.get('nodes', []):
+            node_id = node.get('id', '')
+            if not node_id:
+                continue
+            i = intern(node_id)
+            for key, value in node.items():
+                if key == 'id':
+                    continue
+                if key not in attributes:
+                    attributes[key] = [None] * len(index)
+                attributes[key][i] = value
+
+        sources, targets, link_types = [], [], []
+        for link in data.get('links', []):
+            source = link.get('source', '')
+            target = link.get('target', '')
+            if source and target and source != target:
+                sources.append(intern(source))
+                targets.append(intern(target))
+                link_types.append(link.get('type'))
+
+        type_names = {}
+        codes = [type_names.setdefault(link_type, len(type_names)) for link_type in link_types]
+        indptr, indices, edge_types = build_csr(len(index), sources, targets, np.array(codes, dtype=np.uint16))
+        return cls(list(index), indptr, indices, edge_types, list(type_names), attributes)
+
+    @classmethod
+    def from_store(cls, store):
+        """Wrap a memory-mapped GraphStore without copying its arrays."""
+        type_names = store.node_type_names()
+        attributes = {
+            'name': store.node_names(),
+            'type': [type_names[code] for code in store.node_types.tolist()]
+        }
+        return cls(store.node_ids(), store.indptr, store.indices, store.edge_types, store.edge_type_names(), attributes)
+
+    @classmethod
+    def from_networkx(cls, G):
+        """Build from an undirected networkx graph (node order is preserved)."""
+        node_ids = list(G.nodes())
+        index = {node_id: i for i, node_id in enumerate(node_ids)}
+        attributes = {}
+        for i, (_, node_attrs) in enumerate(G.nodes(data=True)):
+            for key, value in node_attrs.items():
+                attributes.setdefault(key, [None] * len(node_ids))[i] = value
+
+        edges = [(index[u], index[v], data.get('type')) for u, v, data in G.edges(data=True) if u != v]
+        type_names = {}
+        codes = np.array([type_names.setdefault(t, len(type_names)) for _, _, t in edges], dtype=np.uint16)
+        indptr, indices, edge_types = build_csr(len(node_ids), [u for u, _, _ in edges], [v for _, v, _ in edges], codes)
+        return cls(node_ids, indptr, indices, edge_types, list(type_names), attributes)
+
+    def __getstate__(self):
+        # Derived structures are rebuilt on demand
+        state = self.__dict__.copy()
+        state['_adjacency'] = None
+        state['_neighbor_lists'] = None
+        state['_metrics'] = None
+        state['_spectral'] = None
+        state['_current_flow'] = None
+        return state
+
+    def version(self):
+        """
+        Structural hash of the graph (node ids, CSR arrays). Equal graphs
+        built from the same data get the same version in any process.
+        """
+        if self._version is None:
+            digest = hashlib.sha256()
+            digest.update('\0'.join(map(str, self.node_ids)).encode('utf-8'))
+            digest.update(np.ascontiguousarray(self.indptr, dtype=np.int64).tobytes())
+            digest.update(np.ascontiguousarray(self.indices, dtype=np.int32).tobytes())
+            self._version = digest.hexdigest()
+        return self._version
+
+    @property
+    def metrics(self):
+        """Memoized metrics for this graph (see metric_cache.MetricCache)."""
+        if self._metrics is None:
+            from metric_cache import MetricCache
+            self._metrics = MetricCache(self)
+        return self._metrics
+
+    @property
+    def spectral(self):
+        """Shared adjacency/Laplacian eigensolver for this graph (see spectral.SpectralEngine)."""
+        if self._spectral is None:
+            from spectral import SpectralEngine
+            self._spectral = SpectralEngine(self)
+        return self._spectral
+
+    @property
+    def current_flow(self):
+        """Shared grounded-Laplacian solver for this graph (see current_flow.CurrentFlow)."""
+        if self._current_flow is None:
+            from current_flow import CurrentFlow
+            self._current_flow = CurrentFlow(self)
+        return self._current_flow
+
+    def number_of_nodes(self):
+        return self.n
+
+    def number_of_edges(self):
+        return self.m
+
+    def neighbors(self, i):
+        """Integer neighbor ids of node i (a view into `indices`)."""
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def neighbor_lists(self):
+        """Adjacency as Python lists, for traversals written as plain loops."""
+        if self._neighbor_lists is None:
+            flat = self.indices.tolist()
+            bounds = self.indptr.tolist()
+            self._neighbor_lists = [flat[bounds[i]:bounds[i + 1]] for i in range(self.n)]
+        return self._neighbor_lists
+
+    def adjacency(self):
+        """Symmetric scipy CSR adjacency matrix with unit weights."""
+        if self._adjacency is None:
+            data = np.ones(len(self.indices), dtype=np.float64)
+            self._adjacency = sparse.csr_matrix((data, self.indices, self.indptr), shape=(self.n, self.n))
+        return self._adjacency
+
+    def edge_arrays(self):
+        """(source, target) integer arrays with each undirected edge once (source < target)."""
+        rows = np.repeat(np.arange(self.n, dtype=np.int32), self.degree)
+        upper = rows < self.indices
+        return rows[upper], self.indices[upper]
+
+    def slot_rows(self):
+        """Row (source node) of every CSR slot."""
+        return np.repeat(np.arange(self.n, dtype=np.int32), self.degree)
+
+    def attribute(self, name, i, default=None):
+        """Attribute value of node i from the side table."""
+        column = self.attributes.get(name)
+        value = column[i] if column is not None else None
+        return default if value is None else value
+
+    def subgraph(self, nodes):
+        """Induced subgraph on the given node indices, renumbered 0..k-1 in ascending order."""
+        nodes = np.unique(np.asarray(nodes, dtype=np.int64))
+        position = np.full(self.n, -1, dtype=np.int64)
+        position[nodes] = np.arange(len(nodes))
+        rows = position[self.slot_rows()]
+        columns = position[self.indices]
+        kept = (rows >= 0) & (columns >= 0)
+        indptr = np.zeros(len(nodes) + 1, dtype=np.asarray(self.indptr).dtype)
+        np.cumsum(np.bincount(rows[kept], minlength=len(nodes)), out=indptr[1:])
+        indices = columns[kept].astype(np.asarray(self.indices).dtype)
+        edge_types = self.edge_types[kept] if self.edge_types is not None else None
+        order = nodes.tolist()
+        attributes = {name: [values[i] for i in order] for name, values in self.attributes.items()}
+        return CSRGraph([self.node_ids[i] for i in order], indptr, indices, edge_types, self.edge_type_names, attributes)
+
+    def component_labels(self, keep=None):
+        """
+        (number of components, label per node). With a boolean `keep` mask
+        the removed nodes are labelled -1 and not counted.
+        """
+        if keep is None:
+            return csgraph.connected_components(self.adjacency(), directed=False)
+        kept = np.flatnonzero(keep)
+        sub = self.adjacency()[kept][:, kept]
+        count, sub_labels = csgraph.connected_components(sub, directed=False)
+        labels = np.full(self.n, -1, dtype=np.int32)
+        labels[kept] = sub_labels
+        return count, labels
+
+    def largest_component_size(self, keep=None):
+        """Size of the largest connected component (after removing ~keep)."""
+        count, labels = self.component_labels(keep)
+        if count == 0:
+            return 0
+        return int(np.bincount(labels[labels >= 0]).max())
+
+    def is_connected(self):
+        return self.n > 0 and self.component_labels()[0] == 1
+
+    def to_networkx(self):
+        """Equivalent nx.Graph with attributes from the side table and edge types."""
+        G = nx.Graph()
+        columns = list(self.attributes.items())
+        for i, node_id in enumerate(self.node_ids):
+            G.add_node(node_id, **{key: values[i] for key, values in columns if values[i] is not None})
+
+        rows = self.slot_rows()
+        upper = np.flatnonzero(rows < self.indices)
+        if self.edge_types is not None and self.edge_type_names:
+            G.add_edges_from(
+                (self.node_ids[u], self.node_ids[v], {'type': self.edge_type_names[code]} if self.edge_type_names[code] is not None else {})
+                for u, v, code in zip(rows[upper].tolist(), self.indices[upper].tolist(), self.edge_types[upper].tolist())
+            )
+        else:
+            G.add_edges_from((self.node_ids[u], self.node_ids[v]) for u, v in zip(rows[upper].tolist(), self.indices[upper].tolist()))
+        return G
+
+def density(graph):
+    """Edge density of an undirected graph."""
+    if graph.n <= 1:
+        return 0.0
+    return 2 * graph.m / (graph.n * (graph.n - 1))
+
+def degree_centrality(graph):
+    """Degree divided by n - 1."""
+    if graph.n <= 1:
+        return np.ones(graph.n)
+    return graph.degree / (graph.n - 1)
+
+def _sweep_sources(neighbors, n, sources, targets=False, dependencies=True):
+    """
+    BFS + Brandes accumulation from each source in `sources`.
+
+    Returns the summed dependency list (length n), the per-source distance
+    sums, reciprocal sums, reachable counts and eccentricities (aligned with
+    `sources`) and the hop-distance histogram over those sources. With
+    `targets`, also returns per-target sums over the sources (distance,
+    distance squared, reciprocal distance and its square, times reached,
+    squared dependency) for sampling estimators. Without `dependencies`
+    the Brandes accumulation is skipped and the dependency sums stay 0.
+    """
+    distance_sums = []
+    reciprocal_sums = []
+    reachable = []
+    eccentricity = []
+    histogram = [0]  # Ordered pairs at each hop distance
+
+    dist = [-1] * n
+    sigma = [0] * n
+    delta = [0.0] * n
+    dependency = [0.0] * n
+    if targets:
+        target_sums = [np.zeros(n) for _ in range(6)]
+        distance_total, distance_sq, reciprocal_total, reciprocal_sq, reached, dependency_sq = target_sums
+        level_sizes = []
+
+    for s in sources:
+        # Level-synchronous BFS counting shortest paths
+        dist[s] = 0
+        sigma[s] = 1
+        order = [s]
+        frontier = [s]
+        level = 0
+        distance_sum = 0
+        reciprocal_sum = 0.0
+        while True:
+            next_frontier = []
+            for v in frontier:
+                sigma_v = sigma[v]
+                for w in neighbors[v]:
+                    if dist[w] < 0:
+                        dist[w] = level + 1
+                        next_frontier.append(w)
+                        sigma[w] = sigma_v
+                    elif dist[w] == level + 1:
+                        sigma[w] += sigma_v
+            if not next_frontier:
+                break
+            level += 1
+            count = len(next_frontier)
+            if level == len(histogram):
+                histogram.append(0)
+            histogram[level] += count
+            distance_sum += level * count
+            reciprocal_sum += count / level
+            order.extend(next_frontier)
+            frontier = next_frontier
+            if targets:
+                level_sizes.append(count)
+
+        distance_sums.append(distance_sum)
+        reciprocal_sums.append(reciprocal_sum)
+        reachable.append(len(order) - 1)
+        eccentricity.append(level)
+
+        # Accumulate dependencies in reverse BFS order, then reset the touched entries
+        if dependencies:
+            for w in reversed(order):
+                coefficient = (1 + delta[w]) / sigma[w]
+                dist_w = dist[w] - 1
+                for v in neighbors[w]:
+                    if dist[v] == dist_w:
+                        delta[v] += sigma[v] * coefficient
+                if w != s:
+                    dependency[w] += delta[w]
+        if targets and len(order) > 1:
+            # Each node appears once per BFS, so fancy adds are safe; `order` is sorted by level
+            visited = np.array(order[1:], dtype=np.int64)
+            hops = np.repeat(np.arange(1, level + 1, dtype=np.float64), level_sizes)
+            distance_total[visited] += hops
+            distance_sq[visited] += hops * hops
+            reciprocal_total[visited] += 1 / hops
+            reciprocal_sq[visited] += 1 / (hops * hops)
+            reached[visited] += 1
+            if dependencies:
+                dependency_sq[visited] += np.array(delta)[visited] ** 2
+        if targets:
+            level_sizes = []
+        for w in order:
+            dist[w] = -1
+            sigma[w] = 0
+            delta[w] = 0.0
+
+    if targets:
+        return dependency, distance_sums, reciprocal_sums, reachable, eccentricity, histogram, target_sums
+    return dependency, distance_sums, reciprocal_sums, reachable, eccentricity, histogram
+
+# Adjacency of the pool's graph, set once per worker
+_worker_neighbors = None
+_worker_arrays = None
+_worker_graph = None
+
+def _init_graph_worker(indptr, indices):
+    """Pool initializer: build the worker's adjacency lists once."""
+    global _worker_neighbors, _worker_arrays, _worker_graph
+    flat = np.asarray(indices).tolist()
+    bounds = np.asarray(indptr).tolist()
+    _worker_neighbors = [flat[bounds[i]:bounds[i + 1]] for i in range(len(bounds) - 1)]
+    _worker_arrays = (indptr, indices)
+    _worker_graph = None
+
+def _sweep_task(task):
+    """Sweep one chunk of sources on a pool worker."""
+    sources, targets, dependencies = task
+    return _sweep_sources(_worker_neighbors, len(_worker_neighbors), sources, targets, dependencies)
+
+def resolve_workers(workers):
+    """Number of processes for a `workers=` option (None means all cores)."""
+    if workers is None:
+        return os.cpu_count() or 1
+    return max(1, int(workers))
+
+def graph_pool(graph, workers):
+    """
+    Process pool whose workers all hold `graph`. The CSR arrays are handed
+    to each worker once (inherited on fork) instead of with every task;
+    task functions read the adjacency through `worker_neighbors()`.
+    """
+    return multiprocessing.Pool(workers, initializer=_init_graph_worker, initargs=(graph.indptr, graph.indices))
+
+def worker_neighbors():
+    """Adjacency lists of the graph held by this pool worker."""
+    return _worker_neighbors
+
+def worker_graph():
+    """
+    The pool's graph as a CSRGraph on this worker (nodes are labelled by
+    index), built on first use and shared by later tasks.
+    """
+    global _worker_graph
+    if _worker_graph is None:
+        indptr, indices = _worker_arrays
+        _worker_graph = CSRGraph(range(len(indptr) - 1), indptr, indices)
+        _worker_graph._neighbor_lists = _worker_neighbors
+    return _worker_graph
+
+def sweep_chunks(graph, chunks, pool=None, targets=False, dependencies=True):
+    """Sweep each chunk of source nodes, on `pool` when given; returns one result per chunk."""
+    if pool is None:
+        neighbors = graph.neighbor_lists()
+        return [_sweep_sources(neighbors, graph.n, chunk, targets, dependencies) for chunk in chunks]
+    return pool.map(_sweep_task, [(chunk, targets, dependencies) for chunk in chunks])
+
+def interleaved_chunks(sources, workers):
+    """Split sources into several interleaved chunks per worker (balances hubs and leaves)."""
+    stride = workers * 4
+    return [sources[offset::stride] for offset in range(stride)]
+
+class DistanceSweep:
+    """
+    All distance-based metrics from one BFS per source.
+
+    Each BFS accumulates Brandes dependencies, distance sums, reciprocal
+    distance sums, eccentricity and a path-length histogram together, so
+    the graph is traversed n times in total (O(nm)) however many of the
+    metrics are read. Per-node arrays are indexed by interned node id.
+
+    With `workers` > 1 the sources are split across a process pool (see
+    `graph_pool`) and the partial dependency vectors are summed.
+    """
+
+    def __init__(self, graph, workers=1):
+        n = graph.n
+        self.n = n
+        self.distance_sums = np.zeros(n, dtype=np.int64)
+        self.reciprocal_sums = np.zeros(n)
+        self.reachable = np.zeros(n, dtype=np.int64)  # Other nodes reachable from each node
+        self.eccentricity = np.zeros(n, dtype=np.int64)  # Within the node's component
+        self.dependency = np.zeros(n)  # Raw Brandes sums over ordered pairs
+        histogram = np.zeros(1, dtype=np.int64)  # Ordered pairs at each hop distance
+
+        workers = min(resolve_workers(workers), n)
+        if workers > 1:
+            chunks = interleaved_chunks(range(n), workers)
+            with graph_pool(graph, workers) as pool:
+                parts = sweep_chunks(graph, chunks, pool)
+        else:
+            chunks = [range(n)]
+            parts = sweep_chunks(graph, chunks)
+
+        for chunk, (dependency, distance_sums, reciprocal_sums, reachable, eccentricity, part_histogram) in zip(chunks, parts):
+            self.dependency += dependency
+            self.distance_sums[chunk] = distance_sums
+            self.reciprocal_sums[chunk] = reciprocal_sums
+            self.reachable[chunk] = reachable
+            self.eccentricity[chunk] = eccentricity
+            if len(part_histogram) > len(histogram):
+                histogram = np.pad(histogram, (0, len(part_histogram) - len(histogram)))
+            histogram[:len(part_histogram)] += part_histogram
+        self.path_length_histogram = histogram
+
+    def betweenness(self, normalized=True):
+        """Shortest-path betweenness with the same scaling as networkx."""
+        if normalized:
+            scale = 1 / ((self.n - 1) * (self.n - 2)) if self.n > 2 else 1.0
+        else:
+            scale = 0.5
+        return self.dependency * scale
+
+    def closeness(self):
+        """Closeness with the Wasserman-Faust correction for disconnected graphs (networkx default)."""
+        closeness = np.zeros(self.n)
+        if self.n > 1:
+            reached = self.distance_sums > 0
+            r = self.reachable[reached]
+            closeness[reached] = (r / self.distance_sums[reached]) * (r / (self.n - 1))
+        return closeness
+
+    def harmonic(self):
+        """Sum of reciprocal distances to every other reachable node."""
+        return self.reciprocal_sums.copy()
+
+    def diameter(self):
+        """Longest shortest path (meaningful when the graph is connected)."""
+        return int(self.eccentricity.max()) if self.n > 0 else 0
+
+    def average_path_length(self):
+        """Mean shortest-path length over ordered node pairs (meaningful when the graph is connected)."""
+        if self.n <= 1:
+            return 0.0
+        return float(self.distance_sums.sum()) / (self.n * (self.n - 1))
+
+    def global_efficiency(self):
+        """Mean reciprocal distance over ordered node pairs."""
+        if self.n <= 1:
+            return 0.0
+        return float(self.reciprocal_sums.sum()) / (self.n * (self.n - 1))
+
+    def path_length_counts(self):
+        """{hop distance: number of unordered node pairs at that distance}."""
+        return {d: int(count) // 2 for d, count in enumerate(self.path_length_histogram.tolist()) if d > 0}
+
+    def summary(self):
+        """Report for network_stats (every source swept, so no error)."""
+        return {
+            'mode': 'exact',
+            'samples': self.n,
+            'exact': True,
+            'error_bounds': {'betweenness_centrality': 0.0, 'closeness_centrality': 0.0, 'harmonic_centrality': 0.0},
+        }
+
+def distance_sweep(graph, workers=1):
+    """Run the shared BFS engine over every source node."""
+    return DistanceSweep(graph, workers)
+
+def closeness_centrality(graph):
+    """Closeness with the Wasserman-Faust correction (see DistanceSweep)."""
+    return distance_sweep(graph).closeness()
+
+def harmonic_centrality(graph):
+    """Sum of reciprocal distances to every other reachable node."""
+    return distance_sweep(graph).harmonic()
+
+def betweenness_centrality(graph, normalized=True, workers=1):
+    """Brandes shortest-path betweenness (same scaling as networkx), optionally on a process pool."""
+    return distance_sweep(graph, workers).betweenness(normalized)
+
+def diameter(graph):
+    """Longest shortest path (the graph must be connected)."""
+    return distance_sweep(graph).diameter()
+
+def average_shortest_path_length(graph):
+    """Mean shortest-path length over ordered node pairs (the graph must be connected)."""
+    return distance_sweep(graph).average_path_length()
+
+def global_efficiency(graph):
+    """Mean reciprocal distance over ordered node pairs."""
+    return distance_sweep(graph).global_efficiency()
+
+def eigenvector_centrality(graph, max_iter=1000, tol=1e-6):
+    """Power iteration on A + I, with the same start vector and stopping rule as networkx."""
+    if graph.n == 0:
+        return np.zeros(0)
+    A = graph.adjacency()
+    x = np.full(graph.n, 1.0 / graph.n)
+    for _ in range(max_iter):
+        x_last = x
+        x = x_last + A @ x_last
+        norm = np.linalg.norm(x)
+        x = x / norm if norm > 0 else x
+        if np.abs(x - x_last).sum() < graph.n * tol:
+            return x
+    raise nx.PowerIterationFailedConvergence(max_iter)
+
+def pagerank(graph, alpha=0.85, max_iter=1000, tol=1e-6):
+    """PageRank by sparse power iteration, with dangling mass spread uniformly."""
+    n = graph.n
+    if n == 0:
+        return np.zeros(0)
+    A = graph.adjacency()
+    out_degree = graph.degree.astype(np.float64)
+    inverse = np.divide(1.0, out_degree, out=np.zeros(n), where=out_degree > 0)
+    transition = sparse.diags(inverse) @ A
+    dangling = out_degree == 0
+    p = np.full(n, 1.0 / n)
+    x = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        x_last = x
+        x = alpha * (x_last @ transition + x_last[dangling].sum() * p) + (1 - alpha) * p
+        if np.abs(x - x_last).sum() < n * tol:
+            return x
+    raise nx.PowerIterationFailedConvergence(max_iter)
+
+def triangle_counts(graph, block=1 << 22):
+    """
+    Triangles through every node and every edge, found once each.
+
+    Each edge is oriented from the endpoint of lower degree to the higher
+    one (ties by node id), so every triangle a -> b -> c is seen as exactly
+    one wedge plus the closing edge a -> c. Out-degrees in this order are
+    at most sqrt(2m), which bounds the wedges at O(m sqrt(m)) even around
+    hubs, where the full product A·A would pay degree^2. Wedges are
+    expanded `block` at a time and closed by binary search on the sorted
+    oriented edge keys.
+
+    Returns (node_triangles, edge_triangles), the latter aligned with
+    `graph.edge_arrays()`.
+    """
+    n = graph.n
+    sources, targets = graph.edge_arrays()
+    node_triangles = np.zeros(n)
+    edge_triangles = np.zeros(len(sources))
+    if len(sources) == 0:
+        return node_triangles, edge_triangles
+    rank = np.empty(n, dtype=np.int64)
+    rank[np.lexsort((np.arange(n), graph.degree))] = np.arange(n)
+    forward = rank[sources] < rank[targets]
+    low = np.where(forward, sources, targets).astype(np.int64)
+    high = np.where(forward, targets, sources).astype(np.int64)
+    order = np.lexsort((high, low))
+    low, high = low[order], high[order]
+    keys = low * n + high
+    out_start = np.r_[0, np.cumsum(np.bincount(low, minlength=n))]
+    # Wedges opened by each oriented edge a -> b: one per out-neighbor of b
+    wedges = out_start[high + 1] - out_start[high]
+    wedge_start = np.cumsum(wedges) - wedges
+    first = 0
+    while first < len(keys):
+        last = max(int(np.searchsorted(wedge_start, wedge_start[first] + block, side='right')), first + 1)
+        opening = np.repeat(np.arange(first, last), wedges[first:last])
+        position = np.arange(len(opening)) - np.repeat(wedge_start[first:last] - wedge_start[first], wedges[first:last])
+        second = out_start[high[opening]] + position
+        wanted = low[opening] * n + high[second]
+        closing = np.minimum(np.searchsorted(keys, wanted), len(keys) - 1)
+        found = keys[closing] == wanted
+        opening, second, closing = opening[found], second[found], closing[found]
+        for positions in (opening, second, closing):
+            edge_triangles += np.bincount(order[positions], minlength=len(keys))
+        for corner in (low[opening], high[opening], high[second]):
+            node_triangles += np.bincount(corner, minlength=n)
+        first = last
+    return node_triangles, edge_triangles
+
+def triangles(graph):
+    """Number of triangles through each node (see triangle_counts)."""
+    return triangle_counts(graph)[0]
+
+def clustering(graph, node_triangles=None):
+    """Local clustering coefficient of every node."""
+    if node_triangles is None:
+        node_triangles = triangles(graph)
+    pairs = graph.degree * (graph.degree - 1)
+    return np.divide(2 * node_triangles, pairs, out=np.zeros(graph.n), where=pairs > 0)
+
+def average_clustering(graph, node_triangles=None):
+    """Mean local clustering coefficient, counting nodes of degree < 2 as 0 (like networkx)."""
+    return float(clustering(graph, node_triangles).mean()) if graph.n > 0 else 0.0
+
+def edge_embeddedness(graph, edge_triangles=None):
+    """
+    Embeddedness of every edge (aligned with `graph.edge_arrays()`): the
+    number of common neighbors of its endpoints, i.e. the triangles it
+    closes, and the neighborhood overlap t / (d_u + d_v - 2 - t) (0 when
+    the endpoints have no other neighbors). Edges with t = 0 are local
+    bridges.
+    """
+    if edge_triangles is None:
+        edge_triangles = triangle_counts(graph)[1]
+    sources, targets = graph.edge_arrays()
+    union = graph.degree[sources] + graph.degree[targets] - 2 - edge_triangles
+    overlap = np.divide(edge_triangles, union, out=np.zeros(len(sources)), where=union > 0)
+    return edge_triangles, overlap
+
+def transitivity(graph, node_triangles=None):
+    """Fraction of connected triples that close into triangles."""
+    if node_triangles is None:
+        node_triangles = triangles(graph)
+    triads = float((graph.degree * (graph.degree - 1)).sum())
+    closed = 2 * float(node_triangles.sum())
+    return closed / triads if closed > 0 else 0.0
+
+def structural_holes(graph, node_triangles=None):
+    """
+    Burt's effective size, efficiency, constraint and hierarchy for every
+    node, as arrays. With P = D^-1 A (tie strength 1/degree), the
+    contribution of neighbor j to i's constraint is p_ij + (P·P)_ij, so
+    the constraint is the row sum of ((P + (P·P)∘A))^2. Effective size is
+    d - 2t/d with t the triangles through the node. Nodes with fewer than
+    two neighbors get effective size 0, efficiency 0, constraint 1 and
+    hierarchy 0.
+    """
+    n = graph.n
+    if node_triangles is None:
+        node_triangles = triangles(graph)
+    degree = graph.degree.astype(np.float64)
+    ego = degree >= 2
+
+    A = graph.adjacency()
+    inverse = np.divide(1.0, degree, out=np.zeros(n), where=degree > 0)
+    P = sparse.diags(inverse) @ A
+    tie = P + (P @ P).multiply(A)
+    constraint = np.asarray(tie.multiply(tie).sum(axis=1)).ravel()
+
+    effective_size = np.zeros(n)
+    effective_size[ego] = degree[ego] - 2 * node_triangles[ego] / degree[ego]
+    efficiency = np.zeros(n)
+    efficiency[ego] = effective_size[ego] / degree[ego]
+    # Hierarchy = 1 - (sum of squared components) / constraint^2, and the
+    # squared components sum to the constraint itself
+    hierarchy = np.zeros(n)
+    positive = ego & (constraint > 0)
+    hierarchy[positive] = 1 - constraint[positive] / constraint[positive] ** 2
+    constraint[~ego] = 1.0
+    return effective_size, efficiency, constraint, hierarchy
+
+def core_numbers(graph):
+    """k-core number of every node (Batagelj-Zaversnik bucket algorithm)."""
+    n = graph.n
+    degree = graph.degree.tolist()
+    neighbors = graph.neighbor_lists()
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    # Nodes sorted by degree with the start position of each degree bin
+    order = sorted(range(n), key=degree.__getitem__)
+    position = [0] * n
+    for i, v in enumerate(order):
+        position[v] = i
+    bin_start = [0] * (max(degree) + 2)
+    for d in degree:
+        bin_start[d + 1] += 1
+    for d in range(1, len(bin_start)):
+        bin_start[d] += bin_start[d - 1]
+
+    core = degree[:]
+    for i in range(n):
+        v = order[i]
+        for u in neighbors[v]:
+            if core[u] > core[v]:
+                # Move u to the front of its bin, then shrink its degree
+                du = core[u]
+                pu = position[u]
+                pw = bin_start[du]
+                w = order[pw]
+                if u != w:
+                    order[pu], order[pw] = w, u
+                    position[u], position[w] = pw, pu
+                bin_start[du] += 1
+                core[u] -= 1
+    return np.array(core, dtype=np.int64)
+
+def degree_assortativity(graph):
+    """Pearson correlation of degrees across the two ends of every edge."""
+    rows = graph.slot_rows()
+    x = graph.degree[rows].astype(np.float64)
+    y = graph.degree[graph.indices].astype(np.float64)
+    if len(x) == 0 or x.std() == 0:
+        return float('nan')
+    return float(np.corrcoef(x, y)[0, 1])
+
+def verify_against_networkx(graph, G=None, atol=1e-6):
+    """
+    Compare the core metrics with networkx on the equivalent nx.Graph.
+    Returns {metric: max absolute difference}; differences above `atol`
+    are printed.
+    """
+    if G is None:
+        G = graph.to_networkx()
+    nodes = graph.node_ids
+    node_triangles, edge_triangles = triangle_counts(graph)
+    sweep = distance_sweep(graph)
+
+    def as_array(values):
+        return np.array([values[node] for node in nodes], dtype=np.float64)
+
+    checks = {
+        'degree_centrality': (degree_centrality(graph), as_array(nx.degree_centrality(G))),
+        'betweenness_centrality': (sweep.betweenness(), as_array(nx.betweenness_centrality(G))),
+        'closeness_centrality': (sweep.closeness(), as_array(nx.closeness_centrality(G))),
+        'harmonic_centrality': (sweep.harmonic(), as_array(nx.harmonic_centrality(G))),
+        'eigenvector_centrality': (eigenvector_centrality(graph), as_array(nx.eigenvector_centrality(G, max_iter=1000))),
+        'pagerank': (pagerank(graph), as_array(nx.pagerank(G, alpha=0.85, max_iter=1000))),
+        'clustering': (clustering(graph, node_triangles), as_array(nx.clustering(G))),
+        'core_number': (core_numbers(graph), as_array(nx.core_number(G))),
+        'density': (density(graph), nx.density(G)),
+        'transitivity': (transitivity(graph, node_triangles), nx.transitivity(G)),
+        'average_clustering': (average_clustering(graph, node_triangles), nx.average_clustering(G)),
+        'assortativity': (degree_assortativity(graph), nx.degree_assortativity_coefficient(G)),
+        'global_efficiency': (sweep.global_efficiency(), nx.global_efficiency(G)),
+        'largest_component': (graph.largest_component_size(), max(len(c) for c in nx.connected_components(G))),
+    }
+    # networkx matches Burt's definitions for nodes with at least two neighbors
+    effective_size, _, constraint, _ = structural_holes(graph, node_triangles)
+    ego = graph.degree >= 2
+    checks['effective_size'] = (effective_size[ego], as_array(nx.effective_size(G))[ego])
+    checks['constraint'] = (constraint[ego], as_array(nx.constraint(G))[ego])
+    sources, targets = graph.edge_arrays()
+    common = np.array([len(list(nx.common_neighbors(G, nodes[u], nodes[v]))) for u, v in zip(sources.tolist(), targets.tolist())])
+    checks['edge_triangles'] = (edge_triangles, common)
+    if nx.is_connected(G):
+        checks['diameter'] = (sweep.diameter(), nx.diameter(G))
+        checks['average_path_length'] = (sweep.average_path_length(), nx.average_shortest_path_length(G))
+
+    differences = {}
+    for name, (ours, reference) in checks.items():
+        differences[name] = float(np.max(np.abs(np.asarray(ours, dtype=np.float64) - np.asarray(reference, dtype=np.float64))))
+        if differences[name] > atol:
+            print(f"  MISMATCH {name}: max difference {differences[name]:.3g}")
+    return differences
+
+def main():
+    """Check the graph core against networkx on a data file."""
+    import sys
+    import json
+    data_file = sys.argv[1] if len(sys.argv) > 1 else 'data/biotech_network_data.json'
+
+    with open(data_file, 'r', encoding='utf-8') as f:
+        graph = CSRGraph.from_data(json.load(f))
+    print(f"Graph core: {graph.n} nodes, {graph.m} edges")
+
+    differences = verify_against_networkx(graph)
+    for name, difference in differences.items():
+        print(f"  {name}: max |core - networkx| = {difference:.3g}")
+    print("All metrics match networkx" if max(differences.values()) <= 1e-6 else "Some metrics differ from networkx")
+
+if __name__ == "__main__":
+    main()
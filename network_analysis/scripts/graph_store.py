@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Compact Binary Graph Store
+
+A memory-mappable on-disk format for the network, used instead of indented
+JSON when the analysis only needs graph structure and types. The file holds:
+
+- interned integer node ids (0..n-1, in data-file order)
+- CSR offset (`indptr`, int64) and neighbor (`indices`, int32) arrays, with
+  every undirected edge stored in both directions
+- a uint16 edge-type code per CSR slot and a uint16 type code per node
+- one string table (UTF-8 blob + int64 offsets) with node ids, display names,
+  node type names and edge type names
+
+Layout: 8-byte magic, little-endian uint64 header length, a JSON header that
+describes each section (dtype, byte offset, count), then the 64-byte aligned
+sections. Opening a file only parses the header; arrays are zero-copy views
+into the mapping, so pages are read from disk when they are first touched.
+
+Usage: python graph_store.py input.json output.bgraph
+"""
+
+import json
+import mmap
+import struct
+import numpy as np
+
+from graph_core import build_csr
+
+MAGIC = b'BTGRAPH1'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+def _intern(values, table):
+    """Map each value to a stable integer code, extending the table."""
+    codes = []
+    for value in values:
+        code = table.get(value)
+        if code is None:
+            code = table[value] = len(table)
+        codes.append(code)
+    return codes
+
+def write_graph_store(data, output_file):
+    """Write network data (nodes/links dict) to the binary CSR format."""
+    node_index = {}
+    node_names = []
+    node_type_table = {}
+    node_type_codes = []
+    
+    for node in data.get('nodes', []):
+        node_id = node.get('id', '')
+        if not node_id or node_id in node_index:
+            continue
+        node_index[node_id] = len(node_index)
+        node_names.append(node.get('name', node_id))
+        node_type_codes.extend(_intern([node.get('type', 'Unknown')], node_type_table))
+    num_record_nodes = len(node_index)
+    
+    # Same edge rules as BiotechNetworkAnalyzer.build_network: skip self-loops
+    # and empty endpoints, add link-only endpoints as nodes
+    sources, targets, link_types = [], [], []
+    for link in data.get('links', []):
+        source = link.get('source', '')
+        target = link.get('target', '')
+        if not source or not target or source == target:
+            continue
+        for endpoint in (source, target):
+            if endpoint not in node_index:
+                node_index[endpoint] = len(node_index)
+                node_names.append(endpoint)
+                node_type_codes.extend(_intern(['Unknown'], node_type_table))
+        sources.append(node_index[source])
+        targets.append(node_index[target])
+        link_types.append(link.get('type', 'Unknown'))
+    
+    edge_type_table = {}
+    edge_codes = np.array(_intern(link_types, edge_type_table), dtype=np.uint16)
+    num_nodes = len(node_index)
+    
+    # Both directions, repeated pairs collapsed to the last link's type
+    indptr, dst, codes = build_csr(num_nodes, sources, targets, edge_codes)
+    
+    strings = (list(node_index) + node_names + list(node_type_table) + list(edge_type_table))
+    encoded = [s.encode('utf-8') for s in strings]
+    string_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=string_offsets[1:])
+    
+    sections = [
+        ('indptr', indptr),
+        ('indices', dst.astype(np.int32)),
+        ('edge_types', codes.astype(np.uint16)),
+        ('node_types', np.array(node_type_codes, dtype=np.uint16)),
+        ('string_offsets', string_offsets),
+        ('string_data', np.frombuffer(b''.join(encoded), dtype=np.uint8)),
+    ]
+    
+    header = {
+        'version': FORMAT_VERSION,
+        'num_nodes': num_nodes,
+        'num_record_nodes': num_record_nodes,
+        'num_slots': int(len(dst)),
+        'raw_nodes': len(data.get('nodes', [])),
+        'raw_links': len(data.get('links', [])),
+        'num_node_types': len(node_type_table),
+        'num_edge_types': len(edge_type_table),
+        'sections': {}
+    }
+    
+    # Section offsets depend on the header length, so lay out twice
+    header_bytes = b''
+    for _ in range(2):
+        offset = _align(len(MAGIC) + 8 + len(header_bytes))
+        for name, array in sections:
+            header['sections'][name] = [array.dtype.str, offset, int(array.size)]
+            offset = _align(offset + array.nbytes)
+        header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    
+    with open(output_file, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in sections:
+            f.seek(header['sections'][name][1])
+            f.write(array.tobytes())
+        # Extend to the last section's end so empty trailing sections stay in bounds
+        f.truncate(offset)
+    
+    return header
+
+def _align(offset):
+    """Round an offset up to the section alignment."""
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+class GraphStore:
+    """Read-only, memory-mapped view of a binary graph file."""
+    
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a binary graph file")
+        (header_length,) = struct.unpack_from('<Q', self._mmap, len(MAGIC))
+        start = len(MAGIC) + 8
+        self.header = json.loads(self._mmap[start:start + header_length].decode('utf-8'))
+        if self.header['version'] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported graph file version {self.header['version']}")
+        
+        for name, (dtype, offset, count) in self.header['sections'].items():
+            setattr(self, name, np.frombuffer(self._mmap, dtype=np.dtype(dtype), count=count, offset=offset))
+        
+        self.num_nodes = self.header['num_nodes']
+        self.num_edges = self.header['num_slots'] // 2
+        self._index = None
+    
+    def string(self, i):
+        """Decode one entry of the string table."""
+        start, end = self.string_offsets[i], self.string_offsets[i + 1]
+        return self.string_data[start:end].tobytes().decode('utf-8')
+    
+    def _strings(self, start, count):
+        """Decode a contiguous run of the string table."""
+        offsets = self.string_offsets[start:start + count + 1]
+        blob = self.string_data[offsets[0]:offsets[-1]].tobytes()
+        bounds = (offsets - offsets[0]).tolist()
+        return [blob[bounds[i]:bounds[i + 1]].decode('utf-8') for i in range(count)]
+    
+    def node_ids(self):
+        """All node ids, indexed by interned integer id."""
+        return self._strings(0, self.num_nodes)
+    
+    def node_names(self):
+        """All node display names, indexed by interned integer id."""
+        return self._strings(self.num_nodes, self.num_nodes)
+    
+    def node_type_names(self):
+        """Node type names, indexed by node type code."""
+        return self._strings(2 * self.num_nodes, self.header['num_node_types'])
+    
+    def edge_type_names(self):
+        """Edge type names, indexed by edge type code."""
+        return self._strings(2 * self.num_nodes + self.header['num_node_types'], self.header['num_edge_types'])
+    
+    def index_of(self, node_id):
+        """Interned integer id of a node id string (builds the index on first use)."""
+        if self._index is None:
+            self._index = {node_id: i for i, node_id in enumerate(self.node_ids())}
+        return self._index[node_id]
+    
+    def neighbors(self, i):
+        """Integer neighbor ids of node i."""
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+    
+    def edge_arrays(self):
+        """(source, target, type code) arrays with each undirected edge once."""
+        rows = np.repeat(np.arange(self.num_nodes, dtype=np.int32), np.diff(self.indptr))
+        upper = rows < self.indices
+        return rows[upper], self.indices[upper], self.edge_types[upper]
+    
+    def org_type_counts(self):
+        """Number of data-file nodes per organization type."""
+        names = self.node_type_names()
+        record_types = self.node_types[:self.header['num_record_nodes']]
+        counts = np.bincount(record_types, minlength=len(names))
+        return {names[code]: int(count) for code, count in enumerate(counts) if count}
+    
+    def connection_type_counts(self):
+        """Number of edges per connection type."""
+        names = self.edge_type_names()
+        _, _, codes = self.edge_arrays()
+        counts = np.bincount(codes, minlength=len(names))
+        return {names[code]: int(count) for code, count in enumerate(counts) if count}
+    
+    def close(self):
+        """Release the memory mapping."""
+        for name in self.header['sections']:
+            setattr(self, name, None)
+        self._mmap.close()
+
+def main():
+    """Convert a JSON network data file to the binary graph format."""
+    import sys
+    input_file = sys.argv[1] if len(sys.argv) > 1 else 'data/biotech_network_data.json'
+    output_file = sys.argv[2] if len(sys.argv) > 2 else input_file.rsplit('.', 1)[0] + '.bgraph'
+    
+    with open(input_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    header = write_graph_store(data, output_file)
+    print(f"Wrote {output_file}: {header['num_nodes']} nodes, {header['num_slots'] // 2} edges")
+
+if __name__ == "__main__":
+    main()
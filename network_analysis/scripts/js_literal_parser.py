@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Streaming JavaScript Object-Literal Parser
+
+This module reads the website data file (`src/atlanta_biotech_data.js`) once,
+tokenizes it incrementally and parses the `export const ... = {...}` literals
+with a small recursive-descent parser. Every token pattern is linear, so large
+ecosystem files cannot trigger catastrophic regex backtracking, and nested
+fields such as `keyPersonnel` are preserved instead of being dropped.
+
+Usage: python js_literal_parser.py [path/to/atlanta_biotech_data.js]
+"""
+
+import re
+import json
+
+# Read the source in blocks so the whole file never has to be scanned by a
+# single whole-file regex
+CHUNK_SIZE = 1 << 20
+
+# Leading whitespace/comments are consumed together with the token that
+# follows them. None of the sub-patterns contain nested quantifiers, so
+# matching is linear in the token length.
+TRIVIA = r'(?:\s|//[^\n]*(?:\n|$)|/\*.*?\*/)*'
+
+TOKEN_PATTERN = re.compile(TRIVIA + r'''(?:
+    (?P<string>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*'|`(?:[^`\\]|\\.)*`)
+  | (?P<number>-?(?:0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?))
+  | (?P<name>[A-Za-z_$][\w$]*)
+  | (?P<punct>\.\.\.|=>|[{}\[\]:,;=()])
+)''', re.VERBOSE | re.DOTALL)
+
+TRIVIA_PATTERN = re.compile(TRIVIA, re.DOTALL)
+
+SIMPLE_ESCAPES = {
+    'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0',
+}
+
+LITERAL_NAMES = {'true': True, 'false': False, 'null': None, 'undefined': None}
+
+ESCAPE_PATTERN = re.compile(r'\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|\r\n|[\s\S])')
+
+class JSParseError(ValueError):
+    """Raised when the JavaScript source is not a supported object literal."""
+
+def _decode_escape(match):
+    """Decode a single JavaScript escape sequence."""
+    escape = match.group(1)
+    if escape[0] == 'u' and len(escape) > 1:
+        return chr(int(escape.strip('u{}'), 16))
+    if escape[0] == 'x' and len(escape) == 3:
+        return chr(int(escape[1:], 16))
+    if escape in ('\n', '\r\n', '\r'):
+        return ''  # Line continuation
+    return SIMPLE_ESCAPES.get(escape, escape)
+
+def decode_string(token):
+    """Convert a quoted JavaScript string token to its Python value."""
+    body = token[1:-1]
+    if '\\' not in body:
+        return body
+    return ESCAPE_PATTERN.sub(_decode_escape, body)
+
+def tokenize(stream, chunk_size=CHUNK_SIZE):
+    """Yield (kind, text) tokens from a text stream, reading it incrementally."""
+    buffer = ''
+    pos = 0
+    eof = False
+    
+    while True:
+        end = len(buffer)
+        scanner = TOKEN_PATTERN.scanner(buffer, pos)
+        for match in iter(scanner.match, None):
+            # A token touching the end of the buffer may continue in the
+            # next block, so only emit it once more input has been read
+            if match.end() == end and not eof:
+                break
+            pos = match.end()
+            kind = match.lastgroup
+            yield kind, match.group(kind)
+        
+        # Either a token reached the buffer end or nothing matched at `pos`
+        # (e.g. a string or comment that is not terminated yet)
+        if not eof:
+            chunk = stream.read(chunk_size)
+            if chunk:
+                buffer = buffer[pos:] + chunk
+                pos = 0
+            else:
+                eof = True
+            continue
+        
+        trailing = TRIVIA_PATTERN.match(buffer, pos).end()
+        if trailing == end:
+            return
+        line = buffer.count('\n', 0, trailing) + 1
+        raise JSParseError(f"Unexpected character {buffer[trailing]!r} near buffer line {line}")
+
+class LiteralParser:
+    """Recursive-descent parser over the token stream."""
+    
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.current = next(self.tokens, None)
+    
+    def advance(self):
+        """Consume and return the current token."""
+        token = self.current
+        self.current = next(self.tokens, None)
+        return token
+    
+    def at(self, text):
+        """Check whether the current token is the given punctuation/name."""
+        return self.current is not None and self.current[1] == text
+    
+    def expect(self, text):
+        """Consume a specific token or raise a parse error."""
+        if not self.at(text):
+            found = self.current[1] if self.current else 'end of file'
+            raise JSParseError(f"Expected {text!r} but found {found!r}")
+        return self.advance()
+    
+    def parse_key(self):
+        """Parse an object key (identifier, string or number)."""
+        kind, text = self.advance()
+        if kind == 'string':
+            return decode_string(text)
+        if kind in ('name', 'number'):
+            return text
+        raise JSParseError(f"Invalid object key {text!r}")
+    
+    def parse_value(self):
+        """Parse any supported JavaScript value."""
+        if self.current is None:
+            raise JSParseError("Unexpected end of file")
+        if self.at('{'):
+            return self.parse_object()
+        if self.at('['):
+            return list(self.iter_array())
+        
+        kind, text = self.advance()
+        if kind == 'string':
+            return decode_string(text)
+        if kind == 'number':
+            if text.lstrip('-')[:2] in ('0x', '0X'):
+                return int(text, 16)
+            if any(c in text for c in '.eE'):
+                return float(text)
+            return int(text)
+        if kind == 'name':
+            # Bare identifiers other than literals are references to other
+            # declarations; keep the name so callers can resolve it
+            return LITERAL_NAMES.get(text, text)
+        raise JSParseError(f"Unexpected token {text!r}")
+    
+    def iter_object_keys(self):
+        """Yield object keys one at a time; the caller must consume each value."""
+        self.expect('{')
+        while not self.at('}'):
+            key = self.parse_key()
+            self.expect(':')
+            yield key
+            if self.at(','):
+                self.advance()
+            elif not self.at('}'):
+                raise JSParseError(f"Expected ',' or '}}' after key {key!r}")
+        self.expect('}')
+    
+    def parse_object(self):
+        """Parse an object literal into a dict."""
+        return {key: self.parse_value() for key in self.iter_object_keys()}
+    
+    def iter_array(self):
+        """Yield array elements one at a time."""
+        self.expect('[')
+        while not self.at(']'):
+            yield self.parse_value()
+            if self.at(','):
+                self.advance()
+            elif not self.at(']'):
+                raise JSParseError("Expected ',' or ']' in array")
+        self.expect(']')
+    
+    def skip_statement(self):
+        """Skip tokens up to the end of the current top-level statement."""
+        depth = 0
+        while self.current is not None:
+            text = self.advance()[1]
+            if text in ('{', '[', '('):
+                depth += 1
+            elif text in ('}', ']', ')'):
+                depth -= 1
+            elif text == ';' and depth <= 0:
+                return
+
+def iter_ecosystem_records(js_file_path, root_name='atlantaBiotechEcosystem'):
+    """
+    Stream the ecosystem data from the JavaScript file in a single pass.
+    
+    Yields ('node', dict) and ('link', dict) for each element of the root
+    object's `nodes` and `links` arrays as soon as it is parsed, and
+    ('nodeColors', dict) for the node color mapping (either a `nodeColors`
+    key on the root object or a top-level `export const nodeColors`).
+    """
+    with open(js_file_path, 'r', encoding='utf-8') as f:
+        parser = LiteralParser(tokenize(f))
+        
+        while parser.current is not None:
+            if parser.at('export'):
+                parser.advance()
+                if parser.at('default'):
+                    parser.skip_statement()
+                    continue
+            
+            if not (parser.at('const') or parser.at('let') or parser.at('var')):
+                parser.skip_statement()
+                continue
+            
+            parser.advance()
+            name = parser.advance()[1]
+            parser.expect('=')
+            
+            if name == root_name and parser.at('{'):
+                for key in parser.iter_object_keys():
+                    if key in ('nodes', 'links') and parser.at('['):
+                        kind = key[:-1]
+                        for element in parser.iter_array():
+                            yield kind, element
+                    elif key == 'nodeColors':
+                        yield 'nodeColors', parser.parse_value()
+                    else:
+                        parser.parse_value()
+            elif name == 'nodeColors':
+                yield 'nodeColors', parser.parse_value()
+            else:
+                parser.parse_value()
+            
+            if parser.at(';'):
+                parser.advance()
+
+def extract_ecosystem(js_file_path, root_name='atlantaBiotechEcosystem'):
+    """Parse the JavaScript file once and return nodes, links and nodeColors."""
+    data = {'nodes': [], 'links': [], 'nodeColors': {}}
+    for kind, record in iter_ecosystem_records(js_file_path, root_name):
+        if kind == 'node':
+            data['nodes'].append(record)
+        elif kind == 'link':
+            data['links'].append(record)
+        elif not data['nodeColors']:
+            data['nodeColors'] = record
+    return data
+
+def main():
+    """Parse the website data file and print a short summary."""
+    import sys
+    js_file = sys.argv[1] if len(sys.argv) > 1 else '../src/atlanta_biotech_data.js'
+    
+    data = extract_ecosystem(js_file)
+    print(f"Nodes: {len(data['nodes'])}")
+    print(f"Links: {len(data['links'])}")
+    print(f"Node colors: {len(data['nodeColors'])}")
+    if data['nodes']:
+        print(f"Sample node: {json.dumps(data['nodes'][0], ensure_ascii=False)[:200]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Memoized Graph Metrics
+
+Every `CSRGraph` carries a `MetricCache` (`graph.metrics`). Consumers ask
+for a metric by name (`graph.metrics.get('betweenness_centrality')`) and
+the first request computes it; later requests, from the analyzer, the
+core-periphery pass or the dashboard, reuse the result. Metrics derived
+from the shared BFS sweep (betweenness, closeness, harmonic, ...) all
+come from one cached `distance_sweep`, which runs on `workers` processes,
+and the spectral metrics (eigenvector centrality, spectral radius and gap,
+algebraic connectivity, Fiedler vector) from the graph's shared
+`SpectralEngine`, which the walk-based centralities (Katz, subgraph,
+total communicability) also draw on. The current-flow metrics share one
+grounded Laplacian (`graph.current_flow`), and clustering, transitivity,
+effective size and edge embeddedness one `triangle_counts` pass (only
+that pass is persisted; `triangles` and `edge_triangles` are views of it).
+Setting `approximation` (epsilon, confidence, seed) swaps that sweep for a
+pivot-sampled `ApproximateSweep`; the sampled metrics are then cached under
+separate keys.
+
+Entries are keyed by the graph's structural version, so a cache can never
+serve values computed for a different graph. With a `GraphCache` attached
+(`persist(cache)`), results are also stored on disk and picked up by other
+processes that build the same graph.
+"""
+
+import numpy as np
+
+import graph_core
+from centrality_sampling import approximate_sweep
+from walk_centrality import walk_centrality
+
+# Bump when a metric's definition or parameters change
+METRIC_VERSION = 3
+
+# Metric name -> function(graph, metrics) computing it
+METRICS = {
+    'distance_sweep': lambda graph, metrics: metrics.sweep(),
+    'triangle_counts': lambda graph, metrics: graph_core.triangle_counts(graph),
+    'triangles': lambda graph, metrics: metrics.get('triangle_counts')[0],
+    'edge_triangles': lambda graph, metrics: metrics.get('triangle_counts')[1],
+    'degree_centrality': lambda graph, metrics: graph_core.degree_centrality(graph),
+    'betweenness_centrality': lambda graph, metrics: metrics.get('distance_sweep').betweenness(),
+    'closeness_centrality': lambda graph, metrics: metrics.get('distance_sweep').closeness(),
+    'harmonic_centrality': lambda graph, metrics: metrics.get('distance_sweep').harmonic(),
+    'eigenvector_centrality': lambda graph, metrics: graph.spectral.eigenvector_centrality(),
+    'pagerank': lambda graph, metrics: graph_core.pagerank(graph, alpha=0.85, max_iter=1000),
+    'katz_centrality': lambda graph, metrics: walk_centrality(graph).katz(),
+    'subgraph_centrality': lambda graph, metrics: walk_centrality(graph, metrics.workers).subgraph_centrality(),
+    'total_communicability': lambda graph, metrics: walk_centrality(graph).total_communicability(),
+    'current_flow_closeness': lambda graph, metrics: graph.current_flow.closeness(),
+    'current_flow_betweenness': lambda graph, metrics: graph.current_flow.betweenness(),
+    'information_centrality': lambda graph, metrics: graph.current_flow.information(),
+    'clustering': lambda graph, metrics: graph_core.clustering(graph, metrics.get('triangles')),
+    'core_number': lambda graph, metrics: graph_core.core_numbers(graph),
+    'structural_holes': lambda graph, metrics: graph_core.structural_holes(graph, metrics.get('triangles')),
+    'density': lambda graph, metrics: graph_core.density(graph),
+    'transitivity': lambda graph, metrics: graph_core.transitivity(graph, metrics.get('triangles')),
+    'average_clustering': lambda graph, metrics: graph_core.average_clustering(graph, metrics.get('triangles')),
+    'edge_embeddedness': lambda graph, metrics: graph_core.edge_embeddedness(graph, metrics.get('edge_triangles')),
+    'assortativity': lambda graph, metrics: graph_core.degree_assortativity(graph),
+    'diameter': lambda graph, metrics: metrics.get('distance_sweep').diameter(),
+    'average_path_length': lambda graph, metrics: metrics.get('distance_sweep').average_path_length(),
+    'global_efficiency': lambda graph, metrics: metrics.get('distance_sweep').global_efficiency(),
+    'path_length_distribution': lambda graph, metrics: metrics.get('distance_sweep').path_length_counts(),
+    'spectral_radius': lambda graph, metrics: graph.spectral.spectral_radius(),
+    'spectral_gap': lambda graph, metrics: graph.spectral.spectral_gap(),
+    'algebraic_connectivity': lambda graph, metrics: graph.spectral.algebraic_connectivity(),
+    'fiedler_vector': lambda graph, metrics: graph.spectral.fiedler()[1],
+}
+
+# Metrics read from the distance sweep (their values depend on the approximation)
+SWEEP_METRICS = {
+    'distance_sweep', 'betweenness_centrality', 'closeness_centrality', 'harmonic_centrality',
+    'diameter', 'average_path_length', 'global_efficiency', 'path_length_distribution'
+}
+
+# Views into another entry; kept in memory only, so their data is not stored on disk twice
+DERIVED_METRICS = {'triangles', 'edge_triangles'}
+
+class MetricCache:
+    """Per-graph memo of named metrics, optionally persisted to a GraphCache."""
+
+    def __init__(self, graph, store=None, workers=1):
+        self.graph = graph
+        self.store = store
+        self.workers = workers  # Processes for the BFS sweep (None for all cores)
+        self.approximation = None  # {'epsilon', 'confidence', 'seed'} for a sampled sweep
+        self._values = {}
+        self.hits = 0
+        self.misses = 0
+
+    def persist(self, store):
+        """Also read and write metrics through an on-disk GraphCache (None to stop)."""
+        self.store = store
+        return self
+
+    def approximate(self, epsilon=0.01, confidence=0.95, seed=0):
+        """Estimate the sweep metrics by pivot sampling from now on (None epsilon for exact)."""
+        if epsilon is None:
+            self.approximation = None
+        else:
+            self.approximation = {'epsilon': epsilon, 'confidence': confidence, 'seed': seed}
+        return self
+
+    def sweep(self):
+        """Exact or sampled distance sweep, depending on `approximation`."""
+        if self.approximation is None:
+            return graph_core.distance_sweep(self.graph, self.workers)
+        return approximate_sweep(self.graph, workers=self.workers, **self.approximation)
+
+    def key_for(self, name):
+        """Cache key of a metric for the current graph version."""
+        key = f"metric-v{METRIC_VERSION}-{self.graph.version()}-{name}"
+        if self.approximation is not None and name in SWEEP_METRICS:
+            key += "-approx-e{epsilon}-c{confidence}-s{seed}".format(**self.approximation)
+        return key
+
+    def get(self, name):
+        """Return a metric by name, computing it only on the first request."""
+        if name not in METRICS:
+            raise KeyError(f"Unknown metric: {name}")
+
+        key = self.key_for(name)
+        if key in self._values:
+            self.hits += 1
+            return self._values[key]
+
+        store = self.store if name not in DERIVED_METRICS else None
+        value = None
+        if store is not None:
+            value = store.get(key)
+        if value is None:
+            self.misses += 1
+            value = METRICS[name](self.graph, self)
+            if store is not None:
+                try:
+                    store.put(key, value)
+                except Exception as e:
+                    print(f"Warning: Could not persist metric {name}: {e}")
+        else:
+            self.hits += 1
+
+        self._values[key] = value
+        return value
+
+    def by_node(self, name):
+        """A per-node metric as {node_id: value}."""
+        values = np.asarray(self.get(name)).tolist()
+        return dict(zip(self.graph.node_ids, values))
+
+    def clear(self):
+        """Forget the in-memory values (on-disk entries are kept)."""
+        self._values.clear()
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Fuzzy Duplicate Organization Matching
+
+Finds organizations that are probably the same entity under different
+names ("MSM" vs "Morehouse School of Medicine", "Emory Univ." vs "Emory
+University") without comparing every pair of nodes. Each organization is
+placed into a handful of blocks:
+
+- its normalized name and id
+- its acronyms, paired only with organizations whose whole name is that
+  acronym
+- its website (host + path)
+- MinHash LSH bands over character trigrams of its name (catches typos and
+  small wording changes)
+- MinHash LSH bands over word shingles of its description
+
+Only organizations that share a block are scored, and oversized blocks are
+skipped, so the work stays close to linear in the number of organizations.
+Each candidate pair gets a similarity score and a merge policy: 'merge'
+pairs can be collapsed automatically with the same keep-the-more-complete-
+entry rule as exact id duplicates, 'review' pairs are only reported.
+
+Usage: python org_matcher.py [data/biotech_network_data.json]
+"""
+
+import re
+import zlib
+import numpy as np
+from collections import defaultdict
+from urllib.parse import urlparse
+
+# Similarity thresholds for the merge policy
+MERGE_THRESHOLD = 0.9
+REVIEW_THRESHOLD = 0.6
+
+# Scores for evidence other than name similarity. An acronym alone stays
+# below MERGE_THRESHOLD (it goes to review) unless a website or an
+# identical description backs it up
+ACRONYM_SCORE = 0.8
+WEBSITE_SCORE = 0.95
+
+# Blocks larger than this are too unspecific to be worth pairing up
+MAX_BLOCK_SIZE = 50
+
+# MinHash LSH as (permutations, bands). Pairs are likely to share a band
+# above a Jaccard similarity of about (1/bands)^(bands/permutations):
+# ~0.7 for name trigrams and ~0.6 for description shingles
+NAME_LSH = (16, 4)
+DESCRIPTION_LSH = (32, 8)
+SHINGLE_SIZE = 3
+MERSENNE_PRIME = (1 << 31) - 1
+
+# Shingles hashed per vectorized MinHash batch
+MINHASH_BATCH = 1 << 16
+
+STOPWORDS = {'of', 'the', 'and', 'for', 'at', 'in', 'a', 'an'}
+
+CORPORATE_SUFFIXES = {'inc', 'llc', 'ltd', 'corp', 'corporation', 'co', 'company', 'incorporated', 'plc', 'lp'}
+
+ABBREVIATIONS = {'univ': 'university', 'ctr': 'center', 'centre': 'center', 'intl': 'international', 'tech': 'technology', 'dept': 'department'}
+
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+
+def name_tokens(name):
+    """Lower-case name words with abbreviations expanded and corporate suffixes dropped."""
+    words = WORD_PATTERN.findall(name.lower().replace('&', ' and ').replace("'", ''))
+    words = [ABBREVIATIONS.get(word, word) for word in words]
+    while len(words) > 1 and words[-1] in CORPORATE_SUFFIXES:
+        words.pop()
+    return words
+
+def acronyms(tokens):
+    """Acronyms of a multi-word name, with and without stopwords."""
+    if len(tokens) < 2:
+        return set()
+    significant = [token for token in tokens if token not in STOPWORDS]
+    return {''.join(token[0] for token in tokens), ''.join(token[0] for token in significant)}
+
+def website_key(url):
+    """Host (without www.) plus path of a website, or '' if there is none."""
+    if not url:
+        return ''
+    parsed = urlparse(url if '//' in url else '//' + url)
+    host = parsed.netloc.lower().split(':')[0]
+    if host.startswith('www.'):
+        host = host[4:]
+    path = re.sub(r'/(index\.html?)?$', '', parsed.path.rstrip('/'))
+    return host + path.lower()
+
+def trigrams(text):
+    """Character trigrams of a compact string (padded so short names still match)."""
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def jaccard(a, b):
+    """Jaccard similarity of two sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+class OrganizationProfile:
+    """Normalized matching features of one organization."""
+    
+    def __init__(self, node):
+        self.node = node
+        self.id = node['id']
+        
+        self.names = set()
+        self.acronyms = set()
+        for alias in (node.get('name', ''), self.id.replace('_', ' ')):
+            tokens = name_tokens(alias)
+            if tokens:
+                self.names.add(''.join(tokens))
+                self.acronyms.update(acronyms(tokens))
+        self.name_trigrams = [trigrams(name) for name in sorted(self.names)]
+        
+        self.website = website_key(node.get('website', ''))
+        
+        words = WORD_PATTERN.findall(node.get('description', '').lower())
+        self.shingles = {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+def minhash_signatures(shingle_sets, num_permutations, seed=0):
+    """
+    MinHash signatures (one row per set) using universal hashing
+    h(x) = (a*x + b) mod p over CRC32 shingle hashes. All sets are hashed
+    together in fixed-size batches; empty sets get an all-(-1) row so they
+    never share a band with anything.
+    """
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, MERSENNE_PRIME, size=num_permutations).astype(np.int64)
+    b = rng.randint(0, MERSENNE_PRIME, size=num_permutations).astype(np.int64)
+    
+    lengths = np.array([len(shingles) for shingles in shingle_sets], dtype=np.int64)
+    hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for shingles in shingle_sets for s in shingles), dtype=np.int64, count=int(lengths.sum()))
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    
+    signatures = np.full((len(shingle_sets), num_permutations), -1, dtype=np.int64)
+    rows = np.flatnonzero(lengths)
+    start = 0
+    while start < len(rows):
+        # Take whole sets until the batch holds about MINHASH_BATCH shingles
+        stop = int(np.searchsorted(offsets[rows + 1], offsets[rows[start]] + MINHASH_BATCH, side='right'))
+        stop = max(stop, start + 1)
+        batch = rows[start:stop]
+        lo, hi = offsets[batch[0]], offsets[batch[-1] + 1]
+        values = (np.outer(hashes[lo:hi] % MERSENNE_PRIME, a) + b) % MERSENNE_PRIME
+        signatures[batch] = np.minimum.reduceat(values, offsets[batch] - lo, axis=0)
+        start = stop
+    return signatures
+
+class OrganizationIndex:
+    """Blocking index over organization profiles."""
+    
+    def __init__(self, nodes, max_block_size=MAX_BLOCK_SIZE):
+        self.profiles = [OrganizationProfile(node) for node in nodes if node.get('id')]
+        self.max_block_size = max_block_size
+        self.blocks = defaultdict(list)
+        
+        # Acronym matches only pair a short name with a longer name that
+        # abbreviates to it, so they are kept as two sides of each block
+        self.short_names = defaultdict(list)
+        self.long_acronyms = defaultdict(list)
+        
+        for i, profile in enumerate(self.profiles):
+            for name in profile.names:
+                self.blocks[('name', name)].append(i)
+                if len(name) <= 8:
+                    self.short_names[name].append(i)
+            for acronym in profile.acronyms:
+                if len(acronym) >= 2:
+                    self.long_acronyms[acronym].append(i)
+            if profile.website:
+                self.blocks[('website', profile.website)].append(i)
+        
+        self._add_lsh_blocks('name', [set().union(*p.name_trigrams) for p in self.profiles], NAME_LSH)
+        self._add_lsh_blocks('description', [p.shingles for p in self.profiles], DESCRIPTION_LSH)
+    
+    def _add_lsh_blocks(self, kind, shingle_sets, lsh):
+        """Add one block per (band, band signature) of each non-empty set."""
+        num_permutations, num_bands = lsh
+        rows = num_permutations // num_bands
+        signatures = minhash_signatures(shingle_sets, num_permutations)
+        for i, signature in enumerate(signatures):
+            if signature[0] < 0:
+                continue
+            for band in range(num_bands):
+                self.blocks[(kind, band, signature[band * rows:(band + 1) * rows].tobytes())].append(i)
+    
+    def candidate_pairs(self):
+        """Index pairs that share at least one usable block."""
+        pairs = set()
+        for members in self.blocks.values():
+            members = sorted(set(members))
+            if len(members) < 2 or len(members) > self.max_block_size:
+                continue
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    pairs.add((members[x], members[y]))
+        
+        for acronym, short in self.short_names.items():
+            long = self.long_acronyms.get(acronym, ())
+            if not long or len(short) * len(long) > self.max_block_size ** 2:
+                continue
+            for i in short:
+                for j in long:
+                    if i != j:
+                        pairs.add((min(i, j), max(i, j)))
+        return pairs
+    
+    def score(self, i, j):
+        """Similarity score and the evidence behind it for two profiles."""
+        first, second = self.profiles[i], self.profiles[j]
+        
+        name_similarity = max((jaccard(a, b) for a in first.name_trigrams for b in second.name_trigrams), default=0.0)
+        evidence = {'name': round(name_similarity, 3)}
+        score = name_similarity
+        
+        if (first.names & second.acronyms) or (second.names & first.acronyms):
+            evidence['acronym'] = True
+            score = max(score, ACRONYM_SCORE)
+        if first.website and first.website == second.website:
+            evidence['website'] = True
+            score = max(score, WEBSITE_SCORE)
+        
+        # Matching descriptions raise confidence but never decide on their own
+        description_similarity = jaccard(first.shingles, second.shingles)
+        if description_similarity:
+            evidence['description'] = round(description_similarity, 3)
+            score += (1 - score) * description_similarity / 2
+        
+        return score, evidence
+    
+    def find_candidates(self, review_threshold=REVIEW_THRESHOLD, merge_threshold=MERGE_THRESHOLD):
+        """
+        Score every blocked pair and return candidate dicts sorted by score.
+        
+        A pair is 'merge' when it scores at least `merge_threshold` and both
+        entries have the same type, otherwise 'review'.
+        """
+        candidates = []
+        for i, j in self.candidate_pairs():
+            score, evidence = self.score(i, j)
+            if score < review_threshold:
+                continue
+            first, second = self.profiles[i].node, self.profiles[j].node
+            same_type = first.get('type') == second.get('type')
+            candidates.append({
+                'first': first['id'],
+                'second': second['id'],
+                'score': round(score, 3),
+                'evidence': evidence,
+                'policy': 'merge' if score >= merge_threshold and same_type else 'review',
+            })
+        candidates.sort(key=lambda c: (-c['score'], c['first'], c['second']))
+        return candidates
+
+def find_fuzzy_duplicates(data, review_threshold=REVIEW_THRESHOLD, merge_threshold=MERGE_THRESHOLD):
+    """Candidate duplicate organization pairs in network data."""
+    index = OrganizationIndex(data['nodes'])
+    return index.find_candidates(review_threshold, merge_threshold)
+
+def merge_fuzzy_duplicates(data, candidates, choose_more_complete):
+    """
+    Collapse every 'merge' candidate pair in place.
+    
+    Pairs are applied from the highest score down; chains of matches are
+    followed so each group keeps one entry, picked with
+    `choose_more_complete(first_node, second_node)`. Links are rewired to the
+    kept id and links that became self-loops are dropped. Returns
+    {removed_id: kept_id}.
+    """
+    nodes_by_id = {node['id']: node for node in data['nodes']}
+    replaced = {}
+    
+    def resolve(node_id):
+        while node_id in replaced:
+            node_id = replaced[node_id]
+        return node_id
+    
+    for candidate in candidates:
+        if candidate['policy'] != 'merge':
+            continue
+        first_id, second_id = resolve(candidate['first']), resolve(candidate['second'])
+        if first_id == second_id:
+            continue
+        keep_second, reason = choose_more_complete(nodes_by_id[first_id], nodes_by_id[second_id])
+        kept_id, removed_id = (second_id, first_id) if keep_second else (first_id, second_id)
+        replaced[removed_id] = kept_id
+        print(f"  Merged {removed_id} into {kept_id} (score {candidate['score']}, kept {reason})")
+    
+    if not replaced:
+        return {}
+    
+    mapping = {node_id: resolve(node_id) for node_id in replaced}
+    data['nodes'] = [node for node in data['nodes'] if node['id'] not in mapping]
+    links = []
+    for link in data['links']:
+        link['source'] = mapping.get(link['source'], link['source'])
+        link['target'] = mapping.get(link['target'], link['target'])
+        if link['source'] != link['target']:
+            links.append(link)
+    data['links'] = links
+    
+    return mapping
+
+def main():
+    """Print fuzzy duplicate candidates for a network data file."""
+    import sys
+    import json
+    data_file = sys.argv[1] if len(sys.argv) > 1 else 'data/biotech_network_data.json'
+    
+    with open(data_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    candidates = find_fuzzy_duplicates(data)
+    print(f"Found {len(candidates)} candidate duplicate pairs:")
+    for candidate in candidates:
+        print(f"  [{candidate['policy']}] {candidate['first']} ~ {candidate['second']}: {candidate['score']} {candidate['evidence']}")
+
+if __name__ == "__main__":
+    main()
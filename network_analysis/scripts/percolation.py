@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Percolation Engine for Failure Robustness
+
+Removing nodes one at a time and recounting components costs O(n + m) per
+step. Run backwards instead (Newman & Ziff, 2000): start from an empty
+graph, add the nodes in the reverse of the removal order and merge each
+new node's components with a union-find (path halving, union by size).
+The giant component after every removal count falls out of one pass in
+near-linear time, so each trial yields the whole curve, not one point.
+
+`random_failures` runs seeded trials (each with its own random stream from
+a `SeedSequence`, so results do not depend on how trials are split across
+workers) and summarizes them as a mean curve with a 95% confidence band.
+
+Usage: python percolation.py [data/biotech_network_data.json] [trials]
+"""
+
+import math
+import numpy as np
+
+import graph_core
+
+# Removal fractions the summary curve is reported at (0, 0.01, ..., 1)
+CURVE_POINTS = 101
+
+def giant_component_curve(neighbors, n, removal_order):
+    """
+    Giant component size after each removal: entry r is the size once the
+    first r nodes of `removal_order` are gone (entry 0 is the intact graph).
+    Nodes missing from `removal_order` are never removed.
+    """
+    removed = set(removal_order)
+    parent = list(range(n))
+    size = [1] * n
+    present = [False] * n
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def add(v):
+        present[v] = True
+        root = v
+        for w in neighbors[v]:
+            if not present[w]:
+                continue
+            other = find(w)
+            if other == root:
+                continue
+            if size[root] < size[other]:
+                root, other = other, root
+            parent[other] = root
+            size[root] += size[other]
+        return size[root]
+
+    giant = 0
+    for v in range(n):
+        if v not in removed:
+            giant = max(giant, add(v))
+
+    curve = [0] * (len(removal_order) + 1)
+    curve[len(removal_order)] = giant
+    for r in range(len(removal_order) - 1, -1, -1):
+        giant = max(giant, add(removal_order[r]))
+        curve[r] = giant
+    return curve
+
+def _trial_curves(neighbors, n, seeds):
+    """One giant-component curve per seed, each from a fresh random removal order."""
+    return [giant_component_curve(neighbors, n, np.random.default_rng(s).permutation(n).tolist()) for s in seeds]
+
+def _trial_task(seeds):
+    """Run a batch of random-failure trials on a pool worker."""
+    neighbors = graph_core.worker_neighbors()
+    return _trial_curves(neighbors, len(neighbors), seeds)
+
+class RandomFailures:
+    """
+    Giant-component curves under uniformly random node removal.
+
+    `curves[t, r]` is the giant component size in trial t after r random
+    removals. With `workers` > 1 the trials are split across a process pool
+    (see graph_core.graph_pool).
+    """
+
+    def __init__(self, graph, trials=100, seed=0, workers=1):
+        n = graph.n
+        self.n = n
+        self.trials = trials
+        self.seed = seed
+        seeds = np.random.SeedSequence(seed).spawn(trials)
+
+        workers = min(graph_core.resolve_workers(workers), trials)
+        if n == 0 or trials == 0:
+            curves = []
+        elif workers > 1:
+            chunks = [seeds[offset::workers] for offset in range(workers)]
+            with graph_core.graph_pool(graph, workers) as pool:
+                parts = pool.map(_trial_task, chunks)
+            # Undo the interleaving so trial t always uses seeds[t]
+            curves = [None] * trials
+            for offset, part in enumerate(parts):
+                curves[offset::workers] = part
+        else:
+            curves = _trial_curves(graph.neighbor_lists(), n, seeds)
+        self.curves = np.array(curves, dtype=np.int64).reshape(len(curves), n + 1)
+
+    def mean_fraction(self, removed):
+        """Mean giant-component fraction (of the original n) after `removed` random removals."""
+        if self.n == 0 or len(self.curves) == 0:
+            return 0.0
+        return float(self.curves[:, removed].mean() / self.n)
+
+    def curve(self, points=CURVE_POINTS):
+        """Mean giant fraction and 95% confidence band at evenly spaced removal fractions."""
+        fractions = np.linspace(0.0, 1.0, points)
+        if self.n == 0 or len(self.curves) == 0:
+            zeros = [0.0] * points
+            return {'fraction_removed': fractions.tolist(), 'mean': zeros, 'lower': zeros, 'upper': zeros,
+                    'trials': len(self.curves), 'seed': self.seed}
+        removed = np.rint(fractions * self.n).astype(np.int64)
+        values = self.curves[:, removed] / self.n
+        mean = values.mean(axis=0)
+        if len(values) > 1:
+            half_width = 1.96 * values.std(axis=0, ddof=1) / math.sqrt(len(values))
+        else:
+            half_width = np.zeros(points)
+        return {
+            'fraction_removed': fractions.tolist(),
+            'mean': mean.tolist(),
+            'lower': np.clip(mean - half_width, 0.0, 1.0).tolist(),
+            'upper': np.clip(mean + half_width, 0.0, 1.0).tolist(),
+            'trials': len(values),
+            'seed': self.seed,
+        }
+
+def random_failures(graph, trials=100, seed=0, workers=1):
+    """Giant-component curves for `trials` seeded random removal orders."""
+    return RandomFailures(graph, trials, seed, workers)
+
+def main():
+    """Print the mean random-failure curve for a data file."""
+    import sys
+    import json
+    data_file = sys.argv[1] if len(sys.argv) > 1 else 'data/biotech_network_data.json'
+    trials = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    with open(data_file, 'r', encoding='utf-8') as f:
+        graph = graph_core.CSRGraph.from_data(json.load(f))
+    curve = random_failures(graph, trials).curve(11)
+    print(f"Giant component under random failures ({trials} trials, {graph.n} nodes)")
+    for fraction, mean, lower, upper in zip(curve['fraction_removed'], curve['mean'], curve['lower'], curve['upper']):
+        print(f"  {fraction:4.0%} removed: {mean:.3f} [{lower:.3f}, {upper:.3f}]")
+
+if __name__ == "__main__":
+    main()
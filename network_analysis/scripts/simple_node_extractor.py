@@ -2,95 +2,29 @@
 """
 Simple Node Extractor for Atlanta Biotech Network
 
-This script uses a simple regex-based approach to extract just the essential
-node information from the JavaScript file.
+This script reads the JavaScript data file once with the streaming literal
+parser and extracts every node (including nested fields such as keyPersonnel),
+link and node color.
 """
 
-import re
 import json
 from pathlib import Path
 
-def extract_simple_nodes(js_file_path):
-    """Extract nodes using simple regex patterns."""
-    print("Extracting nodes with simple approach...")
-    
-    with open(js_file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Find all node objects using regex
-    # Look for the pattern: { id: "something", name: "something", type: "something", ... }
-    node_pattern = r'\{\s*id:\s*"([^"]+)",\s*name:\s*"([^"]+)",\s*type:\s*"([^"]+)"[^}]*size:\s*(\d+)[^}]*description:\s*"([^"]*(?:\\.[^"]*)*)"[^}]*website:\s*"([^"]+)"[^}]*\}'
-    
-    node_matches = re.findall(node_pattern, content, re.DOTALL)
-    
-    nodes = []
-    for match in node_matches:
-        node_obj = {
-            'id': match[0],
-            'name': match[1],
-            'type': match[2],
-            'size': int(match[3]),
-            'description': match[4].replace('\\"', '"').replace('\\n', ' ').replace('\\', ''),
-            'website': match[5]
-        }
-        nodes.append(node_obj)
-    
-    print(f"Extracted {len(nodes)} nodes")
-    return nodes
+from js_literal_parser import extract_ecosystem
 
-def extract_simple_links(js_file_path):
-    """Extract links using simple regex patterns."""
-    print("Extracting links with simple approach...")
+def extract_network_data(js_file_path):
+    """Extract nodes, links and node colors in a single pass over the file."""
+    print("Extracting network data with streaming parser...")
     
-    with open(js_file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    data = extract_ecosystem(js_file_path)
     
-    # Find all link objects using regex
-    # Look for the pattern: { source: "something", target: "something", type: "something", ... }
-    link_pattern = r'\{\s*source:\s*"([^"]+)",\s*target:\s*"([^"]+)"[^}]*type:\s*"([^"]+)"[^}]*description:\s*"([^"]*(?:\\.[^"]*)*)"[^}]*\}'
-    
-    link_matches = re.findall(link_pattern, content, re.DOTALL)
-    
-    links = []
-    for match in link_matches:
-        link_obj = {
-            'source': match[0],
-            'target': match[1],
-            'type': match[2],
-            'description': match[3].replace('\\"', '"').replace('\\n', ' ').replace('\\', '')
-        }
-        links.append(link_obj)
-    
-    print(f"Extracted {len(links)} links")
-    return links
-
-def extract_simple_colors(js_file_path):
-    """Extract node colors using simple regex patterns."""
-    print("Extracting node colors with simple approach...")
-    
-    with open(js_file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Find the nodeColors object
-    colors_pattern = r'nodeColors:\s*\{([^}]+)\}'
-    colors_match = re.search(colors_pattern, content, re.DOTALL)
-    
-    if not colors_match:
+    print(f"Extracted {len(data['nodes'])} nodes")
+    print(f"Extracted {len(data['links'])} links")
+    if not data['nodeColors']:
         print("Warning: No nodeColors found")
-        return {}
-    
-    colors_content = colors_match.group(1)
-    
-    # Extract color assignments
-    color_pattern = r'"([^"]+)":\s*"([^"]+)"'
-    color_matches = re.findall(color_pattern, colors_content)
-    
-    node_colors = {}
-    for key, value in color_matches:
-        node_colors[key] = value
-    
-    print(f"Extracted {len(node_colors)} node colors")
-    return node_colors
+    else:
+        print(f"Extracted {len(data['nodeColors'])} node colors")
+    return data
 
 def main():
     """Extract simple network data and save to JSON."""
@@ -101,15 +35,7 @@ def main():
     print("=" * 50)
     
     try:
-        nodes = extract_simple_nodes(js_file)
-        links = extract_simple_links(js_file)
-        node_colors = extract_simple_colors(js_file)
-        
-        data = {
-            'nodes': nodes,
-            'links': links,
-            'nodeColors': node_colors
-        }
+        data = extract_network_data(js_file)
         
         # Save to JSON file
         with open(json_file, 'w', encoding='utf-8') as f:
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Shared Sparse Spectral Engine
+
+Eigenvector centrality, the spectral radius and gap, and the Fiedler
+value and vector all come from a few extreme eigenpairs of two matrices:
+the adjacency A and the Laplacian L = D - A. `SpectralEngine` builds both
+once per graph (`graph.spectral`) and caches every eigenpair it solves
+for, so the centrality pass and the resilience pass share the solves.
+
+- Adjacency: the top eigenpairs by ARPACK (Lanczos). The top one is the
+  spectral radius with the Perron vector (eigenvector centrality); the
+  next eigenvalue gives the spectral gap.
+- Laplacian: the Fiedler pair by LOBPCG with the constant vector
+  projected out and a Jacobi (1/degree) preconditioner, falling back to
+  shift-inverted ARPACK if LOBPCG does not converge. A disconnected graph
+  has algebraic connectivity 0; its Fiedler vector is the one of the
+  largest component (zero elsewhere), and that component's own Fiedler
+  value is reported alongside.
+
+Graphs with at most DENSE_LIMIT nodes are solved densely, and
+`eigendecomposition()` caches the full adjacency spectrum for callers
+that need all of it (the exact path of walk_centrality).
+
+Usage: python spectral.py [data/biotech_network_data.json]
+    Compares the spectral results with networkx on the given data file.
+"""
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import linalg
+
+import graph_core
+
+# Graphs up to this size are solved with a dense eigendecomposition
+DENSE_LIMIT = 64
+
+# Relative tolerance below which the top two adjacency eigenvalues count as tied
+TIE_TOLERANCE = 1e-9
+
+class SpectralEngine:
+    """Adjacency and Laplacian of one graph with cached extreme eigenpairs."""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.n = graph.n
+        self.adjacency = graph.adjacency()
+        self.laplacian = sparse.diags(graph.degree.astype(np.float64)) - self.adjacency
+        self.dense = self.n <= DENSE_LIMIT
+        self._eigenpairs = {}
+        self._fiedler = None
+        self._giant_fiedler = None
+
+    def adjacency_eigenpairs(self, k=2):
+        """(eigenvalues, vectors) of the k largest adjacency eigenvalues, in descending order."""
+        k = min(k, self.n)
+        key = ('adjacency', k)
+        if key not in self._eigenpairs:
+            if k == 0:
+                values, vectors = np.zeros(0), np.zeros((self.n, 0))
+            elif self.dense or k >= self.n - 1:
+                values, vectors = self.eigendecomposition()
+                values, vectors = values[::-1][:k], vectors[:, ::-1][:, :k]
+            else:
+                values, vectors = linalg.eigsh(self.adjacency, k=k, which='LA', v0=np.ones(self.n))
+                order = np.argsort(values)[::-1]
+                values, vectors = values[order], vectors[:, order]
+            self._eigenpairs[key] = (values, vectors)
+        return self._eigenpairs[key]
+
+    def eigendecomposition(self):
+        """All adjacency eigenpairs (ascending) from one dense solve, for graphs small enough to hold A densely."""
+        key = ('adjacency', 'all')
+        if key not in self._eigenpairs:
+            self._eigenpairs[key] = np.linalg.eigh(self.adjacency.toarray())
+        return self._eigenpairs[key]
+
+    def laplacian_eigenpairs(self, k=2):
+        """(eigenvalues, vectors) of the k smallest Laplacian eigenvalues, in ascending order."""
+        k = min(k, self.n)
+        key = ('laplacian', k)
+        if key not in self._eigenpairs:
+            if k == 0:
+                values, vectors = np.zeros(0), np.zeros((self.n, 0))
+            elif self.dense or k >= self.n - 1:
+                values, vectors = np.linalg.eigh(self.laplacian.toarray())
+                values, vectors = values[:k], vectors[:, :k]
+            else:
+                # L is singular, so invert around a small negative shift
+                values, vectors = linalg.eigsh(self.laplacian.tocsc(), k=k, sigma=-1e-3, which='LM', v0=np.ones(self.n))
+                order = np.argsort(values)
+                values, vectors = values[order], vectors[:, order]
+            self._eigenpairs[key] = (values, vectors)
+        return self._eigenpairs[key]
+
+    def spectral_radius(self):
+        """Largest adjacency eigenvalue."""
+        values, _ = self.adjacency_eigenpairs(1)
+        return float(values[0]) if len(values) else 0.0
+
+    def spectral_gap(self):
+        """Difference between the two largest adjacency eigenvalues."""
+        values, _ = self.adjacency_eigenpairs(2)
+        return float(values[0] - values[1]) if len(values) > 1 else 0.0
+
+    def eigenvector_centrality(self):
+        """
+        Perron vector of A with unit Euclidean norm (networkx's scaling).
+        When the top eigenvalue is tied (e.g. two identical components)
+        the vector is not unique, so this falls back to networkx's power
+        iteration and its choice.
+        """
+        if self.n == 0:
+            return np.zeros(0)
+        values, vectors = self.adjacency_eigenpairs(2)
+        if len(values) > 1 and values[0] - values[1] <= TIE_TOLERANCE * max(1.0, abs(values[0])):
+            return graph_core.eigenvector_centrality(self.graph, max_iter=1000)
+        x = vectors[:, 0]
+        x = np.abs(x * np.sign(x.sum()))
+        return x / np.linalg.norm(x)
+
+    def _connected_fiedler(self):
+        """(lambda_2, vector) of a connected graph's Laplacian."""
+        if self.n < 2:
+            return 0.0, np.zeros(self.n)
+        if self.dense:
+            values, vectors = self.laplacian_eigenpairs(2)
+            value, vector = float(values[1]), vectors[:, 1]
+        else:
+            constant = np.full((self.n, 1), 1.0 / np.sqrt(self.n))
+            start = np.random.default_rng(0).standard_normal((self.n, 1))
+            preconditioner = sparse.diags(1.0 / self.graph.degree.astype(np.float64))
+            values, vectors = linalg.lobpcg(self.laplacian, start, M=preconditioner, Y=constant,
+                                            largest=False, tol=1e-10, maxiter=1000)
+            value, vector = float(values[0]), vectors[:, 0]
+            residual = np.linalg.norm(self.laplacian @ vector - value * vector)
+            if not np.isfinite(residual) or residual > 1e-6 * max(1.0, value):
+                values, vectors = self.laplacian_eigenpairs(2)
+                value, vector = float(values[1]), vectors[:, 1]
+        # Fix the sign: the largest-magnitude entry is positive
+        vector = vector / np.linalg.norm(vector)
+        return value, vector * np.sign(vector[np.argmax(np.abs(vector))])
+
+    def _giant(self):
+        """Fiedler pair of the largest component, embedded in the full node set."""
+        if self._giant_fiedler is None:
+            count, labels = self.graph.component_labels()
+            if count <= 1:
+                value, vector = self._connected_fiedler()
+            else:
+                members = np.flatnonzero(labels == np.bincount(labels).argmax())
+                value, sub_vector = SpectralEngine(self.graph.subgraph(members))._connected_fiedler()
+                vector = np.zeros(self.n)
+                vector[members] = sub_vector
+            self._giant_fiedler = (value, vector)
+        return self._giant_fiedler
+
+    def fiedler(self):
+        """(algebraic connectivity, Fiedler vector); 0 and the largest component's vector if disconnected."""
+        if self._fiedler is None:
+            value, vector = self._giant()
+            self._fiedler = (value if self.graph.is_connected() else 0.0, vector)
+        return self._fiedler
+
+    def algebraic_connectivity(self):
+        """Second smallest Laplacian eigenvalue (0 for a disconnected graph)."""
+        return self.fiedler()[0]
+
+    def largest_component_connectivity(self):
+        """Algebraic connectivity of the largest connected component."""
+        return self._giant()[0]
+
+    def summary(self):
+        """Spectral radius, gap and Fiedler values for network_stats."""
+        return {
+            'spectral_radius': self.spectral_radius(),
+            'spectral_gap': self.spectral_gap(),
+            'algebraic_connectivity': self.algebraic_connectivity(),
+            'largest_cc_algebraic_connectivity': self.largest_component_connectivity(),
+            'solver': 'dense' if self.dense else 'sparse',
+        }
+
+def main():
+    """Print the spectral summary of a data file and compare it with networkx."""
+    import sys
+    import json
+    import networkx as nx
+    data_file = sys.argv[1] if len(sys.argv) > 1 else 'data/biotech_network_data.json'
+
+    with open(data_file, 'r', encoding='utf-8') as f:
+        graph = graph_core.CSRGraph.from_data(json.load(f))
+    engine = graph.spectral
+    for name, value in engine.summary().items():
+        print(f"  {name}: {value:.6f}" if isinstance(value, float) else f"  {name}: {value}")
+
+    G = graph.to_networkx()
+    reference = nx.eigenvector_centrality(G, max_iter=1000)
+    ours = engine.eigenvector_centrality()
+    difference = max(abs(ours[i] - reference[node]) for i, node in enumerate(graph.node_ids))
+    print(f"  eigenvector centrality: max |spectral - networkx| = {difference:.3g}")
+    giant = G.subgraph(max(nx.connected_components(G), key=len))
+    print(f"  largest component Fiedler value (networkx): {nx.algebraic_connectivity(giant, tol=1e-10):.6f}")
+
+if __name__ == "__main__":
+    main()